@@ -1,4 +1,5 @@
 
+import asyncio
 import traceback
 from typing import Any, Optional
 from agent.graph.graph_builder import build_graph
@@ -9,23 +10,39 @@ from langchain_core.messages import AnyMessage
 from agent.config.prompts import AGENT_SYSTEM_PROMPT
 from agent.config.constants import MODEL_NAME, TEMPERATURE
 from langchain_core.runnables import RunnableConfig
+from langchain_core.language_models import BaseChatModel
+from agent.config.setting import settings
+from agent.utils.tracing import traced_http_client_factory
 
 class Agent_Client:
-    def __init__(self) -> None:
+    def __init__(self, mcp_url: Optional[str] = None, chat_model: Optional[BaseChatModel] = None) -> None:
         self.system_prompt = AGENT_SYSTEM_PROMPT
         self.model_name =  MODEL_NAME
         self.temperature = TEMPERATURE
+        self.mcp_url = mcp_url or settings.RAG_MCP_URL
+        self.chat_model = chat_model
         self.client: MultiServerMCPClient | None = None
         self.agent: Any = None
         self.is_initialized = False
+        # Concurrent ask() calls before the first one finished initializing share one client
+        self._init_lock = asyncio.Lock()
 
     async def initialize(self) -> None:
+        """Connect to the MCP server and build the agent graph, once however many callers race."""
+        async with self._init_lock:
+            if self.is_initialized:
+                return
+            await self._initialize()
+
+    async def _initialize(self) -> None:
         try:
             self.client = MultiServerMCPClient(
                {
                     "rag_server": {
-                        "url": "http://localhost:3000/mcp",
-                        "transport": "streamable_http"
+                        "url": self.mcp_url,
+                        "transport": "streamable_http",
+                        # Carries the current trace context to the RAG server
+                        "httpx_client_factory": traced_http_client_factory
                     },
                     
                     # "tavily-remote": {
@@ -39,13 +56,19 @@ class Agent_Client:
             self.agent = build_graph(tools, 
                                     self.system_prompt, 
                                     self.model_name,
-                                    self.temperature)
+                                    self.temperature,
+                                    chat_model=self.chat_model)
             self.is_initialized = True
         except Exception:
             traceback.print_exc()
             raise
 
-    async def ask(self, messages: list[AnyMessage], thread_id: Optional[str] = None) -> str:
+    async def ask(
+        self,
+        messages: list[AnyMessage],
+        thread_id: Optional[str] = None,
+        raise_errors: bool = False
+    ) -> str:
         try:
             if not self.is_initialized:
                 await self.initialize()
@@ -65,6 +88,8 @@ class Agent_Client:
 
             return "No valid AI response."
         except Exception as e:
+            if raise_errors:
+                raise
             traceback.print_exc()
             return f"Error: {e}"
 
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Response
+from agent.utils.metrics import get_metrics_registry
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get(
+    "/metrics",
+    include_in_schema=False,
+    summary="Prometheus Metrics",
+    description="Request, LLM and tool metrics in the Prometheus text format"
+)
+async def metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+
+    Returns:
+        All registered metrics in the text exposition format
+    """
+    registry = get_metrics_registry()
+    return Response(content=registry.render(), media_type=registry.CONTENT_TYPE)
@@ -1,6 +1,7 @@
 from agent.agent_client import Agent_Client
 from agent.utils.logger import get_logger
 from agent.utils.custom_exception import CustomException
+from agent.utils.tracing import span
 from langchain_core.messages import HumanMessage
 from typing import Optional
 from langchain_core.messages import AnyMessage
@@ -56,7 +57,8 @@ class AgentService:
             logger.info(f"Processing message for thread: {thread_id}")
             
             messages: list[AnyMessage] = [HumanMessage(content=message)]
-            response = await self.agent_client.ask(messages, thread_id)
+            with span("agent.chat", thread_id=thread_id, message_chars=len(message)):
+                response = await self.agent_client.ask(messages, thread_id)
             
             logger.info(f"Response generated for thread: {thread_id}")
             return response
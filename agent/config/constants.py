@@ -1,3 +1,22 @@
+import os
+from pathlib import Path
+
+current_dir = Path(__file__).parent
 
 MODEL_NAME = "openai/gpt-oss-20b"
 TEMPERATURE = 0.0
+
+# Evaluation runner: concurrent requests allowed per upstream provider
+EVAL_PROVIDER_CONCURRENCY = {
+    "groq": 4,
+    "openai": 8
+}
+EVAL_MAX_RETRIES = 5
+EVAL_BACKOFF_BASE_S = 1.0
+EVAL_BACKOFF_MAX_S = 30.0
+
+# LLM judge: "combined" scores every criterion in one call, "separate" makes one call per criterion
+JUDGE_MODE = "combined"
+# Bump whenever a judge prompt changes so cached judgments are not reused
+JUDGE_PROMPT_VERSION = "1"
+JUDGE_CACHE_PATH = os.path.join(current_dir, "../evaluation/.judge_cache")
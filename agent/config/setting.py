@@ -10,6 +10,10 @@ load_dotenv(ENV_PATH)
 class Settings:
     GROQ_API_KEY: str | None = os.getenv("GROQ_API_KEY")
     OPENAI_API_KEY : str | None = os.getenv("OPENAI_API_KEY")
+    RAG_MCP_URL: str = os.getenv("RAG_MCP_URL", "http://localhost:3000/mcp")
+    # "none", "json" (JSON lines file), "console" or "otlp" (OTEL_EXPORTER_OTLP_ENDPOINT)
+    TRACING_EXPORTER: str = os.getenv("TRACING_EXPORTER", "none")
+    TRACING_JSON_PATH: str = os.getenv("TRACING_JSON_PATH", str(BASE_DIR / "traces_agent.jsonl"))
 
 settings = Settings()
 
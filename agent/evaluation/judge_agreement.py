@@ -0,0 +1,97 @@
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Any, Dict, List
+
+from agent.config.setting import settings, BASE_DIR
+from agent.config.constants import EVAL_PROVIDER_CONCURRENCY
+from agent.evaluation.llm_as_a_judge import LLMJudge, CRITERIA
+from agent.evaluation.runner import ProviderLimiter
+
+DEFAULT_RESULTS_PATH = BASE_DIR / "evaluation_results.json"
+
+
+async def judge_items(judge: LLMJudge, items: List[Dict[str, Any]], limiter: ProviderLimiter) -> List[Dict[str, float]]:
+    """Per-criterion scores for every saved (question, answer, expected) triple, in input order."""
+
+    async def judge_item(item: Dict[str, Any]) -> Dict[str, float]:
+        args = (item["question"], item["agent_response"], item["expected_response"])
+        if judge.mode == "combined":
+            verdicts = await limiter.call(judge.aevaluate_combined, *args)
+        else:
+            correctness, completeness, safety = await asyncio.gather(
+                limiter.call(judge.aevaluate_correctness, *args),
+                limiter.call(judge.aevaluate_completeness, *args),
+                limiter.call(judge.aevaluate_safety, *args[:2])
+            )
+            verdicts = {"correctness": correctness, "completeness": completeness, "safety": safety}
+        return {criterion: float(verdicts[criterion]["score"]) for criterion in CRITERIA}
+
+    return await asyncio.gather(*(judge_item(item) for item in items))
+
+
+def agreement(separate: List[Dict[str, float]], combined: List[Dict[str, float]]) -> Dict[str, Dict[str, float]]:
+    """Mean absolute difference, exact and within-one agreement and correlation per criterion."""
+    report = {}
+    for criterion in CRITERIA:
+        a = [scores[criterion] for scores in separate]
+        b = [scores[criterion] for scores in combined]
+        diffs = [abs(x - y) for x, y in zip(a, b)]
+        try:
+            correlation = round(statistics.correlation(a, b), 3)
+        except statistics.StatisticsError:
+            # Constant scores (e.g. every answer judged 10/10 safe) have no correlation
+            correlation = None
+        report[criterion] = {
+            "mean_separate": round(statistics.fmean(a), 2),
+            "mean_combined": round(statistics.fmean(b), 2),
+            "mean_abs_diff": round(statistics.fmean(diffs), 2),
+            "exact_agreement": round(sum(d == 0 for d in diffs) / len(diffs), 3),
+            "within_1_agreement": round(sum(d <= 1 for d in diffs) / len(diffs), 3),
+            "pearson": correlation
+        }
+    return report
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compare combined and per-criterion judge scores on saved agent answers")
+    parser.add_argument("--results", default=str(DEFAULT_RESULTS_PATH), help="JSON written by save_results_to_json")
+    parser.add_argument("--model", default="gpt-4o")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore and do not write the judgment cache")
+    args = parser.parse_args()
+
+    with open(args.results, "r", encoding="utf-8") as f:
+        items = json.load(f)
+
+    limiter = ProviderLimiter("openai", EVAL_PROVIDER_CONCURRENCY["openai"])
+    cache_kwargs = {"cache_dir": None} if args.no_cache else {}
+    runs = {}
+
+    for mode in ("separate", "combined"):
+        judge = LLMJudge(api_key=settings.OPENAI_API_KEY, model=args.model, mode=mode, **cache_kwargs)
+        start = time.perf_counter()
+        scores = await judge_items(judge, items, limiter)
+        runs[mode] = {
+            "scores": scores,
+            "api_calls": judge.calls,
+            "seconds": round(time.perf_counter() - start, 1),
+            "cache": judge.cache.stats() if judge.cache else None
+        }
+
+    print("\n" + "=" * 80)
+    print(f"JUDGE AGREEMENT: combined vs separate ({len(items)} items, {args.model})")
+    print("=" * 80)
+    for mode, run in runs.items():
+        print(f"{mode:<10} api_calls={run['api_calls']:<5} seconds={run['seconds']:<7} cache={run['cache']}")
+    print("-" * 80)
+    for criterion, metrics in agreement(runs["separate"]["scores"], runs["combined"]["scores"]).items():
+        print(f"{criterion.upper()}")
+        for key, value in metrics.items():
+            print(f"  {key:<20} {value}")
+    print("=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
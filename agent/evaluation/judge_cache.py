@@ -0,0 +1,68 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from agent.utils.logger import get_logger
+from agent.config.constants import JUDGE_CACHE_PATH, JUDGE_PROMPT_VERSION
+
+logger = get_logger(__name__)
+
+
+class JudgeCache:
+    """
+    On-disk cache of judge verdicts, one JSON file per judgment.
+
+    Entries are keyed by (judge model, prompt version, judgment kind, question,
+    answer, expected answer), so changing any of them, or bumping
+    JUDGE_PROMPT_VERSION, misses the cache. Files are written atomically, so
+    concurrent evaluations can share the directory.
+    """
+
+    def __init__(self, cache_dir: str = JUDGE_CACHE_PATH, prompt_version: str = JUDGE_PROMPT_VERSION):
+        self.cache_dir = Path(cache_dir)
+        self.prompt_version = prompt_version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model: str, kind: str, question: str, agent_response: str, expected_response: Optional[str]) -> str:
+        payload = json.dumps(
+            [model, self.prompt_version, kind, question, agent_response, expected_response],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                value = json.load(f)
+            self.hits += 1
+            return value
+        except (FileNotFoundError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write judge cache entry {key[:12]}: {e}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 3) if total else 0.0
+        }
@@ -0,0 +1,215 @@
+import asyncio
+import itertools
+import random
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional
+
+from agent.utils.logger import get_logger
+from agent.config.constants import (
+    EVAL_PROVIDER_CONCURRENCY,
+    EVAL_MAX_RETRIES,
+    EVAL_BACKOFF_BASE_S,
+    EVAL_BACKOFF_MAX_S
+)
+
+if TYPE_CHECKING:
+    from agent.evaluation.llm_as_a_judge import AgentEvaluator, EvaluationResult
+
+logger = get_logger(__name__)
+
+# Status codes worth retrying: timeouts, conflicts, rate limits and server errors
+_RETRYABLE_STATUS = {408, 409, 429}
+_RETRYABLE_ERRORS = {"APIConnectionError", "APITimeoutError", "TimeoutError", "ConnectError", "ReadTimeout"}
+
+
+def is_retryable(error: BaseException) -> bool:
+    """True for rate-limit, timeout, connection and 5xx errors from OpenAI/Groq-style clients."""
+    status = getattr(error, "status_code", None)
+    if isinstance(status, int) and (status in _RETRYABLE_STATUS or status >= 500):
+        return True
+    return any(cls.__name__ in _RETRYABLE_ERRORS for cls in type(error).__mro__)
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """Delay requested by the provider through Retry-After headers, if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+
+    for header, scale in (("retry-after-ms", 1000.0), ("retry-after", 1.0)):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            return max(0.0, float(value) / scale)
+        except ValueError:
+            continue
+    return None
+
+
+class ProviderLimiter:
+    """
+    Bounds concurrent requests to one upstream provider and retries transient failures.
+
+    A rate-limit response pauses every caller of the provider, not only the
+    one that received it, until the provider's Retry-After (or the backoff
+    delay) has passed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        concurrency: int,
+        max_retries: int = EVAL_MAX_RETRIES,
+        base_delay_s: float = EVAL_BACKOFF_BASE_S,
+        max_delay_s: float = EVAL_BACKOFF_MAX_S
+    ):
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max_retries
+        self.base_delay_s = base_delay_s
+        self.max_delay_s = max_delay_s
+
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._resume_at = 0.0
+        self.calls = 0
+        self.retries = 0
+
+    def _backoff(self, attempt: int, error: BaseException) -> float:
+        # Full jitter, but never sooner than the provider asked for
+        delay = random.uniform(0, min(self.max_delay_s, self.base_delay_s * 2 ** attempt))
+        requested = retry_after_seconds(error)
+        return max(delay, requested) if requested is not None else delay
+
+    async def call(self, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        attempt = 0
+        while True:
+            async with self._semaphore:
+                pause = self._resume_at - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                try:
+                    self.calls += 1
+                    return await fn(*args, **kwargs)
+                except Exception as e:
+                    if attempt >= self.max_retries or not is_retryable(e):
+                        raise
+                    delay = self._backoff(attempt, e)
+                    if getattr(e, "status_code", None) == 429:
+                        self._resume_at = max(self._resume_at, time.monotonic() + delay)
+                    self.retries += 1
+                    attempt += 1
+                    logger.warning(
+                        f"{self.name}: {type(e).__name__} ({e}); retry {attempt}/{self.max_retries} in {delay:.1f}s"
+                    )
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {"concurrency": self.concurrency, "calls": self.calls, "retries": self.retries}
+
+
+class EvaluationRunner:
+    """
+    Runs agent predictions and the judge criteria concurrently.
+
+    Every item is evaluated as its own task: the prediction first, then either
+    one combined judgment or the correctness, completeness and safety
+    judgments in parallel, depending on the judge's mode. Requests go
+    through one ProviderLimiter per upstream provider, so the agent's LLM and
+    the judge are throttled independently. Results are returned in dataset
+    order regardless of completion order.
+    """
+
+    def __init__(
+        self,
+        evaluator: "AgentEvaluator",
+        provider_concurrency: Optional[Dict[str, int]] = None,
+        agent_provider: str = "groq",
+        judge_provider: str = "openai",
+        max_retries: int = EVAL_MAX_RETRIES
+    ):
+        self.evaluator = evaluator
+        self.judge = evaluator.judge
+
+        limits = {**EVAL_PROVIDER_CONCURRENCY, **(provider_concurrency or {})}
+        self.limiters = {
+            name: ProviderLimiter(name, concurrency, max_retries=max_retries)
+            for name, concurrency in limits.items()
+        }
+        self.agent_limiter = self._limiter(agent_provider)
+        self.judge_limiter = self._limiter(judge_provider)
+
+        # Isolate each question's conversation in the agent's checkpointer
+        self._run_id = uuid.uuid4().hex[:8]
+
+    def _limiter(self, provider: str) -> ProviderLimiter:
+        if provider not in self.limiters:
+            self.limiters[provider] = ProviderLimiter(provider, 1)
+        return self.limiters[provider]
+
+    async def _predict(self, index: int, question: str) -> str:
+        attempts = itertools.count()
+
+        async def attempt() -> str:
+            # A failed attempt leaves its messages in the checkpointed thread, so each retry starts a fresh one
+            return await self.evaluator.predict_fn(question, thread_id=f"eval-{self._run_id}-{index}-{next(attempts)}")
+
+        try:
+            return await self.agent_limiter.call(attempt)
+        except Exception as e:
+            logger.error(f"Prediction failed for item {index}: {e}")
+            return f"Error: {e}"
+
+    async def _judge(self, criterion: Callable[..., Awaitable[Dict[str, Any]]], *args) -> Dict[str, Any]:
+        try:
+            return await self.judge_limiter.call(criterion, *args)
+        except Exception as e:
+            logger.error(f"Judge call {criterion.__name__} failed: {e}")
+            return {"score": 0, "reasoning": f"Error during evaluation: {str(e)}"}
+
+    async def evaluate_item(self, index: int, item: Dict[str, Any]) -> "EvaluationResult":
+        question = item["inputs"]["question"]
+        expected_response = item["expectations"]["expected_response"]
+
+        agent_response = await self._predict(index, question)
+
+        if self.judge.mode == "combined":
+            verdicts = await self._judge(self.judge.aevaluate_combined, question, agent_response, expected_response)
+            if "score" in verdicts:
+                # The call failed outright: the same error stands for every criterion
+                verdicts = {criterion: verdicts for criterion in ("correctness", "completeness", "safety")}
+            return self.judge.build_result(question, agent_response, expected_response, **verdicts)
+
+        correctness, completeness, safety = await asyncio.gather(
+            self._judge(self.judge.aevaluate_correctness, question, agent_response, expected_response),
+            self._judge(self.judge.aevaluate_completeness, question, agent_response, expected_response),
+            self._judge(self.judge.aevaluate_safety, question, agent_response)
+        )
+        return self.judge.build_result(question, agent_response, expected_response, correctness, completeness, safety)
+
+    async def run(self, dataset: List[Dict[str, Any]]) -> List["EvaluationResult"]:
+        start = time.perf_counter()
+        done = 0
+
+        async def tracked(index: int, item: Dict[str, Any]) -> "EvaluationResult":
+            nonlocal done
+            result = await self.evaluate_item(index, item)
+            done += 1
+            print(
+                f"[{done}/{len(dataset)}] #{index + 1} "
+                f"correctness={result.correctness_score} completeness={result.completeness_score} "
+                f"safety={result.safety_score} overall={result.overall_score:.2f} | {result.question[:60]}"
+            )
+            return result
+
+        # gather keeps input order, so results line up with the dataset
+        results = await asyncio.gather(*(tracked(i, item) for i, item in enumerate(dataset)))
+
+        logger.info(
+            f"Evaluated {len(results)} items in {time.perf_counter() - start:.1f}s "
+            f"({ {name: limiter.stats() for name, limiter in self.limiters.items()} }, "
+            f"judge cache: {self.judge.cache.stats() if self.judge.cache else 'disabled'})"
+        )
+        return list(results)
@@ -4,20 +4,57 @@ from langgraph.graph import StateGraph, START
 from langgraph.prebuilt import ToolNode
 from langgraph.prebuilt import tools_condition
 from langgraph.checkpoint.memory import MemorySaver
+from agent.utils.tracing import span
+from agent.utils.metrics import get_metrics_registry
+import time
 
 
 memory=MemorySaver()
 
+metrics = get_metrics_registry()
+TOOL_CALLS = metrics.counter("agent_tool_calls_total", "Tool calls made by the graph, by tool and outcome", ["tool", "status"])
+TOOL_LATENCY = metrics.histogram("agent_tool_duration_seconds", "Tool call latency seen by the agent, MCP round trip included", ["tool"])
+metrics.callback(
+    "agent_checkpointer_threads", "Conversation threads held in the in-memory checkpointer",
+    lambda: [((), len(memory.storage))]
+)
+
+
+def instrument_tool(tool):
+    """Copy of an async tool whose every call is traced as "tool.<name>" and counted."""
+    if getattr(tool, "coroutine", None) is None:
+        return tool
+
+    call = tool.coroutine
+
+    async def instrumented(*args, **kwargs):
+        start = time.perf_counter()
+        status = "error"
+        try:
+            with span(f"tool.{tool.name}", tool=tool.name):
+                result = await call(*args, **kwargs)
+            status = "ok"
+            return result
+        finally:
+            TOOL_CALLS.inc(tool=tool.name, status=status)
+            TOOL_LATENCY.observe(time.perf_counter() - start, tool=tool.name)
+
+    return tool.model_copy(update={"coroutine": instrumented})
+
 def build_graph(tools, 
         system_prompt, 
         model_name,
-        temperature):
+        temperature,
+        chat_model=None):
 
     agent = Generator_Agent(tools=tools, 
         system_prompt=system_prompt, 
         model_name=model_name,
-        temperature = temperature)
+        temperature = temperature,
+        chat_model=chat_model)
     
+    tools = [instrument_tool(tool) for tool in tools]
+
     builder = StateGraph(State)
 
     builder.add_node("call_model", agent)
@@ -1,7 +1,17 @@
 from agent.graph.state.state import State
+from typing import Optional
 from langchain_groq import ChatGroq
+from langchain_core.language_models import BaseChatModel
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from agent.config.setting import settings
+from agent.utils.tracing import set_attributes, span
+from agent.utils.metrics import get_metrics_registry
+import time
+
+metrics = get_metrics_registry()
+LLM_REQUESTS = metrics.counter("agent_llm_requests_total", "Chat model calls by model and outcome", ["model", "status"])
+LLM_LATENCY = metrics.histogram("agent_llm_duration_seconds", "Chat model call latency", ["model"])
+LLM_TOKENS = metrics.counter("agent_llm_tokens_total", "Tokens reported by the chat model", ["model", "type"])
 
 class Generator_Agent:
     
@@ -10,16 +20,19 @@ class Generator_Agent:
         tools, 
         system_prompt, 
         model_name,
-        temperature
+        temperature,
+        chat_model: Optional[BaseChatModel] = None
     ):
         self.tools = tools or []
         self.system_prompt = system_prompt
         self.model_name = model_name
         self.temperature = temperature
+        self.chat_model = chat_model
         self.chain = self._build_chain()
     
     def _build_chain(self):
-        model = ChatGroq(model=self.model_name, temperature= self.temperature)
+        # An injected chat model (e.g. the load-test fake) replaces Groq
+        model = self.chat_model or ChatGroq(model=self.model_name, temperature= self.temperature)
         
         if self.tools:
             model = model.bind_tools(tools=self.tools)
@@ -32,6 +45,20 @@ class Generator_Agent:
         return prompt | model 
     
     def __call__(self, state: State):
-        response = self.chain.invoke({"messages": state["messages"]})
+        start = time.perf_counter()
+        status = "error"
+        try:
+            with span("llm.generate", model=self.model_name, input_messages=len(state["messages"])) as current:
+                response = self.chain.invoke({"messages": state["messages"]})
+                set_attributes(current, tool_calls=len(getattr(response, "tool_calls", None) or []))
+            status = "ok"
+        finally:
+            LLM_REQUESTS.inc(model=self.model_name, status=status)
+            LLM_LATENCY.observe(time.perf_counter() - start, model=self.model_name)
+
+        usage = getattr(response, "usage_metadata", None) or {}
+        for token_type in ("input_tokens", "output_tokens"):
+            if usage.get(token_type):
+                LLM_TOKENS.inc(usage[token_type], model=self.model_name, type=token_type.split("_")[0])
         return {"messages": [response]}
     
\ No newline at end of file
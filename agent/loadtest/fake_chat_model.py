@@ -0,0 +1,87 @@
+import asyncio
+import hashlib
+import random
+import time
+from typing import Any, List, Optional, Sequence
+
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+
+class ScriptedChatModel(BaseChatModel):
+    """
+    Deterministic stand-in for the Groq chat model.
+
+    For each user turn it first emits `tool_calls_per_turn` calls to
+    `tool_name` (query = the user's message), one per model step, then a fixed
+    answer built from the tool results. Every step sleeps `latency_s` plus a
+    jitter that is derived from the conversation itself, so identical runs
+    take identical time.
+    """
+
+    tool_name: str = "retrieve_documents"
+    tool_calls_per_turn: int = 1
+    latency_s: float = 0.5
+    jitter_s: float = 0.0
+    answer_chars: int = 400
+    bound_tools: List[str] = []
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-fake"
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ScriptedChatModel":
+        names = [getattr(tool, "name", None) or getattr(tool, "__name__", str(tool)) for tool in tools]
+        return self.model_copy(update={"bound_tools": names})
+
+    def _delay(self, messages: List[BaseMessage]) -> float:
+        if self.jitter_s <= 0:
+            return self.latency_s
+        seed = hashlib.sha256(str(len(messages)).encode() + str(messages[-1].content).encode()).digest()
+        return self.latency_s + random.Random(seed).uniform(0, self.jitter_s)
+
+    def _respond(self, messages: List[BaseMessage]) -> AIMessage:
+        # Only the current turn counts: everything after the last user message
+        last_human = max((i for i, m in enumerate(messages) if isinstance(m, HumanMessage)), default=-1)
+        question = str(messages[last_human].content) if last_human >= 0 else ""
+        turn = messages[last_human + 1:]
+        tool_results = [m for m in turn if isinstance(m, ToolMessage)]
+
+        can_call = self.tool_name in self.bound_tools
+        if can_call and len(tool_results) < self.tool_calls_per_turn:
+            step = len(tool_results)
+            return AIMessage(
+                content="",
+                tool_calls=[{
+                    "name": self.tool_name,
+                    "args": {"query": question},
+                    "id": f"call_{last_human}_{step}",
+                    "type": "tool_call"
+                }]
+            )
+
+        context = " ".join(str(m.content) for m in tool_results)
+        answer = f"Answer to '{question}' based on {len(tool_results)} tool results. {context}"
+        return AIMessage(content=answer[:self.answer_chars])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        time.sleep(self._delay(messages))
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any
+    ) -> ChatResult:
+        await asyncio.sleep(self._delay(messages))
+        return ChatResult(generations=[ChatGeneration(message=self._respond(messages))])
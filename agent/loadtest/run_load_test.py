@@ -0,0 +1,236 @@
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from typing import Dict, List, Optional
+
+import httpx
+import uvicorn
+
+from agent.agent_client import Agent_Client
+from agent.api.services.agent_service import get_agent_service
+from agent.graph import graph_builder
+from agent.loadtest.fake_chat_model import ScriptedChatModel
+from agent.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+HISTOGRAM_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, float("inf")]
+LAG_PROBE_INTERVAL_S = 0.01
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process, in MB (0.0 where /proc is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def _wait_for_port(host: str, port: int, timeout_s: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout_s
+    while time.monotonic() < deadline:
+        with socket.socket() as sock:
+            if sock.connect_ex((host, port)) == 0:
+                return
+        time.sleep(0.1)
+    raise TimeoutError(f"Nothing listening on {host}:{port} after {timeout_s}s")
+
+
+class ServerThread(threading.Thread):
+    """
+    Runs agent.main:app with uvicorn on its own event loop, next to a probe
+    that measures how late that loop wakes up from a short sleep.
+    """
+
+    def __init__(self, host: str, port: int):
+        super().__init__(daemon=True)
+        from agent.main import app
+
+        self.server = uvicorn.Server(uvicorn.Config(app, host=host, port=port, log_level="warning"))
+        self.lags_ms: List[float] = []
+        self._probing = True
+
+    async def _probe(self) -> None:
+        while self._probing:
+            start = time.perf_counter()
+            await asyncio.sleep(LAG_PROBE_INTERVAL_S)
+            self.lags_ms.append((time.perf_counter() - start - LAG_PROBE_INTERVAL_S) * 1000)
+
+    async def _serve(self) -> None:
+        probe = asyncio.create_task(self._probe())
+        await self.server.serve()
+        self._probing = False
+        await probe
+
+    def run(self) -> None:
+        asyncio.run(self._serve())
+
+    def reset_lag(self) -> None:
+        self.lags_ms = []
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.join(timeout=10)
+
+
+async def _user(client: httpx.AsyncClient, user: int, requests: int, thread_id: str, records: List[Dict]) -> None:
+    for turn in range(requests):
+        start = time.perf_counter()
+        try:
+            response = await client.post("/api/v1/chat", json={
+                "message": f"Question {turn} from user {user}: what programs are offered?",
+                "thread_id": thread_id
+            })
+            ok = response.status_code == 200 and response.json().get("success", False)
+            status = response.status_code
+        except httpx.HTTPError as e:
+            ok, status = False, type(e).__name__
+        records.append({"latency_ms": (time.perf_counter() - start) * 1000, "ok": ok, "status": status})
+
+
+async def drive_load(base_url: str, users: int, requests_per_user: int, timeout_s: float) -> Dict:
+    """Run `users` concurrent conversations, each on its own thread ID, and collect per-request timings."""
+    records: List[Dict] = []
+    run_id = uuid.uuid4().hex[:8]
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout_s, limits=limits) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            _user(client, user, requests_per_user, f"load-{run_id}-{user}", records)
+            for user in range(users)
+        ))
+        wall_s = time.perf_counter() - start
+
+    return {"records": records, "wall_s": wall_s}
+
+
+def histogram(latencies: List[float]) -> List[tuple]:
+    counts = []
+    lower = 0.0
+    for upper in HISTOGRAM_BUCKETS_MS:
+        counts.append((lower, upper, sum(1 for v in latencies if lower <= v < upper)))
+        lower = upper
+    return counts
+
+
+def print_report(result: Dict, lags_ms: List[float], memory: Dict, config: Dict) -> None:
+    records = result["records"]
+    latencies = [r["latency_ms"] for r in records if r["ok"]]
+    errors = [r for r in records if not r["ok"]]
+
+    print("\n" + "=" * 80)
+    print("AGENT LOAD TEST")
+    print("=" * 80)
+    for key, value in config.items():
+        print(f"{key:<26} {value}")
+    print("-" * 80)
+    print(f"{'requests':<26} {len(records)} ({len(errors)} failed)")
+    print(f"{'rps':<26} {len(latencies) / result['wall_s']:.2f}")
+    if latencies:
+        print(f"{'latency mean/p50 ms':<26} {statistics.fmean(latencies):.1f} / {_percentile(latencies, 50):.1f}")
+        print(f"{'latency p95/p99/max ms':<26} {_percentile(latencies, 95):.1f} / {_percentile(latencies, 99):.1f} / {max(latencies):.1f}")
+    if lags_ms:
+        print(f"{'loop lag p50/p99/max ms':<26} {_percentile(lags_ms, 50):.2f} / {_percentile(lags_ms, 99):.2f} / {max(lags_ms):.2f}")
+    for key, value in memory.items():
+        print(f"{key:<26} {value}")
+    if errors:
+        statuses: Dict[str, int] = {}
+        for r in errors:
+            statuses[str(r["status"])] = statuses.get(str(r["status"]), 0) + 1
+        print(f"{'errors by status':<26} {statuses}")
+
+    print("-" * 80)
+    print("LATENCY HISTOGRAM (successful requests)")
+    top = max((count for _, _, count in histogram(latencies)), default=0) or 1
+    for lower, upper, count in histogram(latencies):
+        label = f"{lower:>6.0f} - {upper:<6.0f} ms" if upper != float("inf") else f"{lower:>6.0f} +         ms"
+        print(f"{label:<20} {count:>6} {'#' * round(40 * count / top)}")
+    print("=" * 80 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test /api/v1/chat with a scripted chat model")
+    parser.add_argument("--users", type=int, default=20, help="Concurrent users, one thread ID each")
+    parser.add_argument("--requests-per-user", type=int, default=5)
+    parser.add_argument("--model-latency-ms", type=float, default=500.0, help="Fake chat model latency per step")
+    parser.add_argument("--model-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--tool-calls", type=int, default=1, help="Tool calls the fake model makes per turn")
+    parser.add_argument("--tool-latency-ms", type=float, default=50.0, help="Stub rag_server latency")
+    parser.add_argument("--rag-url", default=None, help="Use a running rag_server instead of the stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stub-port", type=int, default=3900)
+    parser.add_argument("--timeout-s", type=float, default=120.0)
+    args = parser.parse_args()
+
+    stub: Optional[subprocess.Popen] = None
+    rag_url = args.rag_url
+    if rag_url is None:
+        stub = subprocess.Popen([
+            sys.executable, "-m", "agent.loadtest.stub_rag_server",
+            "--host", args.host, "--port", str(args.stub_port),
+            "--latency-ms", str(args.tool_latency_ms)
+        ])
+        rag_url = f"http://{args.host}:{args.stub_port}/mcp"
+        _wait_for_port(args.host, args.stub_port)
+
+    chat_model = ScriptedChatModel(
+        latency_s=args.model_latency_ms / 1000,
+        jitter_s=args.model_jitter_ms / 1000,
+        tool_calls_per_turn=args.tool_calls
+    )
+    get_agent_service().agent_client = Agent_Client(mcp_url=rag_url, chat_model=chat_model)
+
+    server = ServerThread(args.host, args.port)
+    server.start()
+    try:
+        _wait_for_port(args.host, args.port)
+        base_url = f"http://{args.host}:{args.port}"
+
+        # One warm-up conversation so imports and connection setup are not measured
+        asyncio.run(drive_load(base_url, users=1, requests_per_user=1, timeout_s=args.timeout_s))
+
+        checkpoints_before = len(graph_builder.memory.storage)
+        rss_before = _rss_mb()
+        server.reset_lag()
+
+        result = asyncio.run(drive_load(base_url, args.users, args.requests_per_user, args.timeout_s))
+
+        lags_ms = list(server.lags_ms)
+        rss_growth = _rss_mb() - rss_before
+        memory = {
+            "rss_growth_mb": round(rss_growth, 2),
+            "rss_growth_per_thread_kb": round(rss_growth * 1000 / args.users, 1),
+            "checkpoint_threads_added": len(graph_builder.memory.storage) - checkpoints_before
+        }
+        print_report(result, lags_ms, memory, {
+            "users": args.users,
+            "requests_per_user": args.requests_per_user,
+            "model_latency_ms": f"{args.model_latency_ms} (+{args.model_jitter_ms} jitter)",
+            "tool_calls_per_turn": args.tool_calls,
+            "rag_server": args.rag_url or f"stub ({args.tool_latency_ms} ms)"
+        })
+    finally:
+        server.stop()
+        if stub is not None:
+            stub.terminate()
+            stub.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    main()
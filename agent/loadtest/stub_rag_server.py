@@ -0,0 +1,51 @@
+import argparse
+import asyncio
+
+from fastmcp import FastMCP
+
+mcp = FastMCP("Stub RAG Server")
+
+# Set from the command line; the tool reads it on every call
+LATENCY_S = 0.05
+RESULTS = 5
+
+
+@mcp.tool()
+async def retrieve_documents(query: str, top_k: int = 5) -> dict:
+    """
+    Stand-in for rag_server.retrieve_documents: returns canned chunks after a fixed delay.
+
+    Args:
+        query: Search query text
+        top_k: Number of results to return
+    """
+    await asyncio.sleep(LATENCY_S)
+    count = min(top_k, RESULTS)
+    return {
+        "success": True,
+        "query": query,
+        "total_results": count,
+        "top_k": top_k,
+        "documents": [
+            {
+                "rank": rank,
+                "content": f"Stub passage {rank} about {query[:80]}.",
+                "score": 0.1 * rank,
+                "metadata": {"source": "stub.pdf", "page": rank, "chunk_index": 0}
+            }
+            for rank in range(1, count + 1)
+        ]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Stub MCP server for agent load tests")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3900)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--results", type=int, default=5)
+    args = parser.parse_args()
+
+    LATENCY_S = args.latency_ms / 1000
+    RESULTS = args.results
+    mcp.run(transport="streamable-http", host=args.host, port=args.port, path="/mcp", log_level="warning")
@@ -1,14 +1,23 @@
+import time
+
 import uvicorn
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
-from agent.api.routes import chat, health
+from agent.api.routes import chat, health, metrics
 from agent.api.services.agent_service import get_agent_service
 from agent.utils.logger import get_logger
+from agent.utils.tracing import configure_tracing, shutdown_tracing
+from agent.utils.metrics import get_metrics_registry
 
 logger = get_logger(__name__)
 
+registry = get_metrics_registry()
+HTTP_REQUESTS = registry.counter("agent_http_requests_total", "HTTP requests by route, method and status", ["route", "method", "status"])
+HTTP_LATENCY = registry.histogram("agent_http_request_duration_seconds", "HTTP request latency by route", ["route", "method"])
+HTTP_IN_FLIGHT = registry.gauge("agent_http_requests_in_flight", "HTTP requests currently being served")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -16,6 +25,7 @@ async def lifespan(app: FastAPI):
     Application lifespan handler for startup and shutdown events.
     """
     logger.info("Starting up AGENTIC_MCP API...")
+    configure_tracing("agent-api")
     service = get_agent_service()
     try:
         await service.initialize_agent()
@@ -27,6 +37,7 @@ async def lifespan(app: FastAPI):
     
     logger.info("Shutting down AGENTIC_MCP API...")
     await service.shutdown()
+    shutdown_tracing()
     logger.info("Shutdown complete")
 
 
@@ -53,9 +64,27 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
     
+    @app.middleware("http")
+    async def record_request_metrics(request: Request, call_next):
+        """Count and time every request, labelled by route template rather than raw path."""
+        start = time.perf_counter()
+        status = 500
+        HTTP_IN_FLIGHT.inc()
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            HTTP_REQUESTS.inc(route=path, method=request.method, status=str(status))
+            HTTP_LATENCY.observe(time.perf_counter() - start, route=path, method=request.method)
+
     # Include routers
     app.include_router(health.router)
     app.include_router(chat.router)
+    app.include_router(metrics.router)
 
     
     @app.get("/", tags=["Root"])
@@ -66,7 +95,8 @@ def create_app() -> FastAPI:
             "description": "AI Assistant for IMT Mines Alès",
             "version": "1.0.0",
             "docs": "/docs",
-            "health": "/health"
+            "health": "/health",
+            "metrics": "/metrics"
         }
     
     return app
@@ -0,0 +1,179 @@
+import json
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence
+
+import httpx
+
+from agent.utils.logger import get_logger
+from agent.config.setting import settings
+
+TRACING_EXPORTER = settings.TRACING_EXPORTER
+TRACING_JSON_PATH = settings.TRACING_JSON_PATH
+
+logger = get_logger(__name__)
+
+try:
+    from opentelemetry import propagate, trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import ReadableSpan, TracerProvider
+    from opentelemetry.sdk.trace.export import (
+        BatchSpanProcessor,
+        ConsoleSpanExporter,
+        SpanExporter,
+        SpanExportResult
+    )
+    from opentelemetry.trace import Status, StatusCode
+    OTEL_AVAILABLE = True
+except ImportError:
+    OTEL_AVAILABLE = False
+
+_tracer = None
+
+
+if OTEL_AVAILABLE:
+
+    class JsonFileSpanExporter(SpanExporter):
+        """Append finished spans to a file as JSON lines, in OpenTelemetry's span JSON shape."""
+
+        def __init__(self, path: str):
+            self.path = path
+            self._lock = threading.Lock()
+
+        def export(self, spans: Sequence[ReadableSpan]) -> "SpanExportResult":
+            lines = [json.dumps(json.loads(span.to_json()), separators=(",", ":")) for span in spans]
+            try:
+                with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                return SpanExportResult.SUCCESS
+            except OSError as e:
+                logger.warning(f"Could not write spans to {self.path}: {e}")
+                return SpanExportResult.FAILURE
+
+        def shutdown(self) -> None:
+            pass
+
+
+def _make_exporter(exporter: str, json_path: str):
+    if exporter == "json":
+        return JsonFileSpanExporter(json_path)
+    if exporter == "console":
+        return ConsoleSpanExporter()
+    if exporter == "otlp":
+        # Endpoint and headers come from the standard OTEL_EXPORTER_OTLP_* variables
+        from opentelemetry.exporter.otlp.proto.grpc.trace_exporter import OTLPSpanExporter
+        return OTLPSpanExporter()
+    raise ValueError(f"Unknown tracing exporter '{exporter}', expected none, json, console or otlp")
+
+
+def configure_tracing(
+    service_name: str,
+    exporter: str = TRACING_EXPORTER,
+    json_path: str = TRACING_JSON_PATH
+) -> bool:
+    """
+    Install a tracer provider exporting to `exporter`; "none" keeps tracing off.
+
+    Spans are cheap no-ops until this is called with an exporter, and always
+    when OpenTelemetry is not installed.
+
+    Returns:
+        True if spans will be exported
+    """
+    global _tracer
+
+    if exporter == "none":
+        return False
+    if not OTEL_AVAILABLE:
+        logger.warning("Tracing requested but opentelemetry-sdk is not installed; spans are disabled")
+        return False
+
+    try:
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        provider.add_span_processor(BatchSpanProcessor(_make_exporter(exporter, json_path)))
+        trace.set_tracer_provider(provider)
+        _tracer = trace.get_tracer(service_name)
+        logger.info(f"Tracing enabled for '{service_name}' with the {exporter} exporter")
+        return True
+    except Exception as e:
+        logger.warning(f"Could not enable tracing: {e}")
+        return False
+
+
+def shutdown_tracing() -> None:
+    """Flush buffered spans, e.g. before the process exits."""
+    if _tracer is not None:
+        provider = trace.get_tracer_provider()
+        if hasattr(provider, "shutdown"):
+            provider.shutdown()
+
+
+@contextmanager
+def span(name: str, context: Any = None, **attributes: Any) -> Iterator[Any]:
+    """
+    Open a span named `name` as a child of the current span, or of `context`
+    when given (e.g. a context extracted from incoming headers).
+
+    Attributes with a None value are skipped. Yields the span, or None when
+    tracing is off.
+    """
+    if _tracer is None:
+        yield None
+        return
+
+    with _tracer.start_as_current_span(name, context=context) as current:
+        for key, value in attributes.items():
+            if value is not None:
+                current.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+        try:
+            yield current
+        except Exception as e:
+            current.set_status(Status(StatusCode.ERROR, str(e)))
+            raise
+
+
+def set_attributes(current: Any, **attributes: Any) -> None:
+    """Add attributes to a span yielded by `span`; does nothing when tracing is off."""
+    if current is None:
+        return
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(key, value if isinstance(value, (str, bool, int, float)) else str(value))
+
+
+def inject_context(headers: Dict[str, str]) -> Dict[str, str]:
+    """Add W3C trace context headers (traceparent) for the current span to `headers`."""
+    if _tracer is not None:
+        propagate.inject(headers)
+    return headers
+
+
+def extract_context(headers: Optional[Mapping[str, str]]) -> Any:
+    """Trace context carried by incoming request headers, for use as `span(context=...)`."""
+    if _tracer is None or not headers:
+        return None
+    return propagate.extract(headers)
+
+
+def traced_http_client_factory(
+    headers: Optional[Dict[str, str]] = None,
+    timeout: Optional[httpx.Timeout] = None,
+    auth: Optional[httpx.Auth] = None
+) -> httpx.AsyncClient:
+    """
+    httpx client factory for MCP connections that stamps every request with
+    the trace context active when the request is sent.
+    """
+
+    async def add_trace_headers(request: httpx.Request) -> None:
+        carrier: Dict[str, str] = {}
+        inject_context(carrier)
+        request.headers.update(carrier)
+
+    return httpx.AsyncClient(
+        headers=headers,
+        timeout=timeout or httpx.Timeout(30.0),
+        auth=auth,
+        follow_redirects=True,
+        event_hooks={"request": [add_trace_headers]}
+    )
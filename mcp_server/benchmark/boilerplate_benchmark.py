@@ -0,0 +1,57 @@
+import argparse
+import copy
+import time
+from typing import Dict
+
+from mcp_server.server.tools.rag.ingestion.boilerplate import strip_boilerplate
+from mcp_server.server.tools.rag.ingestion.chunking import chunk_documents
+from mcp_server.server.tools.rag.ingestion.pdf_loader import PDFLoader
+from mcp_server.config.constants import DATA_PATH
+
+STRATEGIES = ["recursive", "structure"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Characters and chunks saved by stripping running headers and footers")
+    parser.add_argument("--source", default=DATA_PATH, help="PDF file or directory")
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=STRATEGIES)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    raw = PDFLoader(enable_cache=False, enable_page_cache=False, strip_boilerplate=False).load(args.source)
+    load_s = time.perf_counter() - start
+    print(f"Loaded {len(raw)} pages from {args.source} in {load_s:.2f}s")
+
+    stripped = copy.deepcopy(raw)
+    start = time.perf_counter()
+    _, stats = strip_boilerplate(stripped)
+    strip_ms = (time.perf_counter() - start) * 1000
+
+    rows: Dict[str, Dict] = {}
+    for strategy in args.strategies:
+        before = chunk_documents(copy.deepcopy(raw), strategy=strategy, strip_boilerplate=False)
+        after = chunk_documents(copy.deepcopy(stripped), strategy=strategy, strip_boilerplate=True)
+        rows[strategy] = {
+            "chunks_before": len(before),
+            "chunks_after": len(after),
+            "chunks_saved": len(before) - len(after),
+            "chars_before": sum(len(c.page_content) for c in before),
+            "chars_after": sum(len(c.page_content) for c in after)
+        }
+
+    print("\n" + "=" * 80)
+    print("BOILERPLATE BENCHMARK")
+    print("=" * 80)
+    for key, value in stats.items():
+        print(f"{key:<24}{value:>16}")
+    print(f"{'strip_ms':<24}{round(strip_ms, 2):>16}")
+    print(f"{'strip_share_of_load':<24}{strip_ms / 1000 / load_s:>16.2%}")
+    print("-" * 80)
+    print(f"{'metric':<24}" + "".join(f"{strategy:>16}" for strategy in rows))
+    for metric in next(iter(rows.values())):
+        print(f"{metric:<24}" + "".join(f"{row[metric]:>16}" for row in rows.values()))
+    print("=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
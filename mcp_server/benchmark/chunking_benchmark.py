@@ -0,0 +1,90 @@
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+from agent.evaluation.data_set import testset
+from mcp_server.benchmark.retrieval_benchmark import build_labels, run_benchmark
+from mcp_server.server.tools.rag.collection_registry import configure_collection_registry
+from mcp_server.server.tools.rag.ingestion.chunking import chunk_documents
+from mcp_server.server.tools.rag.ingestion.layout_chunking import count_tokens
+from mcp_server.server.tools.rag.ingestion.pdf_loader import PDFLoader
+from mcp_server.server.tools.rag.ingestion.vector_store import get_or_create_vector_store
+from mcp_server.config.constants import DATA_PATH, TOP_K
+
+STRATEGIES = ["recursive", "structure"]
+
+
+def ingest_with_strategy(documents, strategy: str, persist_directory: str) -> Dict:
+    """Chunk and index `documents` into a scratch collection, timing each step."""
+    start = time.perf_counter()
+    chunks = chunk_documents(documents, strategy=strategy)
+    chunk_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    get_or_create_vector_store(
+        text_chunks=chunks,
+        collection_name=f"bench-{strategy}",
+        persist_directory=persist_directory
+    )
+    index_s = time.perf_counter() - start
+
+    tokens = count_tokens([chunk.page_content for chunk in chunks])
+    return {
+        "chunks": len(chunks),
+        "mean_tokens_per_chunk": round(statistics.fmean(tokens), 1) if tokens else 0.0,
+        "max_tokens_per_chunk": max(tokens) if tokens else 0,
+        "chunk_s": round(chunk_s, 2),
+        "embed_and_write_s": round(index_s, 2),
+        "ingest_s": round(chunk_s + index_s, 2)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the recursive and structure-aware chunkers")
+    parser.add_argument("--source", default=DATA_PATH, help="PDF file or directory to ingest")
+    parser.add_argument("--top-k", type=int, default=TOP_K)
+    args = parser.parse_args()
+
+    documents = PDFLoader(enable_cache=False).load(args.source)
+    print(f"Loaded {len(documents)} pages from {args.source}")
+
+    persist_directory = tempfile.mkdtemp(prefix="chunking_benchmark_")
+    configure_collection_registry(persist_directory=persist_directory)
+
+    try:
+        results: Dict[str, Dict] = {
+            strategy: ingest_with_strategy(documents, strategy, persist_directory)
+            for strategy in STRATEGIES
+        }
+
+        # Page-level labels do not depend on how the pages were chunked
+        labelled = build_labels(testset, collection="bench-recursive")
+        print(f"Labelled {len(labelled)}/{len(testset)} questions from the test set")
+
+        for strategy in STRATEGIES:
+            retrieval = run_benchmark(labelled, top_k=args.top_k, collection=f"bench-{strategy}")
+            results[strategy].update({k: v for k, v in retrieval.items() if k != "rerank"})
+
+        _print_report(results)
+    finally:
+        shutil.rmtree(persist_directory, ignore_errors=True)
+
+
+def _print_report(results: Dict[str, Dict]) -> None:
+    metrics: List[str] = list(next(iter(results.values())))
+
+    print("\n" + "=" * 80)
+    print("CHUNKING BENCHMARK")
+    print("=" * 80)
+    print(f"{'metric':<24}" + "".join(f"{strategy:>16}" for strategy in results))
+    print("-" * 80)
+    for metric in metrics:
+        print(f"{metric:<24}" + "".join(f"{str(row[metric]):>16}" for row in results.values()))
+    print("=" * 80 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+import random
+from typing import List
+
+# Vocabulary of the generated benchmark text
+WORDS = (
+    "engineering student module course credits semester laboratory project assessment "
+    "environment energy materials systems design analysis management research industry "
+    "internship teaching objectives skills knowledge evaluation examination report "
+    "innovation sustainability data modelling simulation process quality safety"
+).split()
+
+
+def sentence(rng: random.Random) -> str:
+    """A generated sentence of 8-22 words from WORDS."""
+    words = rng.choices(WORDS, k=rng.randint(8, 22))
+    return " ".join(words).capitalize() + "."
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of `values`."""
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
@@ -0,0 +1,123 @@
+import argparse
+import random
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+from agent.evaluation.data_set import testset
+from mcp_server.benchmark.common import percentile, sentence
+from mcp_server.config.constants import EMBED_MODEL, EMBED_INTRA_OP_THREADS, EMBED_MAX_SEQ_LENGTH
+
+
+def generate_passages(count: int, seed: int = 0) -> List[str]:
+    """Chunk-sized passages (roughly 60-250 words) of generated sentences."""
+    rng = random.Random(seed)
+    return [" ".join(sentence(rng) for _ in range(rng.randint(4, 14))) for _ in range(count)]
+
+
+def measure(embeddings: Embeddings, passages: List[str], queries: List[str]) -> Dict:
+    """Document throughput and single-query latency of one backend."""
+    # Warm up: first calls pay for lazy initialisation and memory allocation
+    embeddings.embed_documents(passages[:4])
+    embeddings.embed_query(queries[0])
+
+    start = time.perf_counter()
+    doc_vectors = embeddings.embed_documents(passages)
+    doc_s = time.perf_counter() - start
+
+    latencies, query_vectors = [], []
+    for query in queries:
+        start = time.perf_counter()
+        query_vectors.append(embeddings.embed_query(query))
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "sentences_per_s": round(len(passages) / doc_s, 1),
+        "query_p50_ms": round(percentile(latencies, 50), 2),
+        "query_p95_ms": round(percentile(latencies, 95), 2),
+        "doc_vectors": np.asarray(doc_vectors, dtype=np.float32),
+        "query_vectors": np.asarray(query_vectors, dtype=np.float32)
+    }
+
+
+def cosine_agreement(reference: np.ndarray, candidate: np.ndarray) -> Dict[str, float]:
+    """Row-wise cosine similarity between two embeddings of the same texts."""
+    ref = reference / np.linalg.norm(reference, axis=1, keepdims=True)
+    cand = candidate / np.linalg.norm(candidate, axis=1, keepdims=True)
+    cosines = (ref * cand).sum(axis=1)
+    return {
+        "cosine_mean": round(float(cosines.mean()), 5),
+        "cosine_p5": round(float(np.percentile(cosines, 5)), 5),
+        "cosine_min": round(float(cosines.min()), 5)
+    }
+
+
+def top1_agreement(reference: Dict, candidate: Dict) -> float:
+    """Share of queries whose nearest passage is the same under both backends."""
+    ref = (reference["query_vectors"] @ reference["doc_vectors"].T).argmax(axis=1)
+    cand = (candidate["query_vectors"] @ candidate["doc_vectors"].T).argmax(axis=1)
+    return round(float((ref == cand).mean()), 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedding backends: throughput, query latency and agreement with PyTorch")
+    parser.add_argument("--model", default=EMBED_MODEL)
+    parser.add_argument("--passages", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=EMBED_INTRA_OP_THREADS, help="ONNX Runtime intra-op threads, 0 for default")
+    parser.add_argument("--max-seq-length", type=int, default=EMBED_MAX_SEQ_LENGTH)
+    parser.add_argument("--quantize", action="store_true", help="Also benchmark the int8 ONNX model")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    from langchain_huggingface import HuggingFaceEmbeddings
+    from mcp_server.server.tools.rag.ingestion.onnx_embeddings import OnnxEmbeddings
+
+    passages = generate_passages(args.passages, args.seed)
+    queries = [item["inputs"]["question"] for item in testset]
+
+    backends: Dict[str, Callable[[], Embeddings]] = {
+        "torch": lambda: HuggingFaceEmbeddings(model_name=args.model),
+        "onnx-fp32": lambda: OnnxEmbeddings(
+            model_name=args.model, quantize=False, intra_op_threads=args.threads, max_seq_length=args.max_seq_length
+        )
+    }
+    if args.quantize:
+        backends["onnx-int8"] = lambda: OnnxEmbeddings(
+            model_name=args.model, quantize=True, intra_op_threads=args.threads, max_seq_length=args.max_seq_length
+        )
+
+    results: Dict[str, Dict] = {}
+    for name, load in backends.items():
+        start = time.perf_counter()
+        embeddings = load()
+        load_s = time.perf_counter() - start
+        results[name] = {"load_s": round(load_s, 2), **measure(embeddings, passages, queries)}
+        del embeddings
+
+    reference = results["torch"]
+    columns = ["load_s", "sentences_per_s", "query_p50_ms", "query_p95_ms", "speedup",
+               "cosine_mean", "cosine_min", "top1_agreement"]
+
+    print("\n" + "=" * 110)
+    print(f"EMBEDDING BACKENDS ({args.model}, {len(passages)} passages, {len(queries)} queries)")
+    print("=" * 110)
+    print(f"{'backend':<12}" + "".join(f"{c:>12}" for c in columns))
+    print("-" * 110)
+    for name, metrics in results.items():
+        row = {
+            **metrics,
+            "speedup": round(metrics["sentences_per_s"] / reference["sentences_per_s"], 2),
+            **cosine_agreement(
+                np.vstack([reference["doc_vectors"], reference["query_vectors"]]),
+                np.vstack([metrics["doc_vectors"], metrics["query_vectors"]])
+            ),
+            "top1_agreement": top1_agreement(reference, metrics)
+        }
+        print(f"{name:<12}" + "".join(f"{row[c]:>12}" for c in columns))
+    print("=" * 110 + "\n")
+
+
+if __name__ == "__main__":
+    main()
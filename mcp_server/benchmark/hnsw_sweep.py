@@ -0,0 +1,185 @@
+import argparse
+import itertools
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import chromadb
+import numpy as np
+
+from mcp_server.server.tools.rag.collection_registry import get_collection_registry
+from mcp_server.server.tools.rag.ingestion.index_config import IndexConfig
+from mcp_server.config.constants import CHROMA_COLLECTION_NAME, SNAPSHOT_BATCH_SIZE
+
+
+def load_vectors(collection: str) -> np.ndarray:
+    """Every stored embedding of `collection`, read without loading the embedding model."""
+    registry = get_collection_registry()
+    source = chromadb.PersistentClient(path=registry.persist_directory).get_collection(registry.resolve(collection))
+    blocks = [
+        np.asarray(source.get(limit=SNAPSHOT_BATCH_SIZE, offset=offset, include=["embeddings"])["embeddings"], dtype=np.float32)
+        for offset in range(0, source.count(), SNAPSHOT_BATCH_SIZE)
+    ]
+    return np.concatenate(blocks)
+
+
+def synthetic_vectors(count: int, dim: int, clusters: int = 64, seed: int = 0) -> np.ndarray:
+    """Unit vectors drawn around random centres, closer to text embeddings than uniform noise."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, dim)).astype(np.float32)
+    vectors = centres[rng.integers(clusters, size=count)] + 0.5 * rng.standard_normal((count, dim)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_neighbours(vectors: np.ndarray, queries: np.ndarray, k: int, space: str) -> np.ndarray:
+    """Brute-force top-k row indices per query under Chroma's distance for `space`."""
+    result = []
+    for block in np.array_split(queries, max(1, len(queries) // 64)):
+        if space == "l2":
+            distances = (block ** 2).sum(1)[:, None] - 2 * block @ vectors.T + (vectors ** 2).sum(1)[None, :]
+        elif space == "cosine":
+            norms = np.linalg.norm(vectors, axis=1)
+            distances = 1 - (block @ vectors.T) / (np.linalg.norm(block, axis=1)[:, None] * norms[None, :])
+        else:
+            distances = 1 - block @ vectors.T
+        result.append(np.argsort(distances, axis=1)[:, :k])
+    return np.concatenate(result)
+
+
+def _index_mb(path: Path) -> float:
+    """Size of the HNSW segment files, which is what the index holds in memory once loaded."""
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file() and not f.name.startswith("chroma.sqlite3")) / 1e6
+
+
+def measure(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    truth: np.ndarray,
+    config: IndexConfig,
+    k: int,
+    workdir: Path
+) -> Dict:
+    """Build one index with `config` in a scratch store and measure recall@k, latency and size."""
+    path = workdir / f"{config.space}-{config.m}-{config.construction_ef}-{config.search_ef}"
+    client = chromadb.PersistentClient(path=str(path))
+    collection = client.create_collection("hnsw-sweep", metadata=config.to_metadata())
+
+    start = time.perf_counter()
+    batch_size = client.get_max_batch_size()
+    for batch_start in range(0, len(vectors), batch_size):
+        batch = vectors[batch_start:batch_start + batch_size]
+        collection.add(ids=[str(i) for i in range(batch_start, batch_start + len(batch))], embeddings=batch)
+    build_s = time.perf_counter() - start
+
+    # One query first so index loading is not counted as query latency
+    collection.query(query_embeddings=queries[:1], n_results=k, include=[])
+
+    latencies, hits = [], 0
+    for query, expected in zip(queries, truth):
+        query_start = time.perf_counter()
+        ids = collection.query(query_embeddings=query[None, :], n_results=k, include=[])["ids"][0]
+        latencies.append((time.perf_counter() - query_start) * 1000)
+        hits += len({int(i) for i in ids} & set(expected.tolist()))
+
+    metrics = {
+        **config.to_dict(),
+        f"recall@{k}": round(hits / (len(queries) * k), 4),
+        "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+        "p95_ms": round(float(np.percentile(latencies, 95)), 3),
+        "build_s": round(build_s, 3),
+        "index_mb": round(_index_mb(path), 2)
+    }
+    del collection, client
+    shutil.rmtree(path, ignore_errors=True)
+    return metrics
+
+
+def sweep(
+    vectors: np.ndarray,
+    spaces: List[str],
+    ms: List[int],
+    construction_efs: List[int],
+    search_efs: List[int],
+    queries: int = 200,
+    k: int = 10,
+    seed: int = 0
+) -> List[Dict]:
+    """
+    Measure every combination of HNSW parameters on `vectors`.
+
+    `queries` vectors are held out of the index and used as queries, and
+    recall@k is measured against exact search over the indexed vectors.
+    search_ef gets its own build per value because Chroma fixes it when an
+    index is loaded.
+    """
+    rng = np.random.default_rng(seed)
+    held_out = rng.choice(len(vectors), size=min(queries, len(vectors) // 10 or 1), replace=False)
+    mask = np.ones(len(vectors), dtype=bool)
+    mask[held_out] = False
+    indexed, query_vectors = vectors[mask], vectors[held_out]
+
+    workdir = Path(tempfile.mkdtemp(prefix="hnsw_sweep_"))
+    rows = []
+    try:
+        for space in spaces:
+            truth = exact_neighbours(indexed, query_vectors, k, space)
+            for m, construction_ef, search_ef in itertools.product(ms, construction_efs, search_efs):
+                config = IndexConfig(space=space, m=m, construction_ef=construction_ef, search_ef=search_ef)
+                rows.append(measure(indexed, query_vectors, truth, config, k, workdir))
+                print(f"{config}: recall@{k}={rows[-1][f'recall@{k}']} p95={rows[-1]['p95_ms']}ms")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return rows
+
+
+def recommend(rows: List[Dict], k: int, target_recall: float) -> Tuple[Dict, bool]:
+    """The lowest-p95 configuration meeting `target_recall`, else the most accurate one."""
+    meeting = [row for row in rows if row[f"recall@{k}"] >= target_recall]
+    if meeting:
+        return min(meeting, key=lambda row: (row["p95_ms"], row["index_mb"])), True
+    return max(rows, key=lambda row: row[f"recall@{k}"]), False
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep HNSW parameters: recall@k against exact search, latency, build time and index size")
+    parser.add_argument("--collection", default=CHROMA_COLLECTION_NAME, help="Collection whose stored vectors are indexed")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use this many generated vectors instead of a collection")
+    parser.add_argument("--dim", type=int, default=1024, help="Dimension of generated vectors")
+    parser.add_argument("--space", nargs="+", default=["l2"], choices=["l2", "cosine", "ip"])
+    parser.add_argument("--m", nargs="+", type=int, default=[8, 16, 32])
+    parser.add_argument("--construction-ef", nargs="+", type=int, default=[100, 200])
+    parser.add_argument("--search-ef", nargs="+", type=int, default=[10, 50, 100, 200])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--target-recall", type=float, default=0.95)
+    args = parser.parse_args()
+
+    vectors = synthetic_vectors(args.synthetic, args.dim) if args.synthetic else load_vectors(args.collection)
+    source = f"{args.synthetic} synthetic vectors" if args.synthetic else f"collection '{args.collection}'"
+    print(f"Sweeping {len(vectors)} x {vectors.shape[1]} vectors from {source}")
+
+    rows = sweep(vectors, args.space, args.m, args.construction_ef, args.search_ef, args.queries, args.k)
+
+    columns = ["space", "m", "construction_ef", "search_ef", f"recall@{args.k}", "p50_ms", "p95_ms", "build_s", "index_mb"]
+    print("\n" + "=" * 144)
+    print("HNSW SWEEP")
+    print("=" * 144)
+    print("".join(f"{c:>16}" for c in columns))
+    print("-" * 144)
+    for row in rows:
+        print("".join(f"{row[c]:>16}" for c in columns))
+    print("-" * 144)
+    best, met = recommend(rows, args.k, args.target_recall)
+    settings = ", ".join(f"{key}={best[key]}" for key in ("space", "m", "construction_ef", "search_ef"))
+    if met:
+        print(f"Fastest with recall@{args.k} >= {args.target_recall}: {settings}")
+    else:
+        print(f"No configuration reached recall@{args.k} >= {args.target_recall}; most accurate: {settings}")
+    print("Apply with the configure_index tool, or HNSW_* environment variables for new collections")
+    print("=" * 144 + "\n")
+
+
+if __name__ == "__main__":
+    main()
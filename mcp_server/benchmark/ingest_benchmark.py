@@ -0,0 +1,92 @@
+import argparse
+import random
+import shutil
+import tempfile
+from pathlib import Path
+
+import fitz
+
+from mcp_server.benchmark.common import WORDS, sentence
+from mcp_server.server.tools.rag.collection_registry import configure_collection_registry
+from mcp_server.server.tools.rag.ingestion.pipeline import run_ingest
+
+STAGES = ["load", "chunk", "dedupe", "model_load", "embed", "write"]
+
+
+def generate_corpus(directory: Path, documents: int, pages: int, seed: int = 0) -> int:
+    """
+    Write `documents` PDFs of `pages` pages each: a heading followed by
+    paragraphs of generated sentences, filling most of an A4 page.
+
+    Returns:
+        Total size of the generated files in bytes
+    """
+    rng = random.Random(seed)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for doc_number in range(documents):
+        pdf = fitz.open()
+        for page_number in range(pages):
+            page = pdf.new_page()
+            heading = f"Module {doc_number}.{page_number} - {rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}"
+            page.insert_text((72, 72), heading, fontsize=16)
+
+            body = "\n\n".join(" ".join(sentence(rng) for _ in range(rng.randint(3, 6))) for _ in range(5))
+            page.insert_textbox(fitz.Rect(72, 100, 523, 770), body, fontsize=10)
+        pdf.save(directory / f"synthetic_{doc_number:04d}.pdf")
+        pdf.close()
+
+    return sum(f.stat().st_size for f in directory.glob("*.pdf"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ingest a generated PDF corpus into a scratch store and break down time per stage")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10, help="Pages per document")
+    parser.add_argument("--strategy", choices=["recursive", "structure"], default="recursive")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep the generated corpus and store")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="ingest_benchmark_"))
+    corpus = workdir / "corpus"
+    try:
+        size = generate_corpus(corpus, args.documents, args.pages, args.seed)
+        print(f"Generated {args.documents} PDFs x {args.pages} pages ({size / 1e6:.2f} MB) in {corpus}")
+
+        configure_collection_registry(persist_directory=str(workdir / "store"))
+        result = run_ingest(
+            source=str(corpus),
+            source_type="directory",
+            chunking_strategy=args.strategy,
+            enable_cache=False,
+            collection="ingest-benchmark"
+        )
+        if not result["success"]:
+            raise RuntimeError(result["error"])
+
+        profile = result["profile"]
+        total = profile["total_s"] or 1.0
+
+        print("\n" + "=" * 80)
+        print(f"INGEST BENCHMARK ({result['pages_loaded']} pages, {result['chunks_created']} chunks, {args.strategy})")
+        print("=" * 80)
+        print(f"{'stage':<14}{'seconds':>12}{'share':>10}")
+        print("-" * 80)
+        for stage in STAGES:
+            seconds = profile.get(f"{stage}_s", 0.0)
+            print(f"{stage:<14}{seconds:>12.3f}{seconds / total:>10.1%}")
+        print(f"{'total':<14}{total:>12.3f}")
+        print("-" * 80)
+        for key in ["mb_per_s", "pages_per_s", "chunks_per_s", "embed_chunks_per_s", "rss_start_mb", "rss_peak_mb", "rss_end_mb"]:
+            print(f"{key:<22} {profile[key]}")
+        print("=" * 80 + "\n")
+    finally:
+        if args.keep:
+            print(f"Kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
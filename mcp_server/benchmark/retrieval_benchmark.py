@@ -0,0 +1,304 @@
+import argparse
+import gc
+import json
+import os
+import re
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from agent.evaluation.data_set import testset
+from mcp_server.benchmark.common import percentile
+from mcp_server.server.tools.rag.collection_registry import get_collection_registry, configure_collection_registry
+from mcp_server.server.tools.rag.rag_server import retrieve_documents
+from mcp_server.config.constants import TOP_K, CHROMA_COLLECTION_NAME
+
+MIN_LABEL_OVERLAP = 0.5
+RECALL_AT = (1, 3, 5, 10)
+CONCURRENCY_LEVELS = (1, 2, 4, 8)
+QUERIES_PER_LEVEL = 100
+_WORD_RE = re.compile(r"\w{4,}")
+
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def build_labels(dataset: List[Dict], collection: str = CHROMA_COLLECTION_NAME) -> List[Dict]:
+    """
+    Derive a (source, page) label for each test question.
+
+    The label is the chunk whose text covers the largest share of the words
+    of the expected response. Questions whose best chunk covers less than
+    MIN_LABEL_OVERLAP of those words are left unlabelled.
+    """
+    chroma_collection = get_collection_registry().get(collection, must_exist=True).vector_store._collection
+    stored = chroma_collection.get(include=["documents", "metadatas"])
+
+    chunks = [
+        (_words(text or ""), Path(meta.get("source", "")).name, meta.get("page"))
+        for text, meta in zip(stored["documents"], stored["metadatas"])
+    ]
+
+    labelled = []
+    for item in dataset:
+        expected_words = _words(item["expectations"]["expected_response"])
+        if not expected_words or not chunks:
+            continue
+
+        best_words, source, page = max(chunks, key=lambda c: len(c[0] & expected_words))
+        overlap = len(best_words & expected_words) / len(expected_words)
+        if overlap >= MIN_LABEL_OVERLAP:
+            labelled.append({
+                "question": item["inputs"]["question"],
+                "source": source,
+                "page": page,
+                "overlap": round(overlap, 2)
+            })
+
+    return labelled
+
+
+def save_labels(labelled: List[Dict], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(labelled, f, indent=2, ensure_ascii=False)
+
+
+def load_labels(path: str) -> List[Dict]:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _first_hit_rank(documents: List[Dict], source: str, page) -> Optional[int]:
+    for doc in documents:
+        metadata = doc["metadata"]
+        if Path(str(metadata["source"])).name == source and metadata["page"] == page:
+            return doc["rank"]
+    return None
+
+
+def _timed_query(item: Dict, top_k: int, collection: str, **options) -> Tuple[float, Optional[int]]:
+    """Latency in ms and rank of the labelled page for one question."""
+    start = time.perf_counter()
+    result = retrieve_documents.fn(query=item["question"], top_k=top_k, collection=collection, **options)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if not result["success"]:
+        raise RuntimeError(result["error"])
+    return elapsed_ms, _first_hit_rank(result["documents"], item["source"], item["page"])
+
+
+def run_benchmark(
+    labelled: List[Dict],
+    top_k: int = TOP_K,
+    rerank: bool = False,
+    rerank_candidates: Optional[int] = None,
+    collection: str = CHROMA_COLLECTION_NAME,
+    recall_at: Tuple[int, ...] = RECALL_AT
+) -> Dict:
+    """
+    Run every labelled question through `retrieve_documents` once and aggregate metrics.
+
+    Each question has a single relevant (source, page), so recall@k is the
+    share of questions whose page appears in the first k results.
+
+    Args:
+        labelled: Output of build_labels
+        top_k: Number of results retrieved per question
+        rerank: Enable cross-encoder reranking
+        rerank_candidates: Candidates passed to the reranker
+        collection: Collection to query
+        recall_at: Cut-offs reported as recall@k; those above top_k are skipped
+
+    Returns:
+        Dictionary of quality and latency metrics
+    """
+    latencies: List[float] = []
+    ranks: List[Optional[int]] = []
+
+    # Measure real retrieval, not the per-collection result cache
+    get_collection_registry().invalidate(collection)
+
+    for item in labelled:
+        elapsed_ms, rank = _timed_query(
+            item, top_k, collection, rerank=rerank, rerank_candidates=rerank_candidates
+        )
+        latencies.append(elapsed_ms)
+        ranks.append(rank)
+
+    metrics: Dict = {"rerank": rerank, "questions": len(labelled)}
+    for k in sorted({k for k in recall_at if k <= top_k} | {top_k}):
+        metrics[f"recall@{k}"] = round(sum(1 for r in ranks if r is not None and r <= k) / len(ranks), 3) if ranks else 0.0
+    metrics["mrr"] = round(sum(1 / r for r in ranks if r is not None) / len(ranks), 3) if ranks else 0.0
+    metrics.update(latency_summary(latencies))
+    return metrics
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {"latency_mean_ms": 0.0, "latency_p50_ms": 0.0, "latency_p95_ms": 0.0, "latency_p99_ms": 0.0}
+    return {
+        "latency_mean_ms": round(statistics.fmean(latencies), 2),
+        "latency_p50_ms": round(percentile(latencies, 50), 2),
+        "latency_p95_ms": round(percentile(latencies, 95), 2),
+        "latency_p99_ms": round(percentile(latencies, 99), 2)
+    }
+
+
+def measure_throughput(
+    labelled: List[Dict],
+    concurrency_levels: Tuple[int, ...] = CONCURRENCY_LEVELS,
+    queries_per_level: int = QUERIES_PER_LEVEL,
+    top_k: int = TOP_K,
+    collection: str = CHROMA_COLLECTION_NAME,
+    **options
+) -> Dict[int, Dict]:
+    """
+    Queries per second and latency percentiles with N concurrent callers.
+
+    The labelled questions are cycled until `queries_per_level` queries have
+    been issued at each level. Run this with a registry whose result cache
+    cannot hold the whole question set, or repeats are served from cache.
+    """
+    report = {}
+    queries = [labelled[i % len(labelled)] for i in range(max(queries_per_level, len(labelled)))]
+
+    for concurrency in concurrency_levels:
+        get_collection_registry().invalidate(collection)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            timings = list(pool.map(lambda item: _timed_query(item, top_k, collection, **options)[0], queries))
+        wall_s = time.perf_counter() - start
+
+        report[concurrency] = {
+            "queries": len(queries),
+            "qps": round(len(queries) / wall_s, 2),
+            **latency_summary(timings)
+        }
+    return report
+
+
+def _rss_mb() -> float:
+    """Current resident set size of this process, in MB."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    # No /proc (e.g. macOS): fall back to peak RSS, reported in bytes on macOS and KB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+def _dir_size_mb(path: str) -> float:
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file()) / 1e6
+
+
+def index_memory(collection: str = CHROMA_COLLECTION_NAME) -> Dict:
+    """
+    Size of the index: vector count, raw vector bytes, on-disk size and the
+    process RSS growth caused by opening the collection and querying it once.
+    """
+    registry = get_collection_registry()
+    registry.drop(collection)
+    gc.collect()
+    rss_before = _rss_mb()
+
+    chroma_collection = registry.get(collection, must_exist=True).vector_store._collection
+    count = chroma_collection.count()
+    sample = chroma_collection.peek(limit=1)
+    dim = len(sample["embeddings"][0]) if count else 0
+
+    # Loading the HNSW segment happens on first query
+    retrieve_documents.fn(query="warm up", top_k=1, collection=collection)
+
+    return {
+        "vectors": count,
+        "dimension": dim,
+        "raw_vectors_mb": round(count * dim * 4 / 1e6, 2),
+        "persist_dir_mb": round(_dir_size_mb(registry.persist_directory), 2),
+        "rss_growth_mb": round(_rss_mb() - rss_before, 2),
+        "rss_mb": round(_rss_mb(), 2)
+    }
+
+
+def _print_report(rows: List[Tuple[str, Dict]]) -> None:
+    print("\n" + "=" * 80)
+    print("RETRIEVAL BENCHMARK")
+    print("=" * 80)
+    for name, metrics in rows:
+        print(f"\n{name}")
+        print("-" * 80)
+        for key, value in metrics.items():
+            print(f"{key:<20} {value}")
+    print("=" * 80 + "\n")
+
+
+def _print_throughput(report: Dict[int, Dict]) -> None:
+    columns = ["qps", "latency_p50_ms", "latency_p95_ms", "latency_p99_ms"]
+    print("THROUGHPUT")
+    print("-" * 80)
+    print(f"{'concurrency':<14}" + "".join(f"{c:>16}" for c in columns))
+    for concurrency, metrics in report.items():
+        print(f"{concurrency:<14}" + "".join(f"{metrics[c]:>16}" for c in columns))
+    print("=" * 80 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline retrieval benchmark: quality, latency, throughput and memory")
+    parser.add_argument("--collection", default=CHROMA_COLLECTION_NAME)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--labels", default=None, help="Labels JSON to load, or to write if it does not exist")
+    parser.add_argument("--rerank", action="store_true", help="Also benchmark cross-encoder reranking")
+    parser.add_argument("--rerank-candidates", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=list(CONCURRENCY_LEVELS))
+    parser.add_argument("--queries-per-level", type=int, default=QUERIES_PER_LEVEL)
+    args = parser.parse_args()
+
+    # A one-entry result cache never serves a repeat when cycling through distinct questions
+    configure_collection_registry(result_cache_size=1)
+
+    memory = index_memory(args.collection)
+
+    if args.labels and Path(args.labels).is_file():
+        labelled = load_labels(args.labels)
+    else:
+        labelled = build_labels(testset, collection=args.collection)
+        if args.labels:
+            save_labels(labelled, args.labels)
+    print(f"Labelled {len(labelled)}/{len(testset)} questions from the test set")
+    if not labelled:
+        return
+
+    rows = [("Bi-encoder only", run_benchmark(labelled, top_k=args.top_k, collection=args.collection))]
+    if args.rerank:
+        # Warm the cross-encoder so model loading is not counted as query latency
+        run_benchmark(labelled[:1], top_k=args.top_k, rerank=True, rerank_candidates=args.rerank_candidates, collection=args.collection)
+        rows.append((
+            "Bi-encoder + cross-encoder rerank",
+            run_benchmark(labelled, top_k=args.top_k, rerank=True, rerank_candidates=args.rerank_candidates, collection=args.collection)
+        ))
+    rows.append(("Index memory", memory))
+
+    throughput = measure_throughput(
+        labelled,
+        concurrency_levels=tuple(args.concurrency),
+        queries_per_level=args.queries_per_level,
+        top_k=args.top_k,
+        collection=args.collection
+    )
+
+    _print_report(rows)
+    _print_throughput(throughput)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import chromadb
+import numpy as np
+
+from mcp_server.benchmark.ingest_benchmark import generate_corpus
+from mcp_server.server.tools.rag.collection_registry import configure_collection_registry
+from mcp_server.server.tools.rag.ingestion.pipeline import run_ingest
+from mcp_server.server.tools.rag.snapshots import write_snapshot, restore_snapshot
+
+COLLECTION = "snapshot-benchmark"
+PRECISIONS = ("float32", "float16")
+
+
+def _dir_size_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / 1e6
+
+
+def _neighbours(persist_directory: str, collection: str, queries: np.ndarray, k: int) -> List[set]:
+    client = chromadb.PersistentClient(path=persist_directory)
+    registry = configure_collection_registry(persist_directory=persist_directory)
+    results = client.get_collection(registry.resolve(collection)).query(query_embeddings=queries, n_results=k, include=[])
+    return [set(ids) for ids in results["ids"]]
+
+
+def overlap_at_k(original: str, restored: str, queries: int = 50, k: int = 10, seed: int = 0) -> float:
+    """Mean share of the top-k neighbours of stored vectors that the restored store returns too."""
+    client = chromadb.PersistentClient(path=original)
+    registry = configure_collection_registry(persist_directory=original)
+    stored = client.get_collection(registry.resolve(COLLECTION)).get(include=["embeddings"])["embeddings"]
+    rng = np.random.default_rng(seed)
+    sample = np.asarray(stored, dtype=np.float32)[rng.choice(len(stored), size=min(queries, len(stored)), replace=False)]
+
+    before = _neighbours(original, COLLECTION, sample, k)
+    after = _neighbours(restored, COLLECTION, sample, k)
+    return round(float(np.mean([len(a & b) / len(a) for a, b in zip(before, after)])), 4)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot size and restore time compared with re-ingesting a corpus")
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=10, help="Pages per document")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--keep", action="store_true", help="Keep the generated corpus, stores and snapshots")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="snapshot_benchmark_"))
+    corpus = workdir / "corpus"
+    try:
+        size = generate_corpus(corpus, args.documents, args.pages, args.seed)
+        print(f"Generated {args.documents} PDFs x {args.pages} pages ({size / 1e6:.2f} MB) in {corpus}")
+
+        original = str(workdir / "store")
+        configure_collection_registry(persist_directory=original)
+        ingest = run_ingest(source=str(corpus), source_type="directory", enable_cache=False, collection=COLLECTION)
+        if not ingest["success"]:
+            raise RuntimeError(ingest["error"])
+        profile = ingest["profile"]
+
+        rows: Dict[str, Dict] = {
+            "re-ingest": {
+                "size_mb": round(_dir_size_mb(Path(original)), 2),
+                "write_s": "",
+                "restore_s": round(profile["total_s"] - profile.get("model_load_s", 0.0), 3),
+                "overlap@10": 1.0
+            }
+        }
+
+        for precision in PRECISIONS:
+            configure_collection_registry(persist_directory=original)
+            snapshot = write_snapshot(COLLECTION, path=str(workdir / f"{precision}.zip"), precision=precision)
+
+            restored = str(workdir / f"restored_{precision}")
+            configure_collection_registry(persist_directory=restored)
+            start = time.perf_counter()
+            restore_snapshot(snapshot["path"], collection=COLLECTION)
+            restore_s = time.perf_counter() - start
+
+            rows[f"snapshot {precision}"] = {
+                "size_mb": snapshot["size_mb"],
+                "write_s": snapshot["elapsed_s"],
+                "restore_s": round(restore_s, 3),
+                "overlap@10": overlap_at_k(original, restored)
+            }
+
+        columns = ["size_mb", "write_s", "restore_s", "overlap@10"]
+        print("\n" + "=" * 80)
+        print(f"SNAPSHOT BENCHMARK ({ingest['pages_loaded']} pages, {ingest['chunks_created']} chunks)")
+        print("=" * 80)
+        print(f"{'method':<20}" + "".join(f"{c:>14}" for c in columns))
+        print("-" * 80)
+        for name, metrics in rows.items():
+            print(f"{name:<20}" + "".join(f"{metrics[c]:>14}" for c in columns))
+        print("-" * 80)
+        print("re-ingest restore_s excludes model loading; size_mb is the Chroma directory for re-ingest")
+        print("=" * 80 + "\n")
+    finally:
+        if args.keep:
+            print(f"Kept {workdir}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+from typing import Dict
+
+from mcp_server.config.constants import CHROMA_COLLECTION_NAME
+
+# Runs in a fresh interpreter so imports and model loading are measured cold
+_CHILD = """
+import json, sys, time
+start = time.perf_counter()
+from mcp_server.server.tools.rag.rag_server import retrieve_documents
+import_s = time.perf_counter() - start
+
+collection, query, warmup = sys.argv[1], sys.argv[2], sys.argv[3] == "1"
+warmup_profile = {}
+if warmup:
+    from mcp_server.server.tools.rag.warmup import run_warmup
+    warmup_profile = run_warmup(collection=collection)
+ready_s = time.perf_counter() - start
+
+latencies = []
+for text in (query, query + " ?"):
+    query_start = time.perf_counter()
+    result = retrieve_documents.fn(query=text, collection=collection)
+    if not result["success"]:
+        raise SystemExit(result["error"])
+    latencies.append((time.perf_counter() - query_start) * 1000)
+
+print(json.dumps({
+    "import_s": round(import_s, 3),
+    "warmup_s": warmup_profile.get("total_s", 0.0),
+    "ready_s": round(ready_s, 3),
+    "first_query_ms": round(latencies[0], 1),
+    "second_query_ms": round(latencies[1], 1),
+    "time_to_first_query_s": round(ready_s + latencies[0] / 1000, 3)
+}))
+"""
+
+
+def measure(collection: str, query: str, warmup: bool) -> Dict:
+    """Start a fresh interpreter, import the server, optionally warm up, then time two queries."""
+    start = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-c", _CHILD, collection, query, "1" if warmup else "0"],
+        capture_output=True,
+        text=True,
+        check=False
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1] if completed.stderr else "child failed")
+
+    metrics = json.loads(completed.stdout.strip().splitlines()[-1])
+    metrics["process_s"] = round(time.perf_counter() - start, 3)
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold-start cost of the RAG server: import time, warmup and first query")
+    parser.add_argument("--collection", default=CHROMA_COLLECTION_NAME)
+    parser.add_argument("--query", default="Quels sont les frais de scolarité ?")
+    parser.add_argument("--runs", type=int, default=1)
+    args = parser.parse_args()
+
+    columns = ["import_s", "warmup_s", "ready_s", "first_query_ms", "second_query_ms", "time_to_first_query_s", "process_s"]
+
+    print("\n" + "=" * 120)
+    print(f"STARTUP BENCHMARK ({args.collection})")
+    print("=" * 120)
+    print(f"{'mode':<12}" + "".join(f"{c:>15}" for c in columns))
+    print("-" * 120)
+    for warmup in (False, True):
+        for _ in range(args.runs):
+            metrics = measure(args.collection, args.query, warmup)
+            print(f"{'warmup' if warmup else 'cold':<12}" + "".join(f"{metrics[c]:>15}" for c in columns))
+    print("=" * 120 + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,21 +3,129 @@ from pathlib import Path
 
 current_dir = Path(__file__).parent
 
+# Tracing: "none", "json" (JSON lines file), "console" or "otlp" (OTEL_EXPORTER_OTLP_ENDPOINT)
+TRACING_EXPORTER = os.getenv("TRACING_EXPORTER", "none")
+TRACING_JSON_PATH = os.getenv("TRACING_JSON_PATH", os.path.join(current_dir, "../traces_rag.jsonl"))
+
 # ChromaDB settings
 VECTOR_DB_PATH = os.path.join(current_dir, "../server/tools/rag/vector_db")
 CHROMA_COLLECTION_NAME = "mcp_collection"
 
+# Collection registry settings
+MAX_RESIDENT_COLLECTIONS = 8
+COLLECTION_IDLE_TTL_S = 1800
+RESULT_CACHE_SIZE = 256
+
+# HNSW index defaults for new collections; see ingestion/index_config.py
+HNSW_SPACE = os.getenv("HNSW_SPACE", "l2")  # "l2", "cosine" or "ip"
+HNSW_M = int(os.getenv("HNSW_M", "16"))
+HNSW_CONSTRUCTION_EF = int(os.getenv("HNSW_CONSTRUCTION_EF", "100"))
+HNSW_SEARCH_EF = int(os.getenv("HNSW_SEARCH_EF", "100"))
+# Logical collection name -> physical Chroma collection, flipped by rebuilds
+COLLECTION_ALIASES_FILE = "collection_aliases.json"
+# Seconds a replaced collection stays readable for in-flight queries before it is deleted
+REBUILD_GC_GRACE_S = 30
+
 # Embedding model settings
 EMBED_MODEL = "BAAI/bge-m3"
+# "torch" (sentence-transformers) or "onnx" (ONNX Runtime, see ingestion/onnx_embeddings.py)
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+EMBED_ONNX_PATH = os.getenv("EMBED_ONNX_PATH", os.path.join(current_dir, "../server/tools/rag/onnx_models"))
+EMBED_ONNX_QUANTIZE = os.getenv("EMBED_ONNX_QUANTIZE", "false").lower() == "true"
+EMBED_INTRA_OP_THREADS = int(os.getenv("EMBED_INTRA_OP_THREADS", "0"))  # 0 lets ONNX Runtime choose
+EMBED_MAX_SEQ_LENGTH = int(os.getenv("EMBED_MAX_SEQ_LENGTH", "512"))
+EMBED_BATCH_SIZE = 32
 
 # Chunking settings
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
+# Structure-aware chunking settings (lengths in embedding-model tokens)
+TOKEN_CHUNK_SIZE = 300
+TOKEN_CHUNK_OVERLAP = 40
+TOKEN_COUNT_CACHE_SIZE = 100000
+HEADING_SIZE_RATIO = 1.15
+HEADING_MAX_CHARS = 120
+CHUNKING_WORKERS = max(1, min(4, (os.cpu_count() or 1) - 1))
+CHUNKING_PARALLEL_MIN_PAGES = 64
+
+# Running header/footer stripping at load time (see ingestion/boilerplate.py)
+BOILERPLATE_STRIP = os.getenv("BOILERPLATE_STRIP", "true").lower() == "true"
+BOILERPLATE_EDGE_LINES = 3
+BOILERPLATE_MIN_PAGE_SHARE = 0.5
+BOILERPLATE_MIN_PAGES = 3
+
+# Near-duplicate chunk detection at ingest (MinHash over word shingles, see ingestion/dedup.py); opt-in
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "false").lower() == "true"
+DEDUP_THRESHOLD = float(os.getenv("DEDUP_THRESHOLD", "0.85"))
+DEDUP_NUM_PERM = 128
+DEDUP_BANDS = 16
+DEDUP_SHINGLE_WORDS = 3
+
 # Retriver Setting
 TOP_K = 5
 
+# Reranker settings
+RERANK_MODEL = "cross-encoder/mmarco-mMiniLMv2-L12-H384-v1"
+RERANK_CANDIDATE_MULTIPLIER = 4
+RERANK_BATCH_SIZE = 16
+RERANK_MAX_LENGTH = 512
+RERANK_TIME_BUDGET_MS = 1500
+RERANK_CACHE_SIZE = 10000
+
+# Search mode settings
+MMR_FETCH_MULTIPLIER = 4
+MMR_LAMBDA = 0.5
+CONTEXT_EXPANSION_WINDOW = 1
+
+# Response shaping settings
+CHARS_PER_TOKEN = 4
+MIN_TRUNCATED_CHARS = 200
+
 # Other paths
 DATA_PATH=os.path.join(current_dir, "../server/tools/rag/data")
 CACHE_PATH=os.path.join(current_dir, "../server/tools/rag/cache")
 
+
+# URL fetching settings
+URL_FETCH_CONCURRENCY = 8
+URL_FETCH_TIMEOUT_S = 30
+URL_FETCH_CHUNK_BYTES = 64 * 1024
+URL_FETCH_USER_AGENT = "Mozilla/5.0"
+
+# PDF download cache settings
+PDF_CACHE_MAX_BYTES = 1024 * 1024 * 1024
+PDF_CACHE_INDEX_FILE = "index.sqlite3"
+
+# Parsed-page cache settings
+PAGE_CACHE_PATH=os.path.join(current_dir, "../server/tools/rag/page_cache")
+PAGE_CACHE_FORMAT_VERSION = 1
+
+# Background ingestion job settings
+INGEST_JOB_WORKERS = 1
+INGEST_JOB_HISTORY = 100
+INGEST_PROGRESS_BATCH = 256
+
+# Startup warmup settings
+RAG_WARMUP = os.getenv("RAG_WARMUP", "true").lower() == "true"
+RAG_WARMUP_RERANK = os.getenv("RAG_WARMUP_RERANK", "false").lower() == "true"
+WARMUP_QUERY = "Quelles sont les conditions d'admission ?"
+# A failed warmup is retried with exponential backoff, then the server reports ready but degraded
+WARMUP_MAX_ATTEMPTS = int(os.getenv("RAG_WARMUP_ATTEMPTS", "5"))
+WARMUP_RETRY_BASE_S = 5.0
+WARMUP_RETRY_MAX_S = 60.0
+# Snapshot restored into CHROMA_COLLECTION_NAME at startup when the collection does not exist yet
+RAG_SNAPSHOT_PATH = os.getenv("RAG_SNAPSHOT_PATH", "")
+
+# Store statistics settings
+STORE_STATS_FILE = "rag_stats.sqlite3"
+STORE_STATS_HISTORY = 20
+
+# Index snapshot settings
+SNAPSHOT_PATH = os.path.join(current_dir, "../server/tools/rag/snapshots")
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_BATCH_SIZE = 5000
+
+# Store maintenance settings
+MAINTENANCE_SCAN_BATCH = 5000
+DELETE_SOURCES_PER_BATCH = 100
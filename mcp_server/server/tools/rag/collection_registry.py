@@ -0,0 +1,569 @@
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from mcp_server.server.tools.rag.ingestion.vector_store import get_or_create_vector_store
+from mcp_server.utils.logger import get_logger
+from mcp_server.utils.lru_cache import LRUCache
+from mcp_server.config.constants import (
+    VECTOR_DB_PATH,
+    MAX_RESIDENT_COLLECTIONS,
+    COLLECTION_IDLE_TTL_S,
+    RESULT_CACHE_SIZE,
+    COLLECTION_ALIASES_FILE
+)
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import Chroma
+
+logger = get_logger(__name__)
+
+# Chroma collection naming rules
+_COLLECTION_NAME_RE = re.compile(r"^[a-zA-Z0-9][a-zA-Z0-9._-]{1,61}[a-zA-Z0-9]$")
+
+# Physical collections built by rebuilds: <name>--gen<unix ms in base 36>
+_GENERATION_RE = re.compile(r"^(?P<name>.+)--gen(?P<stamp>[0-9a-z]+)$")
+_GENERATION_SUFFIX_LEN = len("--gen") + 8
+
+# Logical names leave room for the generation suffix within Chroma's 63 characters
+_MAX_NAME_LEN = 63
+_MAX_LOGICAL_NAME_LEN = _MAX_NAME_LEN - _GENERATION_SUFFIX_LEN
+
+
+@dataclass
+class CollectionStats:
+    queries: int = 0
+    cache_hits: int = 0
+    total_query_ms: float = 0.0
+    ingests: int = 0
+    rebuilds: int = 0
+    opens: int = 0
+    evictions: int = 0
+    last_query_at: Optional[float] = None
+    last_ingest_at: Optional[float] = None
+
+    def to_dict(self) -> dict:
+        data = asdict(self)
+        data["mean_query_ms"] = round(self.total_query_ms / self.queries, 2) if self.queries else 0.0
+        data["total_query_ms"] = round(self.total_query_ms, 2)
+        return data
+
+
+@dataclass
+class CollectionHandle:
+    name: str
+    vector_store: "Chroma"
+    result_cache: LRUCache
+    physical: Optional[str] = None
+    opened_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.monotonic)
+
+
+def validate_collection_name(name: str) -> str:
+    """
+    Raise ValueError unless `name` is a valid Chroma collection name.
+
+    Names other than rebuild generations are limited to _MAX_LOGICAL_NAME_LEN
+    characters so that their generations are valid names too.
+    """
+    max_len = _MAX_NAME_LEN if name and _GENERATION_RE.match(name) else _MAX_LOGICAL_NAME_LEN
+    if not name or len(name) > max_len or not _COLLECTION_NAME_RE.match(name) or ".." in name:
+        raise ValueError(
+            f"Invalid collection name '{name}': use 3-{max_len} letters, digits, '.', '_' or '-', "
+            "starting and ending with a letter or digit"
+        )
+    return name
+
+
+def _base36(value: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        value, remainder = divmod(value, 36)
+        encoded = digits[remainder] + encoded
+        if not value:
+            return encoded
+
+
+def _generation_created_at(physical: str) -> Optional[float]:
+    """Unix time a rebuild generation was created at, or None if `physical` is not one."""
+    match = _GENERATION_RE.match(physical)
+    if match is None:
+        return None
+    stamp = match.group("stamp")
+    # Generations named before the suffix was shortened carry 13 decimal digits
+    millis = int(stamp) if len(stamp) == 13 and stamp.isdigit() else int(stamp, 36)
+    return millis / 1000
+
+
+def persistent_client(path: str):
+    """A bare Chroma client for `path`; chromadb is imported on first use, not with this module."""
+    import chromadb
+
+    return chromadb.PersistentClient(path=path)
+
+
+class CollectionRegistry:
+    """
+    Lazily opened, LRU-bounded set of Chroma collections sharing one persist directory.
+
+    Each collection gets its own result cache and statistics. Handles idle for
+    longer than `idle_ttl_s`, or beyond `max_resident`, are closed; their stats
+    are kept so they survive the collection being reopened.
+
+    Collection names are logical: an alias file in the persist directory can
+    point a name at a different physical Chroma collection, which is how
+    rebuilds replace a collection without a window where it is empty. The
+    same file records replaced collections awaiting deletion, so a restart
+    does not leave them behind.
+
+    Writes to one collection - ingests, rebuilds, restores and deletes - are
+    serialized by its write_lock().
+    """
+
+    def __init__(
+        self,
+        persist_directory: str = VECTOR_DB_PATH,
+        max_resident: int = MAX_RESIDENT_COLLECTIONS,
+        idle_ttl_s: float = COLLECTION_IDLE_TTL_S,
+        result_cache_size: int = RESULT_CACHE_SIZE
+    ):
+        self.persist_directory = persist_directory
+        self.max_resident = max_resident
+        self.idle_ttl_s = idle_ttl_s
+        self.result_cache_size = result_cache_size
+
+        self._handles: "OrderedDict[str, CollectionHandle]" = OrderedDict()
+        self._stats: Dict[str, CollectionStats] = {}
+        self._aliases: Optional[Dict[str, str]] = None
+        self._pending: Dict[str, float] = {}
+        self._scheduled: set = set()
+        self._write_locks: Dict[str, threading.RLock] = {}
+        self._open_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.RLock()
+
+    def get(self, name: str, must_exist: bool = False) -> CollectionHandle:
+        """
+        Return the handle for `name`, opening the collection if it is not resident.
+
+        Args:
+            name: Collection name
+            must_exist: Raise ValueError instead of creating a missing collection
+        """
+        validate_collection_name(name)
+
+        with self._lock:
+            handle = self._handles.get(name)
+
+        if handle is None:
+            # Opening can load the embedding model, so it runs outside the registry-wide
+            # lock: other collections keep serving while one collection opens
+            with self._open_lock(name):
+                handle = self._open_once(name, must_exist)
+
+        with self._lock:
+            handle.last_used = time.monotonic()
+            if self._handles.get(name) is handle:
+                self._handles.move_to_end(name)
+                self._evict(keep=name)
+            return handle
+
+    def resolve(self, name: str) -> str:
+        """The physical Chroma collection currently serving `name`."""
+        with self._lock:
+            return self._load_aliases().get(name, name)
+
+    def write_lock(self, name: str) -> threading.RLock:
+        """
+        Lock held while writing to `name`.
+
+        Ingests, rebuilds, restores and deletes of one collection take it, so
+        an ingest started during a rebuild waits for the swap and then lands
+        in the rebuilt collection instead of the one being replaced.
+        """
+        with self._lock:
+            return self._write_locks.setdefault(name, threading.RLock())
+
+    def generation_name(self, name: str) -> str:
+        """A fresh physical collection name for rebuilding `name`."""
+        return validate_collection_name(f"{name}--gen{_base36(time.time_ns() // 1_000_000)}")
+
+    def generations(self, name: str) -> List[str]:
+        """Physical collections built by rebuilds of `name`, live or not."""
+        return [
+            physical for physical in self._physical_collections()
+            if (match := _GENERATION_RE.match(physical)) and match.group("name") == name
+        ]
+
+    def swap(self, name: str, physical: str) -> Optional[str]:
+        """
+        Atomically point `name` at the physical collection `physical`.
+
+        The new collection is opened and its index loaded before the switch,
+        so the first query after it pays no cold-start cost. Queries already
+        running finish on the old handle; later ones see the new collection
+        with an empty result cache.
+
+        Returns:
+            The physical collection `name` pointed at before, or None if that
+            was already `physical`
+        """
+        validate_collection_name(name)
+        handle = self._open(name, physical)
+        _load_index(handle.vector_store)
+
+        with self._lock:
+            aliases = dict(self._load_aliases())
+            previous = aliases.get(name, name)
+            if physical == name:
+                aliases.pop(name, None)
+            else:
+                aliases[name] = physical
+            self._save_aliases(aliases)
+
+            if physical != name:
+                self._handles.pop(physical, None)
+                self._stats.pop(physical, None)
+            self._handles[name] = handle
+            self._handles.move_to_end(name)
+            stats = self.stats_for(name)
+            stats.rebuilds += 1
+            stats.last_ingest_at = time.time()
+            self._evict(keep=name)
+
+        logger.info(f"Collection '{name}' now served by '{physical}' (was '{previous}')")
+        return previous if previous != physical else None
+
+    def unalias(self, name: str) -> str:
+        """Remove any alias for `name` and return the physical collection it resolved to."""
+        with self._lock:
+            aliases = dict(self._load_aliases())
+            physical = aliases.pop(name, name)
+            if physical != name:
+                self._save_aliases(aliases)
+            return physical
+
+    def delete_physical(self, physical: str) -> bool:
+        """Delete a physical collection unless an alias still points at it."""
+        with self._lock:
+            if physical in self._load_aliases().values():
+                logger.warning(f"Not deleting '{physical}': it is still serving a collection")
+                self._forget_pending(physical)
+                return False
+            for name in [name for name, handle in self._handles.items() if handle.physical == physical]:
+                self._handles.pop(name)
+
+        if physical not in self._physical_collections():
+            with self._lock:
+                self._forget_pending(physical)
+            return False
+
+        client = persistent_client(self.persist_directory)
+        try:
+            client.delete_collection(physical)
+        except Exception as e:
+            logger.warning(f"Could not delete collection '{physical}': {e}")
+            return False
+        with self._lock:
+            self._forget_pending(physical)
+        logger.info(f"Deleted physical collection '{physical}'")
+        return True
+
+    def delete_later(self, physical: str, delay_s: float) -> None:
+        """
+        Delete `physical` after `delay_s`, giving in-flight queries on it time to finish.
+
+        The deletion is recorded in the alias file first; if the process
+        exits before it runs, sweep_pending_deletions() carries it out.
+        """
+        with self._lock:
+            self._load_aliases()
+            pending = {**self._pending, physical: time.time() + delay_s}
+            self._save_state(self._aliases, pending)
+        self._schedule(physical, delay_s)
+
+    def sweep_pending_deletions(self) -> List[str]:
+        """
+        Carry out deletions recorded by delete_later() whose delay has passed.
+
+        Deletions not yet due are scheduled for when they are. Meant to run
+        at startup, for deletions a previous process did not get to.
+
+        Returns:
+            Physical collections deleted
+        """
+        with self._lock:
+            self._load_aliases()
+            pending = dict(self._pending)
+
+        now = time.time()
+        deleted = []
+        for physical, due_at in sorted(pending.items(), key=lambda item: item[1]):
+            if due_at <= now:
+                if self.delete_physical(physical):
+                    deleted.append(physical)
+            else:
+                self._schedule(physical, due_at - now)
+        return deleted
+
+    def collect_generations(self, name: str, grace_s: float) -> List[str]:
+        """
+        Delete rebuild generations of `name` that are neither live nor recent.
+
+        Generations younger than `grace_s` may belong to a rebuild, reindex or
+        restore still in progress and are kept, as are those already waiting
+        in delete_later().
+
+        Returns:
+            Physical collections deleted
+        """
+        live = self.resolve(name)
+        with self._lock:
+            pending = set(self._pending)
+
+        now = time.time()
+        deleted = []
+        for physical in self.generations(name):
+            if physical == live or physical in pending or now - _generation_created_at(physical) < grace_s:
+                continue
+            if self.delete_physical(physical):
+                deleted.append(physical)
+        return deleted
+
+    def delete_collection(self, name: str) -> List[str]:
+        """
+        Delete every physical collection behind `name` and its alias.
+
+        Besides the collection `name` resolves to, this deletes the one named
+        `name` itself and every rebuild generation of it, including replaced
+        ones still awaiting delete_later(), so nothing of `name` is left to
+        resolve to afterwards.
+
+        Returns:
+            Physical collections deleted
+        """
+        validate_collection_name(name)
+        with self.write_lock(name):
+            live = self.unalias(name)
+            self.drop(name)
+            existing = self._physical_collections()
+            targets = sorted(({name, live} | set(self.generations(name))) & existing)
+            return [physical for physical in targets if self.delete_physical(physical)]
+
+    def peek(self, name: str) -> Optional[CollectionHandle]:
+        """The resident handle for `name`, if any, without opening it or touching its LRU position."""
+        with self._lock:
+            return self._handles.get(name)
+
+    def stats_for(self, name: str) -> CollectionStats:
+        with self._lock:
+            return self._stats.setdefault(name, CollectionStats())
+
+    def record_query(self, name: str, elapsed_ms: float, cache_hit: bool) -> None:
+        with self._lock:
+            stats = self.stats_for(name)
+            stats.queries += 1
+            stats.cache_hits += int(cache_hit)
+            stats.total_query_ms += elapsed_ms
+            stats.last_query_at = time.time()
+
+    def record_ingest(self, name: str) -> None:
+        """Count an ingest and drop cached results that may now be stale."""
+        with self._lock:
+            stats = self.stats_for(name)
+            stats.ingests += 1
+            stats.last_ingest_at = time.time()
+            self.invalidate(name)
+
+    def invalidate(self, name: str) -> None:
+        with self._lock:
+            handle = self._handles.get(name)
+            if handle is not None:
+                handle.result_cache.clear()
+
+    def drop(self, name: str) -> None:
+        """Forget the handle for `name`, e.g. after its collection was deleted."""
+        with self._lock:
+            if self._handles.pop(name, None) is not None:
+                logger.info(f"Dropped handle for collection '{name}'")
+
+    def list_collections(self) -> List[str]:
+        """
+        Names of every collection in the persist directory, resident or not.
+
+        Aliased collections are listed under their logical name. Physical
+        collections of rebuilds that are still running or were abandoned are
+        not listed.
+        """
+        physical = self._physical_collections()
+        with self._lock:
+            aliases = {name: target for name, target in self._load_aliases().items() if target in physical}
+        targets = set(aliases.values())
+        return sorted(
+            set(aliases) | {c for c in physical if c not in targets and not _GENERATION_RE.match(c)}
+        )
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "resident": list(self._handles),
+                "aliases": dict(self._load_aliases()),
+                "max_resident": self.max_resident,
+                "idle_ttl_s": self.idle_ttl_s,
+                "collections": {
+                    name: {
+                        **stats.to_dict(),
+                        "resident": name in self._handles,
+                        "result_cache": self._handles[name].result_cache.stats() if name in self._handles else None
+                    }
+                    for name, stats in self._stats.items()
+                }
+            }
+
+    def _physical_collections(self) -> set:
+        client = persistent_client(self.persist_directory)
+        return {c if isinstance(c, str) else c.name for c in client.list_collections()}
+
+    def _open_once(self, name: str, must_exist: bool) -> CollectionHandle:
+        """Open `name` unless another thread did while this one waited for its open lock."""
+        while True:
+            with self._lock:
+                handle = self._handles.get(name)
+            if handle is not None:
+                return handle
+
+            physical = self.resolve(name)
+            if must_exist and physical not in self._physical_collections():
+                raise ValueError(f"Collection '{name}' does not exist. Ingest documents into it first.")
+            opened = self._open(name, physical)
+
+            with self._lock:
+                handle = self._handles.get(name)
+                if handle is not None:
+                    return handle
+                # A swap while opening means `opened` is the replaced collection; open the new one
+                if self.resolve(name) == physical:
+                    self._handles[name] = opened
+                    self.stats_for(name).opens += 1
+                    return opened
+
+    def _open_lock(self, name: str) -> threading.Lock:
+        with self._lock:
+            return self._open_locks.setdefault(name, threading.Lock())
+
+    def _open(self, name: str, physical: str) -> CollectionHandle:
+        logger.info(f"Opening collection '{name}'" + (f" ({physical})" if physical != name else ""))
+        return CollectionHandle(
+            name=name,
+            vector_store=get_or_create_vector_store(
+                collection_name=physical,
+                persist_directory=self.persist_directory
+            ),
+            result_cache=LRUCache(self.result_cache_size),
+            physical=physical
+        )
+
+    def _load_aliases(self) -> Dict[str, str]:
+        if self._aliases is None:
+            path = Path(self.persist_directory) / COLLECTION_ALIASES_FILE
+            data = json.loads(path.read_text(encoding="utf-8")) if path.is_file() else {}
+            if isinstance(data.get("aliases"), dict):
+                self._aliases = data["aliases"]
+                self._pending = data.get("pending_deletions", {})
+            else:
+                # Files written before pending deletions were recorded hold only the aliases
+                self._aliases = data
+                self._pending = {}
+        return self._aliases
+
+    def _save_aliases(self, aliases: Dict[str, str]) -> None:
+        self._load_aliases()
+        self._save_state(aliases, self._pending)
+
+    def _save_state(self, aliases: Dict[str, str], pending: Dict[str, float]) -> None:
+        # Write-then-rename so a crash never leaves a half-written alias file
+        path = Path(self.persist_directory) / COLLECTION_ALIASES_FILE
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(
+            json.dumps({"aliases": aliases, "pending_deletions": pending}, indent=2, sort_keys=True),
+            encoding="utf-8"
+        )
+        os.replace(tmp_path, path)
+        self._aliases = aliases
+        self._pending = pending
+
+    def _forget_pending(self, physical: str) -> None:
+        self._load_aliases()
+        if physical in self._pending:
+            self._save_state(self._aliases, {p: due_at for p, due_at in self._pending.items() if p != physical})
+
+    def _schedule(self, physical: str, delay_s: float) -> None:
+        # Fast path for deletions due while this process runs; the alias file is the record
+        with self._lock:
+            if physical in self._scheduled:
+                return
+            self._scheduled.add(physical)
+
+        def run() -> None:
+            with self._lock:
+                self._scheduled.discard(physical)
+            self.delete_physical(physical)
+
+        timer = threading.Timer(delay_s, run)
+        timer.daemon = True
+        timer.start()
+
+    def _evict(self, keep: str) -> None:
+        now = time.monotonic()
+
+        for name, handle in list(self._handles.items()):
+            if name != keep and now - handle.last_used > self.idle_ttl_s:
+                self._close(name, reason="idle")
+
+        while len(self._handles) > self.max_resident:
+            oldest = next(iter(self._handles))
+            if oldest == keep:
+                break
+            self._close(oldest, reason="lru")
+
+    def _close(self, name: str, reason: str) -> None:
+        self._handles.pop(name, None)
+        self.stats_for(name).evictions += 1
+        logger.info(f"Evicted collection '{name}' ({reason})")
+
+
+def _load_index(vector_store: "Chroma") -> None:
+    """Query a collection once with one of its own vectors so Chroma loads its HNSW index."""
+    collection = vector_store._collection
+    sample = collection.peek(limit=1)
+    if len(sample["ids"]):
+        collection.query(query_embeddings=[sample["embeddings"][0]], n_results=1, include=[])
+
+
+_registry: Optional[CollectionRegistry] = None
+
+
+def get_collection_registry() -> CollectionRegistry:
+
+    global _registry
+
+    if _registry is None:
+        _registry = CollectionRegistry()
+
+    return _registry
+
+
+def configure_collection_registry(**kwargs) -> CollectionRegistry:
+    """Replace the shared registry, e.g. to point benchmarks at a scratch directory."""
+
+    global _registry
+
+    _registry = CollectionRegistry(**kwargs)
+    return _registry
@@ -0,0 +1,123 @@
+import re
+from collections import Counter
+from typing import Dict, List, Tuple
+
+from langchain_core.documents import Document
+
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import (
+    BOILERPLATE_EDGE_LINES,
+    BOILERPLATE_MIN_PAGE_SHARE,
+    BOILERPLATE_MIN_PAGES
+)
+
+logger = get_logger(__name__)
+
+_DIGITS_RE = re.compile(r"\d+")
+_SPACE_RE = re.compile(r"\s+")
+
+# (edge, offset from that edge, normalized text)
+LineKey = Tuple[str, int, str]
+
+
+def _normalize(line: str) -> str:
+    """Case- and spacing-insensitive form of a line, with numbers masked so page numbers match."""
+    return _SPACE_RE.sub(" ", _DIGITS_RE.sub("#", line.lower())).strip()
+
+
+def _edge_keys(lines: List[str], edge_lines: int) -> Dict[int, LineKey]:
+    """Keys of the first and last `edge_lines` non-empty lines of a page, by line index."""
+    filled = [i for i, line in enumerate(lines) if line.strip()]
+    keys = {}
+    for offset, i in enumerate(filled[:edge_lines]):
+        keys[i] = ("top", offset, _normalize(lines[i]))
+    for offset, i in enumerate(reversed(filled[-edge_lines:])):
+        keys.setdefault(i, ("bottom", offset, _normalize(lines[i])))
+    return keys
+
+
+def boilerplate_mask(
+    pages: List[List[str]],
+    edge_lines: int = BOILERPLATE_EDGE_LINES,
+    min_page_share: float = BOILERPLATE_MIN_PAGE_SHARE,
+    min_pages: int = BOILERPLATE_MIN_PAGES
+) -> List[List[bool]]:
+    """
+    Flag the running header and footer lines of one document.
+
+    A line is boilerplate when it sits within `edge_lines` of the top or
+    bottom of its page and the same text, at the same distance from the same
+    edge, appears on at least `min_page_share` of the pages. Numbers are
+    masked before comparing, so "Page 3 of 12" matches on every page. Lines
+    in the body of a page are never flagged, whatever their frequency.
+
+    Args:
+        pages: Lines of each page of one document
+        edge_lines: Non-empty lines considered at each edge of a page
+        min_page_share: Share of pages a line must repeat on
+        min_pages: Documents with fewer pages are left untouched
+
+    Returns:
+        For each page, True for every line to remove
+    """
+    mask = [[False] * len(lines) for lines in pages]
+    if len(pages) < min_pages:
+        return mask
+
+    page_keys = [_edge_keys(lines, edge_lines) for lines in pages]
+    # Each page counts a key once
+    counts = Counter(key for keys in page_keys for key in set(keys.values()))
+    needed = max(min_pages, min_page_share * len(pages))
+    repeated = {key for key, count in counts.items() if count >= needed and key[2]}
+
+    for page_mask, keys in zip(mask, page_keys):
+        for i, key in keys.items():
+            if key in repeated:
+                page_mask[i] = True
+    return mask
+
+
+def strip_boilerplate(documents: List[Document]) -> Tuple[List[Document], dict]:
+    """
+    Remove running headers, footers and page numbers from page documents.
+
+    Pages are grouped by source so each PDF is judged against its own pages.
+    Documents are modified in place.
+
+    Args:
+        documents: Page-level documents from PDFLoader
+
+    Returns:
+        Tuple of the documents and a dictionary with the lines and characters removed
+    """
+    by_source: Dict[str, List[Document]] = {}
+    for doc in documents:
+        by_source.setdefault(doc.metadata.get("source", ""), []).append(doc)
+
+    chars_before = sum(len(doc.page_content) for doc in documents)
+    lines_removed = 0
+    sources_stripped = 0
+
+    for pages in by_source.values():
+        page_lines = [doc.page_content.split("\n") for doc in pages]
+        mask = boilerplate_mask(page_lines)
+        removed = sum(sum(page_mask) for page_mask in mask)
+        if not removed:
+            continue
+
+        sources_stripped += 1
+        lines_removed += removed
+        for doc, lines, page_mask in zip(pages, page_lines, mask):
+            if any(page_mask):
+                doc.page_content = "\n".join(line for line, drop in zip(lines, page_mask) if not drop)
+
+    chars_after = sum(len(doc.page_content) for doc in documents)
+    stats = {
+        "sources": len(by_source),
+        "sources_stripped": sources_stripped,
+        "lines_removed": lines_removed,
+        "chars_removed": chars_before - chars_after,
+        "chars_removed_pct": round(100 * (chars_before - chars_after) / chars_before, 2) if chars_before else 0.0
+    }
+    logger.info(f"Boilerplate stripping: {stats}")
+    return documents, stats
@@ -1,29 +1,44 @@
-from typing import List
+from typing import List, Literal, Optional
 from langchain_core.documents import Document
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from mcp_server.server.tools.rag.ingestion.layout_chunking import chunk_by_structure
 from mcp_server.utils.logger import get_logger
-from mcp_server.config.constants import CHUNK_SIZE, CHUNK_OVERLAP
+from mcp_server.config.constants import CHUNK_SIZE, CHUNK_OVERLAP, TOKEN_CHUNK_SIZE, TOKEN_CHUNK_OVERLAP, BOILERPLATE_STRIP
 
 logger = get_logger(__name__)
 
+ChunkingStrategy = Literal["recursive", "structure"]
+
 
 def chunk_documents(
     documents: List[Document],
-    chunk_size: int = CHUNK_SIZE,
-    chunk_overlap: int = CHUNK_OVERLAP
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    strategy: ChunkingStrategy = "recursive",
+    strip_boilerplate: bool = BOILERPLATE_STRIP
 ) -> List[Document]:
     """
     Split documents into smaller chunks for better retrieval.
     
     Args:
         documents: List of documents to chunk
-        chunk_size: Maximum size of each chunk in characters
-        chunk_overlap: Number of overlapping characters between chunks
+        chunk_size: Maximum size of each chunk, in characters for "recursive"
+            (default: 1000) or in embedding-model tokens for "structure" (default: 300)
+        chunk_overlap: Overlap between chunks, in the same unit as chunk_size
+            (default: 200 characters or 40 tokens)
+        strategy: "recursive" splits on spaces by character length;
+            "structure" follows PDF headings, blocks and sentence boundaries
+        strip_boilerplate: For "structure", which re-reads the page layout from
+            the PDF, drop running headers and footers from the layout blocks
         
     Returns:
         List of chunked documents
     """
+    if chunk_size is None:
+        chunk_size = TOKEN_CHUNK_SIZE if strategy == "structure" else CHUNK_SIZE
+    if chunk_overlap is None:
+        chunk_overlap = TOKEN_CHUNK_OVERLAP if strategy == "structure" else CHUNK_OVERLAP
+
     if not documents:
         error_msg = "Cannot chunk empty document list"
         logger.error(error_msg)
@@ -38,17 +53,29 @@ def chunk_documents(
         logger.warning(f"chunk_overlap ({chunk_overlap}) >= chunk_size ({chunk_size}), setting overlap to {chunk_size // 2}")
         chunk_overlap = chunk_size // 2
     
-    logger.info(f"Splitting {len(documents)} documents into chunks (size={chunk_size}, overlap={chunk_overlap})")
+    logger.info(f"Splitting {len(documents)} documents into chunks (strategy={strategy}, size={chunk_size}, overlap={chunk_overlap})")
     
     try:
-        text_splitter = RecursiveCharacterTextSplitter(
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap,
-            length_function=len,
-            separators=[" "]
-        )
-        
-        text_chunks = text_splitter.split_documents(documents)
+        if strategy == "structure":
+            text_chunks = chunk_by_structure(
+                documents,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                strip_boilerplate=strip_boilerplate
+            )
+        elif strategy == "recursive":
+            # Imported here: langchain_text_splitters pulls in transformers and sentence-transformers
+            from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+            text_splitter = RecursiveCharacterTextSplitter(
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                length_function=len,
+                separators=[" "]
+            )
+            text_chunks = text_splitter.split_documents(documents)
+        else:
+            raise ValueError(f"Invalid chunking strategy: '{strategy}'. Supported strategies are 'recursive' and 'structure'.")
         
         # Add chunk index to metadata for unique ID generation
         for i, chunk in enumerate(text_chunks):
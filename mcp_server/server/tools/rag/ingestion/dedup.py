@@ -0,0 +1,166 @@
+import json
+import re
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import (
+    DEDUP_THRESHOLD,
+    DEDUP_NUM_PERM,
+    DEDUP_BANDS,
+    DEDUP_SHINGLE_WORDS
+)
+
+logger = get_logger(__name__)
+
+_WORD_RE = re.compile(r"\w+")
+
+# Universal hashing h(x) = (a * x + b) mod p over 32-bit shingle hashes; a < 2^31 keeps a * x within uint64
+_PRIME = np.uint64(4294967311)
+_rng = np.random.default_rng(20240901)
+_PERM_A = _rng.integers(1, 2 ** 31, size=DEDUP_NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, 2 ** 31, size=DEDUP_NUM_PERM, dtype=np.uint64)
+
+
+def _shingles(text: str, size: int) -> np.ndarray:
+    """32-bit hashes of the distinct word `size`-grams of `text`, case-insensitive."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) <= size:
+        grams = {" ".join(words)} if words else set()
+    else:
+        grams = {" ".join(words[i:i + size]) for i in range(len(words) - size + 1)}
+    return np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+
+
+def minhash_signature(text: str, shingle_words: int = DEDUP_SHINGLE_WORDS) -> np.ndarray:
+    """
+    MinHash signature of the word shingles of `text`.
+
+    The share of equal positions between two signatures estimates the
+    Jaccard similarity of their shingle sets.
+    """
+    shingles = _shingles(text, shingle_words)
+    if not len(shingles):
+        return np.full(len(_PERM_A), np.iinfo(np.uint64).max, dtype=np.uint64)
+    hashed = (np.outer(shingles, _PERM_A) + _PERM_B) % _PRIME
+    return hashed.min(axis=0)
+
+
+def shared_sources(metadata: Optional[dict]) -> List[str]:
+    """Sources a chunk kept by deduplicate_chunks stands for, its own included; empty for any other chunk."""
+    value = (metadata or {}).get("shared_sources")
+    return json.loads(value) if value else []
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def group_near_duplicates(
+    texts: List[str],
+    threshold: float = DEDUP_THRESHOLD,
+    bands: int = DEDUP_BANDS
+) -> Tuple[List[List[int]], int]:
+    """
+    Group texts whose estimated Jaccard similarity reaches `threshold`.
+
+    Signatures are split into `bands` bands; texts sharing any band are
+    candidate pairs, which are kept only if their full signatures agree on
+    at least `threshold` of positions. Groups are the connected components
+    of the kept pairs. Texts without any word are never grouped.
+
+    Returns:
+        Groups of indices into `texts` with more than one member, and the
+        number of candidate pairs compared
+    """
+    # Without shingles every signature is the same all-max vector, which would group them all
+    indices = [i for i, text in enumerate(texts) if _WORD_RE.search(text)]
+    if not indices:
+        return [], 0
+
+    signatures = np.stack([minhash_signature(texts[i]) for i in indices])
+    rows = signatures.shape[1] // bands
+    parent = list(range(len(indices)))
+    compared = 0
+
+    for band in range(bands):
+        buckets: Dict[bytes, List[int]] = {}
+        for i, key in enumerate(signatures[:, band * rows:(band + 1) * rows]):
+            buckets.setdefault(key.tobytes(), []).append(i)
+
+        for members in buckets.values():
+            for position, i in enumerate(members[1:], start=1):
+                for j in members[:position]:
+                    root_i, root_j = _find(parent, i), _find(parent, j)
+                    if root_i == root_j:
+                        break
+                    compared += 1
+                    if np.mean(signatures[i] == signatures[j]) >= threshold:
+                        parent[root_i] = root_j
+                        break
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(indices)):
+        groups.setdefault(_find(parent, i), []).append(indices[i])
+    return [members for members in groups.values() if len(members) > 1], compared
+
+
+def deduplicate_chunks(
+    chunks: List[Document],
+    threshold: float = DEDUP_THRESHOLD
+) -> Tuple[List[Document], dict]:
+    """
+    Keep one representative chunk per group of near-duplicates.
+
+    The longest chunk of a group is kept, in its original position. Its
+    metadata lists every source and page the passage appeared on in
+    "duplicate_sources", and the number of chunks folded into it in
+    "duplicates". Repeats within one document are folded the same way as
+    copies across documents.
+
+    A chunk kept for several sources also lists their full paths, as JSON,
+    in "shared_sources". It is stored under an ID derived from its content
+    (see generate_document_id), and deleting or re-ingesting one of those
+    sources moves it to another instead of deleting it (see maintenance.py).
+
+    Args:
+        chunks: Chunks of one ingest, with chunk_index set
+        threshold: Minimum estimated Jaccard similarity of word shingles
+
+    Returns:
+        Tuple of the remaining chunks and a dictionary of deduplication statistics
+    """
+    groups, compared = group_near_duplicates([chunk.page_content for chunk in chunks], threshold=threshold)
+
+    dropped = set()
+    for members in groups:
+        keep = max(members, key=lambda i: (len(chunks[i].page_content), -i))
+        places = sorted({
+            f"{Path(str(chunks[i].metadata.get('source', 'unknown'))).name}:{chunks[i].metadata.get('page', '?')}"
+            for i in members
+        })
+        chunks[keep].metadata["duplicates"] = len(members) - 1
+        chunks[keep].metadata["duplicate_sources"] = "; ".join(places)
+        sources = sorted({str(chunks[i].metadata.get("source", "unknown")) for i in members})
+        if len(sources) > 1:
+            chunks[keep].metadata["shared_sources"] = json.dumps(sources)
+        dropped.update(i for i in members if i != keep)
+
+    kept = [chunk for i, chunk in enumerate(chunks) if i not in dropped]
+    stats = {
+        "chunks_in": len(chunks),
+        "chunks_kept": len(kept),
+        "duplicates_removed": len(dropped),
+        "duplicate_groups": len(groups),
+        "pairs_compared": compared,
+        "threshold": threshold
+    }
+    logger.info(f"Near-duplicate detection: {stats}")
+    return kept, stats
@@ -1,10 +1,65 @@
 from mcp_server.utils.logger import get_logger
 from mcp_server.utils.custom_exception import CustomException
-from mcp_server.config.constants import EMBED_MODEL
-from langchain_huggingface import HuggingFaceEmbeddings
+from mcp_server.config.constants import EMBED_MODEL, EMBED_BACKEND
+from mcp_server.utils.metrics import get_metrics_registry
+from langchain_core.embeddings import Embeddings
+import threading
+import time
+from typing import List
 logger = get_logger(__name__)
 
+metrics = get_metrics_registry()
+EMBED_BATCH_SIZE_HIST = metrics.histogram(
+    "rag_embedding_batch_size", "Texts per embedding call", ["op"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+)
+EMBED_LATENCY = metrics.histogram(
+    "rag_embedding_duration_seconds", "Embedding call latency", ["op"]
+)
+
+
+class InstrumentedEmbeddings(Embeddings):
+    """Embeddings wrapper recording batch sizes and latency of every call."""
+
+    def __init__(self, embeddings: Embeddings):
+        self.embeddings = embeddings
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        start = time.perf_counter()
+        try:
+            return self.embeddings.embed_documents(texts)
+        finally:
+            EMBED_BATCH_SIZE_HIST.observe(len(texts), op="documents")
+            EMBED_LATENCY.observe(time.perf_counter() - start, op="documents")
+
+    def embed_query(self, text: str) -> List[float]:
+        start = time.perf_counter()
+        try:
+            return self.embeddings.embed_query(text)
+        finally:
+            EMBED_BATCH_SIZE_HIST.observe(1, op="query")
+            EMBED_LATENCY.observe(time.perf_counter() - start, op="query")
+
+def load_embedding_backend(backend: str = EMBED_BACKEND) -> Embeddings:
+    """
+    Load the embedding model on the given backend, without instrumentation.
+
+    Args:
+        backend: "torch" for sentence-transformers on PyTorch, or "onnx" for
+            ONNX Runtime (EMBED_ONNX_* settings apply)
+    """
+    if backend == "torch":
+        from langchain_huggingface import HuggingFaceEmbeddings
+        return HuggingFaceEmbeddings(model_name=EMBED_MODEL)
+    if backend == "onnx":
+        from mcp_server.server.tools.rag.ingestion.onnx_embeddings import OnnxEmbeddings
+        return OnnxEmbeddings()
+    raise ValueError(f"Unknown embedding backend '{backend}'. Supported backends are 'torch' and 'onnx'.")
+
+
 _embedding_model = None
+# Startup warmup and early requests may ask for the model at the same time
+_embedding_model_lock = threading.Lock()
 
 def get_embedding_model():
 
@@ -13,11 +68,19 @@ def get_embedding_model():
     if _embedding_model:
         return _embedding_model
 
+    with _embedding_model_lock:
+        if _embedding_model:
+            return _embedding_model
+        return _load_embedding_model()
+
+
+def _load_embedding_model():
+
+    global _embedding_model
+
     try:
-        logger.info("Initializing embedding model for the first time...")
-        _embedding_model = HuggingFaceEmbeddings(
-            model_name=EMBED_MODEL,
-        )
+        logger.info(f"Initializing embedding model for the first time ({EMBED_BACKEND} backend)...")
+        _embedding_model = InstrumentedEmbeddings(load_embedding_backend(EMBED_BACKEND))
         logger.info("Embedding model loaded successfully.")
         return _embedding_model
     
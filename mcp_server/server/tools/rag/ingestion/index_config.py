@@ -0,0 +1,81 @@
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from mcp_server.config.constants import HNSW_SPACE, HNSW_M, HNSW_CONSTRUCTION_EF, HNSW_SEARCH_EF
+
+SPACES = ("l2", "cosine", "ip")
+
+
+@dataclass(frozen=True)
+class IndexConfig:
+    """
+    HNSW parameters of one Chroma collection.
+
+    `space`, `m` and `construction_ef` shape the graph and are fixed when the
+    collection is created. `search_ef`, the candidate list size at query
+    time, trades recall for latency. Chroma can store a new search_ef for an
+    existing collection, but an index already loaded in a process keeps the
+    value it was loaded with, so every change is applied by building a new
+    index (see rag/reindex.py).
+    """
+
+    space: str = HNSW_SPACE
+    m: int = HNSW_M
+    construction_ef: int = HNSW_CONSTRUCTION_EF
+    search_ef: int = HNSW_SEARCH_EF
+
+    def __post_init__(self):
+        if self.space not in SPACES:
+            raise ValueError(f"Invalid HNSW space '{self.space}'. Supported spaces are {', '.join(SPACES)}.")
+        for name in ("m", "construction_ef", "search_ef"):
+            if getattr(self, name) < 2:
+                raise ValueError(f"HNSW {name} must be at least 2, got {getattr(self, name)}")
+
+    def to_metadata(self) -> dict:
+        """Chroma collection metadata that creates an index with these parameters."""
+        return {
+            "hnsw:space": self.space,
+            "hnsw:M": self.m,
+            "hnsw:construction_ef": self.construction_ef,
+            "hnsw:search_ef": self.search_ef
+        }
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def from_collection(cls, collection) -> "IndexConfig":
+        """The parameters a Chroma collection's index was actually built with."""
+        configuration = getattr(collection, "configuration", None) or {}
+        hnsw = configuration.get("hnsw")
+        if hnsw:
+            return cls(
+                space=hnsw["space"],
+                m=hnsw["max_neighbors"],
+                construction_ef=hnsw["ef_construction"],
+                search_ef=hnsw["ef_search"]
+            )
+
+        metadata = collection.metadata or {}
+        default = cls()
+        return cls(
+            space=metadata.get("hnsw:space", default.space),
+            m=metadata.get("hnsw:M", default.m),
+            construction_ef=metadata.get("hnsw:construction_ef", default.construction_ef),
+            search_ef=metadata.get("hnsw:search_ef", default.search_ef)
+        )
+
+    def with_changes(
+        self,
+        space: Optional[str] = None,
+        m: Optional[int] = None,
+        construction_ef: Optional[int] = None,
+        search_ef: Optional[int] = None
+    ) -> "IndexConfig":
+        return IndexConfig(
+            space=space or self.space,
+            m=m or self.m,
+            construction_ef=construction_ef or self.construction_ef,
+            search_ef=search_ef or self.search_ef
+        )
+
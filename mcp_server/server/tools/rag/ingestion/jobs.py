@@ -0,0 +1,180 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import List, Literal, Optional
+
+from mcp_server.server.tools.rag.ingestion.pipeline import run_ingest, run_rebuild, IngestCancelled, IngestProgress
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import INGEST_JOB_WORKERS, INGEST_JOB_HISTORY
+
+logger = get_logger(__name__)
+
+JobStatus = Literal["queued", "running", "succeeded", "failed", "cancelled"]
+JobKind = Literal["ingest", "rebuild"]
+_TERMINAL = ("succeeded", "failed", "cancelled")
+
+
+@dataclass
+class IngestJob:
+    job_id: str
+    params: dict
+    kind: JobKind = "ingest"
+    progress: IngestProgress = field(default_factory=IngestProgress)
+    status: JobStatus = "queued"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    future: Optional[Future] = field(default=None, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in _TERMINAL
+
+    def to_dict(self, include_result: bool = True) -> dict:
+        end = self.finished_at or time.time()
+        data = {
+            "job_id": self.job_id,
+            "kind": self.kind,
+            "status": self.status,
+            "source": self.params.get("source"),
+            "collection": self.params.get("collection"),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "elapsed_s": round(end - self.started_at, 3) if self.started_at else 0.0,
+            "cancel_requested": self.progress.cancelled,
+            **self.progress.snapshot()
+        }
+        if self.error:
+            data["error"] = self.error
+        if include_result and self.result is not None:
+            data["result"] = self.result
+        return data
+
+
+class IngestJobManager:
+    """
+    Runs ingests in the background on a dedicated, bounded thread pool.
+
+    Tool calls only enqueue work and read job state, so a long ingest never
+    holds a request open, and at most `max_workers` ingests compete with
+    retrieval for CPU at any time. The most recent `history` finished jobs
+    are kept for status queries.
+    """
+
+    def __init__(self, max_workers: int = INGEST_JOB_WORKERS, history: int = INGEST_JOB_HISTORY):
+        self.max_workers = max(1, max_workers)
+        self.history = history
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ingest-job")
+        self._jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: JobKind = "ingest", **params) -> IngestJob:
+        """Queue an ingest; `params` are passed to run_ingest, or to run_rebuild for a rebuild."""
+        job = IngestJob(job_id=uuid.uuid4().hex, params=params, kind=kind)
+        with self._lock:
+            self._jobs[job.job_id] = job
+            self._prune()
+        job.future = self._pool.submit(self._run, job)
+        logger.info(f"Queued {kind} job {job.job_id} for {params.get('source')}")
+        return job
+
+    def get(self, job_id: str) -> IngestJob:
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            raise KeyError(f"Unknown ingestion job '{job_id}'")
+        return job
+
+    def list(self) -> List[IngestJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id: str) -> IngestJob:
+        """
+        Cancel a job. A queued job is dropped at once; a running one stops at
+        its next checkpoint and reports "cancelled" when it has.
+        """
+        job = self.get(job_id)
+        if job.finished:
+            return job
+
+        job.progress.cancel()
+        if job.future is not None and job.future.cancel():
+            self._finish(job, "cancelled")
+        logger.info(f"Cancellation requested for ingestion job {job_id}")
+        return job
+
+    def counts(self) -> dict:
+        with self._lock:
+            counts = {status: 0 for status in ("queued", "running", "succeeded", "failed", "cancelled")}
+            for job in self._jobs.values():
+                counts[job.status] += 1
+            return counts
+
+    def shutdown(self, cancel_running: bool = True) -> None:
+        if cancel_running:
+            for job in self.list():
+                if not job.finished:
+                    job.progress.cancel()
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+    def _run(self, job: IngestJob) -> None:
+        if job.progress.cancelled:
+            self._finish(job, "cancelled")
+            return
+
+        job.status = "running"
+        job.started_at = time.time()
+        logger.info(f"Running ingestion job {job.job_id}")
+
+        try:
+            runner = run_rebuild if job.kind == "rebuild" else run_ingest
+            result = runner(**job.params, progress=job.progress)
+        except IngestCancelled:
+            self._finish(job, "cancelled")
+            return
+        except Exception as e:
+            # Layers such as the vector store wrap IngestCancelled in their own exception
+            if job.progress.cancelled:
+                self._finish(job, "cancelled")
+                return
+            logger.exception(f"Ingestion job {job.job_id} failed")
+            self._finish(job, "failed", error=str(e))
+            return
+
+        job.result = result
+        if result.get("success"):
+            self._finish(job, "succeeded")
+        else:
+            self._finish(job, "failed", error=result.get("error"))
+
+    def _finish(self, job: IngestJob, status: JobStatus, error: Optional[str] = None) -> None:
+        job.status = status
+        job.error = error
+        job.finished_at = time.time()
+        job.progress.finish()
+        logger.info(f"Ingestion job {job.job_id} {status}")
+
+    def _prune(self) -> None:
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - self.history)]:
+            del self._jobs[job_id]
+
+
+_job_manager: Optional[IngestJobManager] = None
+
+
+def get_job_manager() -> IngestJobManager:
+
+    global _job_manager
+
+    if _job_manager is None:
+        _job_manager = IngestJobManager()
+
+    return _job_manager
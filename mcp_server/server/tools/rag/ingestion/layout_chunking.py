@@ -0,0 +1,359 @@
+import multiprocessing
+import re
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion.boilerplate import boilerplate_mask
+from mcp_server.utils.logger import get_logger
+from mcp_server.utils.custom_exception import CustomException
+from mcp_server.utils.lru_cache import LRUCache
+from mcp_server.config.constants import (
+    EMBED_MODEL,
+    TOKEN_CHUNK_SIZE,
+    TOKEN_CHUNK_OVERLAP,
+    TOKEN_COUNT_CACHE_SIZE,
+    HEADING_SIZE_RATIO,
+    HEADING_MAX_CHARS,
+    CHUNKING_WORKERS,
+    CHUNKING_PARALLEL_MIN_PAGES,
+    BOILERPLATE_STRIP
+)
+
+logger = get_logger(__name__)
+
+# PyMuPDF span flag for bold text
+_BOLD_FLAG = 16
+
+# Sentence ends: punctuation followed by whitespace and an upper-case letter, digit or opening mark
+_SENTENCE_RE = re.compile(r"(?<=[.!?;])\s+(?=[A-ZÀ-ÖØ-Þ0-9«\"'(\[•–-])")
+
+# (text, font size, is_bold) for one layout block
+Block = Tuple[str, float, bool]
+
+_tokenizer = None
+_token_counts = LRUCache(TOKEN_COUNT_CACHE_SIZE)
+
+
+def get_tokenizer():
+
+    global _tokenizer
+
+    if _tokenizer:
+        return _tokenizer
+
+    try:
+        from transformers import AutoTokenizer
+
+        logger.info("Loading fast tokenizer for token-based chunking...")
+        _tokenizer = AutoTokenizer.from_pretrained(EMBED_MODEL, use_fast=True)
+        logger.info("Tokenizer loaded successfully.")
+        return _tokenizer
+
+    except Exception as e:
+        error_message = CustomException("Error occurred while loading tokenizer", e)
+        logger.error(str(error_message))
+        raise error_message
+
+
+def count_tokens(texts: List[str]) -> List[int]:
+    """
+    Number of embedding-model tokens in each text, without special tokens.
+
+    Counts are cached, and uncached texts are encoded in a single batch call
+    so the fast tokenizer can spread the work over its own threads.
+    """
+    counts: List[Optional[int]] = [_token_counts.get(text) for text in texts]
+    missing = list({text for text, count in zip(texts, counts) if count is None})
+
+    if missing:
+        encoded = get_tokenizer()(missing, add_special_tokens=False)["input_ids"]
+        fresh = {text: len(ids) for text, ids in zip(missing, encoded)}
+        for text, count in fresh.items():
+            _token_counts.put(text, count)
+        counts = [fresh[text] if count is None else count for text, count in zip(texts, counts)]
+
+    return counts
+
+
+def get_token_count_cache_info() -> dict:
+    """Return statistics about the token count cache."""
+    return _token_counts.stats()
+
+
+def _extract_blocks(source: str, pages: List[int]) -> Dict[int, List[Block]]:
+    """Read the text blocks of `pages` of one PDF with their dominant font size and weight."""
+    import fitz
+
+    result: Dict[int, List[Block]] = {}
+
+    with fitz.open(source) as pdf:
+        for page_number in pages:
+            blocks: List[Block] = []
+            for block in pdf[page_number].get_text("dict")["blocks"]:
+                if block.get("type") != 0:
+                    continue
+
+                spans = [span for line in block["lines"] for span in line["spans"] if span["text"].strip()]
+                if not spans:
+                    continue
+
+                text = "\n".join(
+                    " ".join(span["text"].strip() for span in line["spans"] if span["text"].strip())
+                    for line in block["lines"]
+                ).strip()
+                size = max(spans, key=lambda span: len(span["text"]))["size"]
+                bold = all(span["flags"] & _BOLD_FLAG for span in spans)
+                blocks.append((text, size, bold))
+
+            result[page_number] = blocks
+
+    return result
+
+
+def _fallback_blocks(text: str) -> List[Block]:
+    """Paragraph blocks for pages whose PDF cannot be re-opened; no heading information."""
+    return [(para.strip(), 0.0, False) for para in re.split(r"\n\s*\n", text) if para.strip()]
+
+
+def _strip_block_boilerplate(extracted: Dict[Tuple[str, int], List[Block]]) -> None:
+    """Drop running header and footer lines from extracted blocks, judging each source by its own pages."""
+    by_source: Dict[str, List[Tuple[str, int]]] = {}
+    for key in sorted(extracted):
+        by_source.setdefault(key[0], []).append(key)
+
+    for keys in by_source.values():
+        # (block index, line) for every line of every page
+        pages = [
+            [(b, line) for b, block in enumerate(extracted[key]) for line in block[0].split("\n")]
+            for key in keys
+        ]
+        mask = boilerplate_mask([[line for _, line in page] for page in pages])
+
+        for key, page, page_mask in zip(keys, pages, mask):
+            if not any(page_mask):
+                continue
+            kept: Dict[int, List[str]] = {}
+            for (b, line), drop in zip(page, page_mask):
+                if not drop:
+                    kept.setdefault(b, []).append(line)
+            extracted[key] = [
+                ("\n".join(kept[b]), size, bold)
+                for b, (_, size, bold) in enumerate(extracted[key]) if b in kept
+            ]
+
+
+def _load_all_blocks(documents: List[Document], workers: int, strip_boilerplate: bool = BOILERPLATE_STRIP) -> List[List[Block]]:
+    """Extract layout blocks for every page document, in parallel across page batches."""
+    by_source: Dict[str, List[int]] = {}
+    for doc in documents:
+        source = doc.metadata.get("file_path") or doc.metadata.get("source", "")
+        page = doc.metadata.get("page")
+        if source and isinstance(page, int) and Path(source).is_file():
+            by_source.setdefault(source, []).append(page)
+
+    tasks = []
+    for source, pages in by_source.items():
+        batch = max(1, len(pages) // max(1, workers))
+        tasks.extend((source, pages[i:i + batch]) for i in range(0, len(pages), batch))
+
+    extracted: Dict[Tuple[str, int], List[Block]] = {}
+    total_pages = sum(len(pages) for _, pages in tasks)
+
+    if workers > 1 and total_pages >= CHUNKING_PARALLEL_MIN_PAGES:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [(source, pool.submit(_extract_blocks, source, pages)) for source, pages in tasks]
+            for source, future in futures:
+                for page, blocks in future.result().items():
+                    extracted[(source, page)] = blocks
+    else:
+        for source, pages in tasks:
+            for page, blocks in _extract_blocks(source, pages).items():
+                extracted[(source, page)] = blocks
+
+    if strip_boilerplate:
+        _strip_block_boilerplate(extracted)
+
+    all_blocks = []
+    for doc in documents:
+        source = doc.metadata.get("file_path") or doc.metadata.get("source", "")
+        blocks = extracted.get((source, doc.metadata.get("page")))
+        all_blocks.append(blocks if blocks is not None else _fallback_blocks(doc.page_content))
+    return all_blocks
+
+
+def _is_heading(block: Block, body_size: float) -> bool:
+    text, size, bold = block
+    if len(text) > HEADING_MAX_CHARS or text.count("\n") > 1 or text.rstrip().endswith((".", ",", ";")):
+        return False
+    return (body_size > 0 and size >= body_size * HEADING_SIZE_RATIO) or bold
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split a paragraph into sentences, keeping list items and short lines intact."""
+    flat = re.sub(r"\s*\n\s*", " ", text).strip()
+    return [s for s in _SENTENCE_RE.split(flat) if s]
+
+
+def _split_long(sentence: str, tokens: int, max_tokens: int) -> List[str]:
+    """Cut a sentence longer than `max_tokens` into word-aligned pieces."""
+    words = sentence.split()
+    pieces = max(2, -(-tokens // max_tokens))
+    size = -(-len(words) // pieces)
+    return [" ".join(words[i:i + size]) for i in range(0, len(words), size)]
+
+
+def chunk_by_structure(
+    documents: List[Document],
+    chunk_size: int = TOKEN_CHUNK_SIZE,
+    chunk_overlap: int = TOKEN_CHUNK_OVERLAP,
+    workers: int = CHUNKING_WORKERS,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
+) -> List[Document]:
+    """
+    Chunk page documents along headings, blocks and sentence boundaries.
+
+    Layout blocks are read from the source PDF with PyMuPDF, in parallel
+    across pages. A heading closes the current chunk and is carried into the
+    following chunks as their section title. Chunks are filled sentence by
+    sentence up to `chunk_size` embedding-model tokens, counting the section
+    title they start with; a block that fits in one chunk, such as a short
+    paragraph or a table, is moved whole to the next chunk rather than split.
+    The last sentences of a chunk, up to `chunk_overlap` tokens, are repeated
+    at the start of the next.
+    Chunks never span pages, so page metadata stays exact. Running headers
+    and footers are dropped from the blocks the same way PDFLoader drops
+    them from page text.
+
+    Args:
+        documents: Page-level documents from PDFLoader
+        chunk_size: Maximum chunk length in tokens
+        chunk_overlap: Overlap between consecutive chunks in tokens
+        workers: Number of processes used for layout extraction
+        strip_boilerplate: Drop lines repeated at the top or bottom of most pages
+
+    Returns:
+        List of chunked documents, without chunk_index set
+    """
+    page_blocks = _load_all_blocks(documents, workers, strip_boilerplate)
+
+    # Body font size per source, weighted by text length
+    sizes: Dict[str, List[float]] = {}
+    for doc, blocks in zip(documents, page_blocks):
+        source = doc.metadata.get("source", "")
+        sizes.setdefault(source, []).extend(size for text, size, _ in blocks for _ in range(len(text) // 50 + 1))
+    body_sizes = {source: statistics.median(values) if values else 0.0 for source, values in sizes.items()}
+
+    # Sentence units per page, tagged with their block, tokenized together in one batch
+    page_units: List[List[Tuple[str, bool, int]]] = []
+    for doc, blocks in zip(documents, page_blocks):
+        body_size = body_sizes.get(doc.metadata.get("source", ""), 0.0)
+        units = []
+        for block_id, block in enumerate(blocks):
+            if _is_heading(block, body_size):
+                units.append((re.sub(r"\s+", " ", block[0]), True, block_id))
+            else:
+                units.extend((sentence, False, block_id) for sentence in split_sentences(block[0]))
+        page_units.append(units)
+
+    all_texts = [text for units in page_units for text, _, _ in units]
+    all_counts = iter(count_tokens(all_texts)) if all_texts else iter(())
+
+    chunks: List[Document] = []
+    section: Dict[str, str] = {}
+    section_tokens: Dict[str, int] = {}
+
+    for doc, units in zip(documents, page_units):
+        source = doc.metadata.get("source", "")
+        counts = [next(all_counts) for _ in units]
+        block_tokens: Dict[int, int] = {}
+        for (_, _, block_id), tokens in zip(units, counts):
+            block_tokens[block_id] = block_tokens.get(block_id, 0) + tokens
+
+        current: List[Tuple[str, int]] = []
+        current_tokens = 0
+        headings = set()
+
+        def prefix_tokens() -> int:
+            """Tokens of the section heading that flush will put in front of the current chunk."""
+            if not section.get(source) or (current and current[0] in headings):
+                return 0
+            # A heading too long to repeat is only kept in metadata
+            return section_tokens[source] if section_tokens[source] < chunk_size // 2 else 0
+
+        def flush(carry_overlap: bool) -> None:
+            nonlocal current, current_tokens
+            if all(unit in headings for unit in current):
+                # Nothing but headings: they live on as the section title
+                current, current_tokens = [], 0
+                return
+            heading = section.get(source, "")
+            body = "".join(
+                text + ("\n" if (text, tokens) in headings else " ")
+                for text, tokens in current
+            ).strip()
+            content = f"{heading}\n{body}" if prefix_tokens() else body
+            metadata = {**doc.metadata}
+            if heading:
+                metadata["section"] = heading
+            chunks.append(Document(page_content=content, metadata=metadata))
+
+            kept, kept_tokens = [], 0
+            if carry_overlap:
+                for text, tokens in reversed(current):
+                    if kept_tokens + tokens > chunk_overlap:
+                        break
+                    kept.insert(0, (text, tokens))
+                    kept_tokens += tokens
+            current, current_tokens = kept, kept_tokens
+
+        def make_room(tokens: int) -> None:
+            """Flush unless `tokens` more fit in the current chunk; drop the overlap if it alone leaves no room."""
+            nonlocal current, current_tokens
+            if current_tokens + tokens + prefix_tokens() > chunk_size:
+                flush(carry_overlap=True)
+                if current_tokens + tokens + prefix_tokens() > chunk_size:
+                    current, current_tokens = [], 0
+
+        previous_block = None
+        for (text, is_heading, block_id), tokens in zip(units, counts):
+            first_of_block = block_id != previous_block
+            previous_block = block_id
+
+            if is_heading:
+                if current and all(unit in headings for unit in current):
+                    # Consecutive headings (e.g. module title then sub-title) open one section
+                    current.append((text, tokens))
+                    current_tokens += tokens
+                else:
+                    flush(carry_overlap=False)
+                    current, current_tokens = [(text, tokens)], tokens
+                headings.add((text, tokens))
+                section[source] = " - ".join(unit_text for unit_text, _ in current)
+                section_tokens[source] = count_tokens([section[source]])[0]
+                continue
+
+            # A block that fits in one chunk (a short paragraph, a table) is never split across two
+            if first_of_block and block_tokens[block_id] + prefix_tokens() <= chunk_size:
+                make_room(block_tokens[block_id])
+
+            # Pieces of a long sentence leave room for the section heading of continuation chunks
+            heading_tokens = section_tokens.get(source, 0) if section.get(source) else 0
+            max_tokens = chunk_size - heading_tokens if heading_tokens < chunk_size // 2 else chunk_size
+            pieces = [(text, tokens)]
+            if tokens > max_tokens:
+                split = _split_long(text, tokens, max_tokens)
+                pieces = list(zip(split, count_tokens(split)))
+
+            for piece, piece_tokens in pieces:
+                make_room(piece_tokens)
+                current.append((piece, piece_tokens))
+                current_tokens += piece_tokens
+        flush(carry_overlap=False)
+
+    logger.info(f"Structure-aware chunking produced {len(chunks)} chunks from {len(documents)} pages")
+    return chunks
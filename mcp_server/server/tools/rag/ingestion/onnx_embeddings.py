@@ -0,0 +1,192 @@
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from transformers import AutoTokenizer
+
+from mcp_server.utils.logger import get_logger
+from mcp_server.utils.custom_exception import CustomException
+from mcp_server.config.constants import (
+    EMBED_MODEL,
+    EMBED_ONNX_PATH,
+    EMBED_ONNX_QUANTIZE,
+    EMBED_INTRA_OP_THREADS,
+    EMBED_MAX_SEQ_LENGTH,
+    EMBED_BATCH_SIZE
+)
+
+logger = get_logger(__name__)
+
+FP32_FILE = "model.onnx"
+INT8_FILE = "model.int8.onnx"
+
+
+def _model_dir(model_name: str, onnx_path: str) -> Path:
+    return Path(onnx_path) / model_name.replace("/", "__")
+
+
+def export_onnx(
+    model_name: str = EMBED_MODEL,
+    onnx_path: str = EMBED_ONNX_PATH,
+    quantize: bool = EMBED_ONNX_QUANTIZE,
+    opset: int = 17
+) -> Path:
+    """
+    Export a Hugging Face encoder to ONNX, optionally with a dynamic int8 copy.
+
+    The tokenizer is saved next to the model so the ONNX backend loads
+    without network access. Models over 2 GB (bge-m3 in fp32) are written
+    with external weight files. Export and quantization need the `onnx`
+    package; running an exported model only needs `onnxruntime`.
+
+    Args:
+        model_name: Hugging Face model ID
+        onnx_path: Root directory for exported models
+        quantize: Also write a dynamically int8-quantized model
+        opset: ONNX opset version
+
+    Returns:
+        Directory holding the exported model and tokenizer
+    """
+    target = _model_dir(model_name, onnx_path)
+    fp32_path = target / FP32_FILE
+    int8_path = target / INT8_FILE
+
+    if fp32_path.exists() and (int8_path.exists() or not quantize):
+        return target
+
+    try:
+        import onnx  # noqa: F401  (used by the exporter and the quantizer)
+    except ImportError as e:
+        raise CustomException("Exporting to ONNX needs the 'onnx' package (pip install 'agentic-mcp[onnx]')", e)
+
+    target.mkdir(parents=True, exist_ok=True)
+
+    if not fp32_path.exists():
+        import torch
+        from transformers import AutoModel
+
+        logger.info(f"Exporting {model_name} to {fp32_path}...")
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModel.from_pretrained(model_name).eval()
+
+        sample = tokenizer(["export sample"], return_tensors="pt")
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (sample["input_ids"], sample["attention_mask"]),
+                str(fp32_path),
+                input_names=["input_ids", "attention_mask"],
+                output_names=["last_hidden_state"],
+                dynamic_axes={
+                    "input_ids": {0: "batch", 1: "sequence"},
+                    "attention_mask": {0: "batch", 1: "sequence"},
+                    "last_hidden_state": {0: "batch", 1: "sequence"}
+                },
+                opset_version=opset,
+                dynamo=False
+            )
+        tokenizer.save_pretrained(str(target))
+        logger.info("ONNX export complete.")
+
+    if quantize and not int8_path.exists():
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        logger.info("Quantizing ONNX model to int8...")
+        quantize_dynamic(
+            str(fp32_path),
+            str(int8_path),
+            weight_type=QuantType.QInt8,
+            use_external_data_format=True
+        )
+        logger.info("Quantization complete.")
+
+    return target
+
+
+class OnnxEmbeddings(Embeddings):
+    """
+    bge-m3 dense embeddings computed with ONNX Runtime.
+
+    Produces the same vectors as the sentence-transformers pipeline of the
+    model: CLS token of the last hidden state, L2-normalised. Texts are
+    sorted by length before batching so each batch pads as little as
+    possible. The model is exported on first use if it is not on disk.
+    """
+
+    def __init__(
+        self,
+        model_name: str = EMBED_MODEL,
+        onnx_path: str = EMBED_ONNX_PATH,
+        quantize: bool = EMBED_ONNX_QUANTIZE,
+        intra_op_threads: int = EMBED_INTRA_OP_THREADS,
+        max_seq_length: int = EMBED_MAX_SEQ_LENGTH,
+        batch_size: int = EMBED_BATCH_SIZE
+    ):
+        """
+        Args:
+            model_name: Hugging Face model ID
+            onnx_path: Root directory for exported models
+            quantize: Run the dynamically int8-quantized model
+            intra_op_threads: ONNX Runtime intra-op threads, 0 for its default
+            max_seq_length: Longer inputs are truncated to this many tokens
+            batch_size: Texts per inference call
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise CustomException("The ONNX embedding backend needs the 'onnxruntime' package (pip install 'agentic-mcp[onnx]')", e)
+
+        model_dir = export_onnx(model_name, onnx_path, quantize)
+        model_file = model_dir / (INT8_FILE if quantize else FP32_FILE)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            options.intra_op_num_threads = intra_op_threads
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.max_seq_length = max_seq_length
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.session = ort.InferenceSession(str(model_file), options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+
+        logger.info(f"ONNX embedding model loaded from {model_file} (intra_op_threads={intra_op_threads or 'auto'})")
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        encoded = self.tokenizer(
+            texts,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np"
+        )
+        inputs = {
+            name: encoded[name].astype(np.int64)
+            for name in ("input_ids", "attention_mask", "token_type_ids")
+            if name in self._input_names and name in encoded
+        }
+        hidden = self.session.run(None, inputs)[0]
+        cls = hidden[:, 0]
+        norms = np.linalg.norm(cls, axis=1, keepdims=True)
+        return cls / np.where(norms == 0, 1.0, norms)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if not texts:
+            return []
+
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        vectors: List[Optional[np.ndarray]] = [None] * len(texts)
+
+        for start in range(0, len(order), self.batch_size):
+            batch = order[start:start + self.batch_size]
+            for i, vector in zip(batch, self._embed([texts[i] for i in batch])):
+                vectors[i] = vector
+
+        return [vector.tolist() for vector in vectors]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed([text])[0].tolist()
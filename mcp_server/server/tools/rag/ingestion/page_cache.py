@@ -0,0 +1,151 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+from importlib.metadata import version
+from pathlib import Path
+from typing import List, Optional
+
+from langchain_core.documents import Document
+
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import PAGE_CACHE_PATH, PAGE_CACHE_FORMAT_VERSION
+
+logger = get_logger(__name__)
+
+# Anything that can change the extracted pages invalidates the cache
+# Read from package metadata so importing this module does not load PyMuPDF
+PARSER_VERSION = f"pymupdf-{version('pymupdf')}_lc-{version('langchain-community')}_v{PAGE_CACHE_FORMAT_VERSION}"
+
+# Metadata fields naming where the file lives rather than what it contains
+_PATH_FIELDS = ("source", "file_path")
+
+_HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_HASH_BLOCK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PageCache:
+    """
+    Persistent cache of parsed PDF pages, keyed by file content hash and parser version.
+
+    Each PDF is stored as one gzip-compressed JSON file: metadata shared by
+    every page is written once, followed by each page's text and the
+    metadata particular to it. Paths in the metadata are not stored but
+    filled in on load, so a copy of the same PDF elsewhere is a cache hit.
+    """
+
+    def __init__(self, cache_dir: str = PAGE_CACHE_PATH, parser_version: str = PARSER_VERSION):
+        """
+        Args:
+            cache_dir: Directory holding the cached pages
+            parser_version: Part of the key; entries of other versions are ignored
+        """
+        self.cache_dir = Path(cache_dir)
+        self.parser_version = parser_version
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}.{self.parser_version}.json.gz"
+
+    def get(self, path: str, content_hash: str) -> Optional[List[Document]]:
+        """Pages of the PDF with `content_hash`, with metadata paths set to `path`, or None."""
+        entry = self._entry_path(content_hash)
+        try:
+            with gzip.open(entry, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            self._count(hit=False)
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable page cache entry {entry.name}: {e}")
+            entry.unlink(missing_ok=True)
+            self._count(hit=False)
+            return None
+
+        self._count(hit=True)
+        location = {field: path for field in _PATH_FIELDS}
+        return [
+            Document(page_content=page["text"], metadata={**data["common"], **page["meta"], **location})
+            for page in data["pages"]
+        ]
+
+    def put(self, content_hash: str, documents: List[Document]) -> None:
+        """Store parsed pages; written atomically so readers never see a partial entry."""
+        metadatas = [
+            {k: v for k, v in doc.metadata.items() if k not in _PATH_FIELDS}
+            for doc in documents
+        ]
+        common = dict(metadatas[0]) if metadatas else {}
+        for metadata in metadatas[1:]:
+            common = {k: v for k, v in common.items() if k in metadata and metadata[k] == v}
+
+        data = {
+            "parser_version": self.parser_version,
+            "common": common,
+            "pages": [
+                {"text": doc.page_content, "meta": {k: v for k, v in metadata.items() if k not in common}}
+                for doc, metadata in zip(documents, metadatas)
+            ]
+        }
+
+        entry = self._entry_path(content_hash)
+        tmp = entry.with_name(f".{entry.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+                json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+            os.replace(tmp, entry)
+        except OSError as e:
+            logger.warning(f"Failed to write page cache entry {entry.name}: {e}")
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def clear(self) -> int:
+        """Delete every cached entry, whatever its parser version. Returns the number deleted."""
+        deleted = 0
+        for entry in self.cache_dir.glob("*.json.gz"):
+            entry.unlink(missing_ok=True)
+            deleted += 1
+        return deleted
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "directory": str(self.cache_dir),
+                "parser_version": self.parser_version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0
+            }
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+
+    global _page_cache
+
+    if _page_cache is None:
+        _page_cache = PageCache()
+
+    return _page_cache
@@ -0,0 +1,243 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, List, Optional
+from urllib.parse import urlparse
+
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import CACHE_PATH, PDF_CACHE_MAX_BYTES, PDF_CACHE_INDEX_FILE
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    filename      TEXT PRIMARY KEY,
+    url           TEXT,
+    size          INTEGER NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    content_hash  TEXT,
+    created_at    REAL NOT NULL,
+    last_access   REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access);
+
+-- Running totals kept by triggers, so stats never scan the table or the directory
+CREATE TABLE IF NOT EXISTS totals (
+    id    INTEGER PRIMARY KEY CHECK (id = 0),
+    files INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO totals VALUES (0, 0, 0);
+
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries BEGIN
+    UPDATE totals SET files = files + 1, bytes = bytes + NEW.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries BEGIN
+    UPDATE totals SET files = files - 1, bytes = bytes - OLD.size WHERE id = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS entries_resize AFTER UPDATE OF size ON entries BEGIN
+    UPDATE totals SET bytes = bytes - OLD.size + NEW.size WHERE id = 0;
+END;
+"""
+
+
+@dataclass
+class CacheEntry:
+    filename: str
+    url: Optional[str]
+    size: int
+    etag: Optional[str]
+    last_modified: Optional[str]
+    content_hash: Optional[str]
+    created_at: float
+    last_access: float
+
+
+class PDFCache:
+    """
+    Size-capped directory of downloaded PDFs with a SQLite index.
+
+    The index records URL, size, validators (ETag / Last-Modified), content
+    hash and last access of every cached file. When the total size exceeds
+    `max_bytes`, least recently accessed files are deleted. PDFs already in
+    the directory but missing from the index (e.g. from before the index
+    existed) are adopted when the cache is opened.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_PATH, max_bytes: int = PDF_CACHE_MAX_BYTES):
+        """
+        Args:
+            cache_dir: Directory holding the PDFs and the index
+            max_bytes: Total size above which least recently used PDFs are evicted
+        """
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive, got {max_bytes}")
+
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.cache_dir / PDF_CACHE_INDEX_FILE,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._adopt_untracked()
+
+    def path_for(self, url: str) -> Path:
+        """Cache file path for `url`: MD5 of the URL, plus the original file name when it is a PDF."""
+        url_hash = hashlib.md5(url.encode()).hexdigest()
+        original_name = Path(urlparse(url).path).name
+
+        if original_name.endswith('.pdf'):
+            return self.cache_dir / f"{url_hash}_{original_name}"
+        return self.cache_dir / f"{url_hash}.pdf"
+
+    def lookup(self, url: str) -> Optional[CacheEntry]:
+        """Index entry for `url`, or None if it is not cached or its file has gone."""
+        path = self.path_for(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM entries WHERE filename = ?", (path.name,)
+            ).fetchone()
+            if row is None:
+                return None
+            if not path.exists():
+                self._conn.execute("DELETE FROM entries WHERE filename = ?", (path.name,))
+                return None
+        return CacheEntry(*row)
+
+    def touch(self, url: str) -> None:
+        """Mark the cached copy of `url` as just used."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE entries SET last_access = ? WHERE filename = ?",
+                (time.time(), self.path_for(url).name)
+            )
+
+    def record(
+        self,
+        url: str,
+        size: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        content_hash: Optional[str] = None
+    ) -> None:
+        """Index a file just written to `path_for(url)`."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (filename) DO UPDATE SET
+                    url = excluded.url, size = excluded.size, etag = excluded.etag,
+                    last_modified = excluded.last_modified, content_hash = excluded.content_hash,
+                    last_access = excluded.last_access
+                """,
+                (self.path_for(url).name, url, size, etag, last_modified, content_hash, now, now)
+            )
+
+    def evict(self, protect: Iterable[str] = ()) -> int:
+        """
+        Delete least recently used files until the cache fits in `max_bytes`.
+
+        Args:
+            protect: URLs whose files must survive, e.g. the batch about to be parsed
+
+        Returns:
+            Number of files evicted
+        """
+        protected = {self.path_for(url).name for url in protect}
+        evicted = 0
+
+        with self._lock:
+            total = self._totals()[1]
+            if total <= self.max_bytes:
+                return 0
+
+            for filename, size in self._conn.execute(
+                "SELECT filename, size FROM entries ORDER BY last_access"
+            ).fetchall():
+                if total <= self.max_bytes:
+                    break
+                if filename in protected:
+                    continue
+                (self.cache_dir / filename).unlink(missing_ok=True)
+                self._conn.execute("DELETE FROM entries WHERE filename = ?", (filename,))
+                total -= size
+                evicted += 1
+
+        if evicted:
+            logger.info(f"Evicted {evicted} cached PDFs; cache now {total} bytes of {self.max_bytes}")
+        return evicted
+
+    def clear(self) -> int:
+        """Delete every cached PDF and its index entry. Returns the number of files deleted."""
+        deleted = 0
+        with self._lock:
+            for (filename,) in self._conn.execute("SELECT filename FROM entries").fetchall():
+                try:
+                    (self.cache_dir / filename).unlink(missing_ok=True)
+                    self._conn.execute("DELETE FROM entries WHERE filename = ?", (filename,))
+                    deleted += 1
+                except Exception as e:
+                    logger.warning(f"Failed to delete cached file {filename}: {e}")
+        return deleted
+
+    def entries(self) -> List[CacheEntry]:
+        with self._lock:
+            rows = self._conn.execute("SELECT * FROM entries ORDER BY last_access DESC").fetchall()
+        return [CacheEntry(*row) for row in rows]
+
+    def stats(self) -> dict:
+        """Cache totals, read from the index without touching the directory."""
+        with self._lock:
+            files, total = self._totals()
+        return {
+            "directory": str(self.cache_dir),
+            "files": files,
+            "total_size_mb": round(total / (1024 * 1024), 2),
+            "max_size_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "usage_ratio": round(total / self.max_bytes, 4)
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def _totals(self) -> tuple:
+        return self._conn.execute("SELECT files, bytes FROM totals WHERE id = 0").fetchone()
+
+    def _adopt_untracked(self) -> None:
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT filename FROM entries")}
+            untracked = [p for p in self.cache_dir.glob("*.pdf") if p.name not in known]
+            for path in untracked:
+                stat = path.stat()
+                self._conn.execute(
+                    "INSERT INTO entries VALUES (?, NULL, ?, NULL, NULL, NULL, ?, ?)",
+                    (path.name, stat.st_size, stat.st_mtime, stat.st_mtime)
+                )
+        if untracked:
+            logger.info(f"Indexed {len(untracked)} cached PDFs found in {self.cache_dir}")
+
+
+_caches: dict = {}
+_caches_lock = threading.Lock()
+
+
+def get_pdf_cache(cache_dir: str = CACHE_PATH) -> PDFCache:
+    """Shared PDFCache for `cache_dir`, opened once per process."""
+    key = str(Path(cache_dir).resolve())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = PDFCache(cache_dir)
+        return _caches[key]
@@ -1,16 +1,16 @@
-import hashlib
-import requests
+import tempfile
+import time
 from pathlib import Path
-from typing import List, Optional, Literal
+from typing import Callable, List, Optional, Literal
 from urllib.parse import urlparse
 
-from langchain_community.document_loaders import (
-    DirectoryLoader, 
-    PyMuPDFLoader
-)
 from langchain_core.documents import Document
+from mcp_server.server.tools.rag.ingestion.pdf_cache import PDFCache, get_pdf_cache
+from mcp_server.server.tools.rag.ingestion.page_cache import PageCache, get_page_cache, file_sha256
+from mcp_server.server.tools.rag.ingestion.url_fetcher import UrlFetcher, FetchResult
+from mcp_server.server.tools.rag.ingestion.boilerplate import strip_boilerplate
 from mcp_server.utils.logger import get_logger
-from mcp_server.config.constants import DATA_PATH, CACHE_PATH
+from mcp_server.config.constants import DATA_PATH, CACHE_PATH, URL_FETCH_CONCURRENCY, BOILERPLATE_STRIP
 
 logger = get_logger(__name__)
 SourceType = Literal["file", "directory", "url"]
@@ -24,28 +24,34 @@ class PDFLoader:
         self, 
         cache_dir: str = CACHE_PATH,
         enable_cache: bool = True,
-        verify_ssl: bool = True
+        verify_ssl: bool = True,
+        enable_page_cache: bool = True,
+        strip_boilerplate: bool = BOILERPLATE_STRIP
     ):
         """
         Initialize PDF loader.
         
         Args:
-            cache_dir: Directory for caching downloaded PDFs
+            cache_dir: Directory for caching downloaded PDFs, bounded by PDF_CACHE_MAX_BYTES
             enable_cache: Whether to enable URL caching
             verify_ssl: Whether to verify SSL certificates for URL downloads
+            enable_page_cache: Reuse previously parsed pages of identical PDF content
+            strip_boilerplate: Remove running headers, footers and page numbers from each PDF
         """
         self.cache_dir = Path(cache_dir)
         self.enable_cache = enable_cache
         self.verify_ssl = verify_ssl
+        self.strip_boilerplate = strip_boilerplate
+        self.boilerplate_stats = {"files": 0, "lines_removed": 0, "chars_removed": 0, "chars_kept": 0, "elapsed_ms": 0.0}
         
-        if self.enable_cache:
-            self.cache_dir.mkdir(parents=True, exist_ok=True)
-            logger.info(f"PDF cache directory: {self.cache_dir}")
+        self.cache: Optional[PDFCache] = get_pdf_cache(cache_dir) if enable_cache else None
+        self.page_cache: Optional[PageCache] = get_page_cache() if enable_page_cache else None
     
     def load(
         self, 
         source: str, 
-        source_type: Literal["auto", "file", "directory", "url"] = "auto"
+        source_type: Literal["auto", "file", "directory", "url"] = "auto",
+        on_file: Optional[Callable[[int, int], None]] = None
     ) -> List[Document]:
         """
         Universal PDF loader that auto-detects source type.
@@ -53,6 +59,7 @@ class PDFLoader:
         Args:
             source: File path, directory path, or URL
             source_type: Type of source ("auto" for auto-detection)
+            on_file: Called as on_file(files_done, files_total) after each PDF is loaded
             
         Returns:
             List of loaded documents
@@ -63,17 +70,26 @@ class PDFLoader:
         logger.info(f"Loading PDF from {source_type}: {source}")
         
         if source_type == "file":
-            return self.load_file(source)
+            documents = self.load_file(source)
         elif source_type == "directory":
-            return self.load_directory(source)
+            return self.load_directory(source, on_file=on_file)
         elif source_type == "url":
-            return self.load_from_url(source)
+            documents = self.load_from_url(source)
         else:
             raise ValueError(f"Invalid source_type: {source_type}")
+
+        if on_file:
+            on_file(1, 1)
+        return documents
     
     def load_file(self, file_path: str) -> List[Document]:
         """
         Load a single PDF file.
+
+        Pages are served from the parsed-page cache when a PDF with the same
+        content was parsed before by the same parser version. The cache holds
+        the pages as parsed; boilerplate is stripped after it, and the totals
+        are added to `boilerplate_stats`.
         
         Args:
             file_path: Path to the PDF file
@@ -96,25 +112,43 @@ class PDFLoader:
         logger.info(f"Loading PDF file: {file_path}")
         
         try:
+            content_hash = file_sha256(str(path)) if self.page_cache else None
+            documents = self.page_cache.get(str(path), content_hash) if self.page_cache else None
+
+            if documents is not None:
+                logger.info(f"Loaded {len(documents)} parsed pages of {path.name} from the page cache")
+                return self._strip_boilerplate(documents)
+
+            # Imported here: langchain_community's loaders pull in torch and transformers
+            from langchain_community.document_loaders import PyMuPDFLoader
+
             loader = PyMuPDFLoader(str(path))
             documents = loader.load()
 
             # Sort pages to ensure consistent order
             documents.sort(key=lambda doc: doc.metadata.get('page', 0))
             
+            if self.page_cache:
+                self.page_cache.put(content_hash, documents)
+
             logger.info(f"Successfully loaded {len(documents)} pages from {path.name}")
-            return documents
+            return self._strip_boilerplate(documents)
             
         except Exception as e:
             logger.exception(f"Failed to load PDF file: {file_path}")
             raise
     
-    def load_directory(self, directory: Optional[str] = None) -> List[Document]:
+    def load_directory(
+        self,
+        directory: Optional[str] = None,
+        on_file: Optional[Callable[[int, int], None]] = None
+    ) -> List[Document]:
         """
         Load all PDF files from a directory.
         
         Args:
             directory: Path to directory 
+            on_file: Called as on_file(files_done, files_total) after each PDF is loaded
             
         Returns:
             List of loaded documents
@@ -134,14 +168,13 @@ class PDFLoader:
         logger.info(f"Loading PDF files from {data_path}")
         
         try:
-            loader = DirectoryLoader(
-                str(data_path),
-                glob="*.pdf",
-                loader_cls=PyMuPDFLoader, # type: ignore[arg-type]
-                show_progress=True
-            )
-            
-            documents = loader.load()
+            # File by file, so each PDF goes through the page cache
+            pdf_paths = sorted(data_path.glob("*.pdf"))
+            documents = []
+            for done, pdf_path in enumerate(pdf_paths, start=1):
+                documents.extend(self.load_file(str(pdf_path)))
+                if on_file:
+                    on_file(done, len(pdf_paths))
             
             if not documents:
                 warning_msg = f"No PDF files found in {data_path}"
@@ -161,6 +194,9 @@ class PDFLoader:
     def load_from_url(self, url: str) -> List[Document]:
         """
         Load a PDF file from a URL with caching support.
+
+        A cached copy is revalidated with a conditional request and only
+        downloaded again if the server reports it has changed.
         
         Args:
             url: HTTP/HTTPS URL to the PDF file
@@ -175,30 +211,35 @@ class PDFLoader:
             raise ValueError(error_msg)
         
         if self.enable_cache:
-            cached_file = self._get_cached_file_path(url)
-            if cached_file.exists():
-                logger.info(f"Loading PDF from cache: {url}")
-                return self.load_file(str(cached_file))
-        
-        logger.info(f"Downloading PDF from URL: {url}")
-        pdf_content = self._download_pdf(url)
-        
-        if self.enable_cache:
-            cached_file = self._save_to_cache(url, pdf_content)
-            logger.info(f"PDF cached at: {cached_file}")
-            return self.load_file(str(cached_file))
-        else:
-            import tempfile
-            with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as tmp_file:
-                tmp_file.write(pdf_content)
-                tmp_path = tmp_file.name
-            
+            result = self._fetcher(self.cache).fetch_many([url])[0]
+            if result.status == "failed":
+                raise RuntimeError(f"Failed to download PDF from {url}: {result.error}")
+            return self.load_file(result.path)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            scratch = PDFCache(tmp_dir)
             try:
-                documents = self.load_file(tmp_path)
-                return documents
+                result = self._fetcher(scratch).fetch_many([url])[0]
+                if result.status == "failed":
+                    raise RuntimeError(f"Failed to download PDF from {url}: {result.error}")
+                return self.load_file(result.path)
             finally:
-                # Clean up temp file
-                Path(tmp_path).unlink(missing_ok=True)
+                scratch.close()
+
+    def fetch_urls(self, urls: List[str], concurrency: int = URL_FETCH_CONCURRENCY) -> List[FetchResult]:
+        """
+        Download or revalidate several PDFs concurrently into the cache.
+
+        Args:
+            urls: HTTP/HTTPS URLs to PDF files
+            concurrency: Maximum number of downloads in flight
+
+        Returns:
+            One FetchResult per distinct URL, in input order
+        """
+        if not self.enable_cache:
+            raise ValueError("Batch URL fetching requires the PDF cache to be enabled")
+        return self._fetcher(self.cache, concurrency).fetch_many(urls)
     
     def clear_cache(self) -> int:
         """
@@ -207,45 +248,33 @@ class PDFLoader:
         Returns:
             Number of files deleted
         """
-        if not self.cache_dir.exists():
-            logger.info("Cache directory does not exist")
+        if self.cache is None:
+            logger.info("Cache is disabled")
             return 0
         
-        deleted_count = 0
-        for file_path in self.cache_dir.glob("*.pdf"):
-            try:
-                file_path.unlink()
-                deleted_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to delete cached file {file_path}: {e}")
-        
+        deleted_count = self.cache.clear()
         logger.info(f"Cleared {deleted_count} cached PDF files")
         return deleted_count
     
     def get_cache_info(self) -> dict:
         """
-        Get information about the cache.
+        Get information about the cache, from its index.
         
         Returns:
             Dictionary with cache statistics
         """
-        if not self.cache_dir.exists():
+        page_cache = self.page_cache.stats() if self.page_cache else None
+
+        if self.cache is None:
             return {
-                "enabled": self.enable_cache,
+                "enabled": False,
                 "directory": str(self.cache_dir),
                 "files": 0,
-                "total_size_mb": 0
+                "total_size_mb": 0,
+                "page_cache": page_cache
             }
         
-        pdf_files = list(self.cache_dir.glob("*.pdf"))
-        total_size = sum(f.stat().st_size for f in pdf_files)
-        
-        return {
-            "enabled": self.enable_cache,
-            "directory": str(self.cache_dir),
-            "files": len(pdf_files),
-            "total_size_mb": round(total_size / (1024 * 1024), 2)
-        }
+        return {"enabled": True, **self.cache.stats(), "page_cache": page_cache}
     
         
     def _detect_source_type(self, source: str) -> SourceType:
@@ -262,48 +291,19 @@ class PDFLoader:
             raise ValueError(f"Cannot determine source type for: {source}")
         
     
-    def _get_cached_file_path(self, url: str) -> Path:
-        """Generate cache file path from URL."""
-        url_hash = hashlib.md5(url.encode()).hexdigest()
-        parsed_url = urlparse(url)
-        original_name = Path(parsed_url.path).name
-        
-        if original_name.endswith('.pdf'):
-            filename = f"{url_hash}_{original_name}"
-        else:
-            filename = f"{url_hash}.pdf"
-        
-        return self.cache_dir / filename
-    
-    def _download_pdf(self, url: str) -> bytes:
-        """Download PDF from URL."""
-        try:
-            response = requests.get(
-                url, 
-                verify=self.verify_ssl,
-                timeout=30,
-                headers={'User-Agent': 'Mozilla/5.0'}
-            )
-            response.raise_for_status()
-            
-            content_type = response.headers.get('content-type', '').lower()
-            if 'pdf' not in content_type and not url.lower().endswith('.pdf'):
-                logger.warning(f"URL may not be a PDF. Content-Type: {content_type}")
-            
-            return response.content
-            
-        except requests.RequestException as e:
-            logger.exception(f"Failed to download PDF from {url}")
-            raise
-    
-    def _save_to_cache(self, url: str, content: bytes) -> Path:
-        """Save downloaded PDF to cache."""
-        cached_file = self._get_cached_file_path(url)
-        
-        try:
-            cached_file.write_bytes(content)
-            logger.debug(f"Saved {len(content)} bytes to cache")
-            return cached_file
-        except Exception as e:
-            logger.exception(f"Failed to save PDF to cache: {cached_file}")
-            raise
\ No newline at end of file
+    def _strip_boilerplate(self, documents: List[Document]) -> List[Document]:
+        if not self.strip_boilerplate:
+            return documents
+
+        start = time.perf_counter()
+        documents, stats = strip_boilerplate(documents)
+        totals = self.boilerplate_stats
+        totals["files"] += 1
+        totals["lines_removed"] += stats["lines_removed"]
+        totals["chars_removed"] += stats["chars_removed"]
+        totals["chars_kept"] += sum(len(doc.page_content) for doc in documents)
+        totals["elapsed_ms"] = round(totals["elapsed_ms"] + (time.perf_counter() - start) * 1000, 2)
+        return documents
+
+    def _fetcher(self, cache: PDFCache, concurrency: int = URL_FETCH_CONCURRENCY) -> UrlFetcher:
+        return UrlFetcher(cache=cache, concurrency=concurrency, verify_ssl=self.verify_ssl)
@@ -0,0 +1,504 @@
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion.pdf_loader import PDFLoader
+from mcp_server.server.tools.rag.ingestion.chunking import chunk_documents, ChunkingStrategy
+from mcp_server.server.tools.rag.ingestion.embeddings import get_embedding_model
+from mcp_server.server.tools.rag.ingestion.vector_store import get_or_create_vector_store
+from mcp_server.server.tools.rag.ingestion.dedup import deduplicate_chunks, shared_sources
+from mcp_server.server.tools.rag.ingestion.index_config import IndexConfig
+from mcp_server.server.tools.rag.collection_registry import get_collection_registry, validate_collection_name
+from mcp_server.server.tools.rag.store_stats import get_store_stats
+from mcp_server.utils.logger import get_logger
+from mcp_server.utils.profiling import RSSSampler, StageProfiler, TimedEmbeddings
+from mcp_server.config.constants import (
+    CHROMA_COLLECTION_NAME,
+    URL_FETCH_CONCURRENCY,
+    INGEST_PROGRESS_BATCH,
+    REBUILD_GC_GRACE_S,
+    DEDUP_ENABLED,
+    BOILERPLATE_STRIP
+)
+
+logger = get_logger(__name__)
+
+
+class IngestCancelled(Exception):
+    """Raised inside an ingest once its progress has been cancelled."""
+
+
+class IngestProgress:
+    """
+    Per-stage progress of one ingest, updated by the ingest thread and read by others.
+
+    Cancellation is cooperative: `cancel` sets a flag that the ingest checks
+    between files, between embedding batches and between stages. Nothing is
+    written to the vector store before the write stage, so a cancelled
+    ingest leaves the collection untouched unless it was already writing.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = threading.Event()
+        self.stage: Optional[str] = None
+        self.stages: Dict[str, dict] = {}
+
+    def begin(self, stage: str, total: Optional[int] = None) -> None:
+        self.check()
+        with self._lock:
+            if self.stage in self.stages:
+                self.stages[self.stage]["finished_at"] = time.perf_counter()
+            self.stage = stage
+            self.stages[stage] = {"done": 0, "total": total, "started_at": time.perf_counter(), "finished_at": None}
+
+    def update(self, done: int, total: Optional[int] = None) -> None:
+        with self._lock:
+            current = self.stages.get(self.stage)
+            if current is not None:
+                current["done"] = done
+                if total is not None:
+                    current["total"] = total
+
+    def finish(self) -> None:
+        with self._lock:
+            if self.stage in self.stages:
+                self.stages[self.stage]["finished_at"] = time.perf_counter()
+            self.stage = None
+
+    def cancel(self) -> None:
+        self._cancelled.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def check(self) -> None:
+        if self._cancelled.is_set():
+            raise IngestCancelled("Ingestion cancelled")
+
+    def snapshot(self) -> dict:
+        now = time.perf_counter()
+        with self._lock:
+            stages = {}
+            for name, state in self.stages.items():
+                elapsed = (state["finished_at"] or now) - state["started_at"]
+                stages[name] = {
+                    "done": state["done"],
+                    "total": state["total"],
+                    "elapsed_s": round(elapsed, 3),
+                    "per_s": _per_second(state["done"], elapsed)
+                }
+            return {"stage": self.stage, "stages": stages}
+
+
+def _source_bytes(documents: List[Document]) -> int:
+    """Total size of the distinct source files behind `documents` that are still on disk."""
+    paths = {doc.metadata.get("file_path") or doc.metadata.get("source", "") for doc in documents}
+    return sum(Path(p).stat().st_size for p in paths if p and Path(p).is_file())
+
+
+def _per_second(count: float, seconds: float) -> float:
+    return round(count / seconds, 2) if seconds > 0 else 0.0
+
+
+def run_ingest(
+    source: str,
+    source_type: str = "auto",
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    chunking_strategy: ChunkingStrategy = "recursive",
+    update_mode: str = "skip",
+    enable_cache: bool = True,
+    collection: str = CHROMA_COLLECTION_NAME,
+    progress: Optional[IngestProgress] = None,
+    index_config: Optional[IndexConfig] = None,
+    deduplicate: bool = DEDUP_ENABLED,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
+) -> dict:
+    """
+    Load, chunk, embed and store PDFs, timing each stage.
+
+    The "index" step of get_or_create_vector_store is split into embedding
+    and the Chroma write by timing the embedding function it calls.
+
+    Args:
+        progress: Receives per-stage progress and carries cancellation;
+            raises IngestCancelled out of this function when cancelled
+        index_config: HNSW parameters if the collection is created by this ingest
+        deduplicate: Embed and store one chunk per group of near-duplicate chunks
+        strip_boilerplate: Remove running headers, footers and page numbers before chunking
+
+    Returns:
+        The ingest_documents result, with a "profile" entry holding per-stage
+        seconds, throughput and memory
+    """
+    validate_collection_name(collection)
+    logger.info(f"Starting document ingestion from: {source} into collection '{collection}'")
+
+    profiler = StageProfiler()
+    progress = progress or IngestProgress()
+
+    def on_file(done: int, total: int) -> None:
+        progress.update(done, total)
+        progress.check()
+
+    with RSSSampler() as memory:
+        progress.begin("load")
+        with profiler.stage("load"):
+            pdf_loader = PDFLoader(enable_cache=enable_cache, strip_boilerplate=strip_boilerplate)
+            documents = pdf_loader.load(source=source, source_type=source_type, on_file=on_file)
+
+        if not documents:
+            return {
+                "success": False,
+                "error": "No documents were loaded",
+                "documents_loaded": 0
+            }
+
+        logger.info(f"Loaded {len(documents)} pages from PDF(s)")
+
+        indexed = _chunk_and_index(
+            profiler, progress, documents, chunk_size, chunk_overlap, chunking_strategy, update_mode, collection,
+            index_config, deduplicate, strip_boilerplate
+        )
+
+    progress.finish()
+    profile = _build_profile(profiler, memory, documents, indexed)
+    logger.info(f"Ingest profile for '{source}': {profile}")
+
+    result = {
+        "success": True,
+        "source": source,
+        "source_type": source_type,
+        "collection": collection,
+        "pages_loaded": len(documents),
+        "chunks_created": indexed["chunks_created"],
+        "boilerplate": pdf_loader.boilerplate_stats if strip_boilerplate else None,
+        "dedup": indexed["dedup"],
+        "total_documents_in_store": indexed["total_documents_in_store"],
+        "update_mode": update_mode,
+        "chunking_strategy": chunking_strategy,
+        "profile": profile,
+        "message": f"Successfully ingested {len(documents)} pages into {indexed['chunks_created']} chunks"
+    }
+    get_store_stats(get_collection_registry().persist_directory).record_ingest(
+        collection, source, result, profile["total_s"]
+    )
+    return result
+
+
+def run_url_ingest(
+    urls: List[str],
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    chunking_strategy: ChunkingStrategy = "recursive",
+    update_mode: str = "skip",
+    concurrency: int = URL_FETCH_CONCURRENCY,
+    collection: str = CHROMA_COLLECTION_NAME,
+    progress: Optional[IngestProgress] = None,
+    deduplicate: bool = DEDUP_ENABLED,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
+) -> dict:
+    """
+    Fetch several PDF URLs concurrently, then chunk, embed and store them.
+
+    PDFs already cached are revalidated with a conditional request. With
+    update_mode="skip", a PDF the server reports as unchanged whose chunks
+    are already in the collection is neither parsed nor re-embedded.
+
+    Returns:
+        Ingest result with a per-URL "fetch" report and a "profile" entry
+    """
+    validate_collection_name(collection)
+    logger.info(f"Starting ingestion of {len(urls)} URLs into collection '{collection}'")
+
+    profiler = StageProfiler()
+    progress = progress or IngestProgress()
+    registry = get_collection_registry()
+
+    with RSSSampler() as memory:
+        progress.begin("fetch", total=len(urls))
+        with profiler.stage("fetch"):
+            pdf_loader = PDFLoader(strip_boilerplate=strip_boilerplate)
+            fetched = pdf_loader.fetch_urls(urls, concurrency=concurrency)
+
+        failed = [r for r in fetched if r.status == "failed"]
+        if len(failed) == len(fetched):
+            return {
+                "success": False,
+                "error": f"None of the {len(fetched)} URLs could be downloaded",
+                "fetch": [r.to_dict() for r in fetched]
+            }
+
+        progress.update(len(fetched))
+        progress.begin("load", total=len(fetched) - len(failed))
+        with profiler.stage("load"):
+            existing = registry.get(collection).vector_store if update_mode == "skip" else None
+            documents: List[Document] = []
+            unchanged: List[str] = []
+            progress_done = 0
+            for result in fetched:
+                if result.status == "failed":
+                    continue
+                if result.status == "not_modified" and existing is not None and _has_source(existing, result.path):
+                    unchanged.append(result.url)
+                    progress_done += 1
+                    continue
+                documents.extend(pdf_loader.load_file(result.path))
+                progress_done += 1
+                progress.update(progress_done)
+                progress.check()
+
+        indexed = {
+            "chunks_created": 0, "chunks_embedded": 0, "embed_s": 0.0, "dedup": None, "total_documents_in_store": None
+        }
+        if documents:
+            indexed = _chunk_and_index(
+                profiler, progress, documents, chunk_size, chunk_overlap, chunking_strategy, update_mode, collection,
+                deduplicate=deduplicate, strip_boilerplate=strip_boilerplate
+            )
+
+    progress.finish()
+    profile = _build_profile(profiler, memory, documents, indexed)
+    logger.info(f"URL ingest profile: {profile}")
+
+    total_docs = indexed["total_documents_in_store"]
+    if total_docs is None:
+        total_docs = registry.get(collection).vector_store._collection.count()
+
+    result = {
+        "success": True,
+        "collection": collection,
+        "urls": len(fetched),
+        "downloaded": sum(1 for r in fetched if r.status == "downloaded"),
+        "not_modified": sum(1 for r in fetched if r.status == "not_modified"),
+        "unchanged_skipped": len(unchanged),
+        "failed": len(failed),
+        "fetch": [r.to_dict() for r in fetched],
+        "pages_loaded": len(documents),
+        "chunks_created": indexed["chunks_created"],
+        "boilerplate": pdf_loader.boilerplate_stats if strip_boilerplate else None,
+        "dedup": indexed["dedup"],
+        "total_documents_in_store": total_docs,
+        "update_mode": update_mode,
+        "chunking_strategy": chunking_strategy,
+        "profile": profile,
+        "message": f"Ingested {len(documents)} pages from {len(fetched) - len(failed) - len(unchanged)} URLs; "
+                   f"{len(unchanged)} unchanged, {len(failed)} failed"
+    }
+    get_store_stats(registry.persist_directory).record_ingest(
+        collection, f"{len(fetched)} URLs", result, profile["total_s"]
+    )
+    return result
+
+
+def run_rebuild(
+    source: str,
+    source_type: str = "auto",
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    chunking_strategy: ChunkingStrategy = "recursive",
+    enable_cache: bool = True,
+    collection: str = CHROMA_COLLECTION_NAME,
+    progress: Optional[IngestProgress] = None,
+    deduplicate: bool = DEDUP_ENABLED,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
+) -> dict:
+    """
+    Rebuild `collection` from `source` without interrupting retrieval.
+
+    The documents are ingested into a new physical collection while queries
+    keep reading the current one. When the build succeeds, `collection` is
+    switched to it atomically and the replaced collection is deleted after
+    REBUILD_GC_GRACE_S, once in-flight queries on it have finished. A failed
+    or cancelled build deletes its partial collection and leaves the live
+    one untouched. The collection's write lock is held throughout, so
+    ingests into `collection` started during the rebuild wait for the swap
+    and are written to the rebuilt collection.
+
+    Returns:
+        The run_ingest result for the new collection, with the physical
+        collection now serving `collection` and the one it replaced
+    """
+    validate_collection_name(collection)
+    progress = progress or IngestProgress()
+    registry = get_collection_registry()
+    store_stats = get_store_stats(registry.persist_directory)
+
+    with registry.write_lock(collection):
+        # Partial collections left by rebuilds that were interrupted mid-way; recent ones may still be in use
+        registry.sweep_pending_deletions()
+        for abandoned in registry.collect_generations(collection, REBUILD_GC_GRACE_S):
+            store_stats.forget(abandoned)
+
+        # The rebuilt index keeps the live collection's HNSW parameters
+        index_config = None
+        if collection in registry.list_collections():
+            index_config = IndexConfig.from_collection(registry.get(collection).vector_store._collection)
+
+        shadow = registry.generation_name(collection)
+        logger.info(f"Rebuilding collection '{collection}' into '{shadow}' from: {source}")
+
+        try:
+            result = run_ingest(
+                source=source,
+                source_type=source_type,
+                chunk_size=chunk_size,
+                chunk_overlap=chunk_overlap,
+                chunking_strategy=chunking_strategy,
+                update_mode="skip",
+                enable_cache=enable_cache,
+                collection=shadow,
+                progress=progress,
+                index_config=index_config,
+                deduplicate=deduplicate,
+                strip_boilerplate=strip_boilerplate
+            )
+            if result["success"]:
+                progress.begin("swap")
+        except BaseException:
+            registry.delete_physical(shadow)
+            store_stats.forget(shadow)
+            raise
+
+        if not result["success"]:
+            registry.delete_physical(shadow)
+            store_stats.forget(shadow)
+            return {**result, "collection": collection}
+
+        previous = registry.swap(collection, shadow)
+        store_stats.promote(shadow, collection)
+        if previous is not None:
+            registry.delete_later(previous, REBUILD_GC_GRACE_S)
+        progress.finish()
+
+        return {
+            **result,
+            "collection": collection,
+            "update_mode": "rebuild",
+            "physical_collection": shadow,
+            "replaced_collection": previous,
+            "message": f"Rebuilt '{collection}' from {result['pages_loaded']} pages into {result['chunks_created']} chunks"
+        }
+
+
+def _has_source(vector_store, source: str) -> bool:
+    """Whether the collection holds any chunk loaded from `source`."""
+    return bool(vector_store._collection.get(where={"source": source}, limit=1, include=[])["ids"])
+
+
+def _chunk_and_index(
+    profiler: StageProfiler,
+    progress: IngestProgress,
+    documents: List[Document],
+    chunk_size: Optional[int],
+    chunk_overlap: Optional[int],
+    chunking_strategy: ChunkingStrategy,
+    update_mode: str,
+    collection: str,
+    index_config: Optional[IndexConfig] = None,
+    deduplicate: bool = DEDUP_ENABLED,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
+) -> dict:
+    """Chunk, deduplicate, embed and write `documents`, recording the chunk/dedupe/model_load/embed/write stages."""
+    progress.begin("chunk", total=len(documents))
+    with profiler.stage("chunk"):
+        text_chunks = chunk_documents(
+            documents=documents,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            strategy=chunking_strategy,
+            strip_boilerplate=strip_boilerplate
+        )
+    progress.update(len(documents))
+
+    logger.info(f"Created {len(text_chunks)} text chunks")
+
+    # Sources whose every chunk was folded into another source's still get their stats and IDs refreshed
+    ids_by_source: Dict[str, List[str]] = {chunk.metadata.get("source", "unknown"): [] for chunk in text_chunks}
+    chunks_created = len(text_chunks)
+
+    dedup_stats = None
+    if deduplicate:
+        progress.begin("dedupe", total=len(text_chunks))
+        with profiler.stage("dedupe"):
+            text_chunks, dedup_stats = deduplicate_chunks(text_chunks)
+        progress.update(dedup_stats["chunks_in"])
+        progress.check()
+
+    def on_batch(done: int, total: int) -> None:
+        progress.update(done, total)
+        progress.check()
+        if done == total:
+            # Chroma writes as soon as the last batch is embedded
+            progress.begin("write", total=total)
+
+    # Model loading is its own stage so the first ingest's embed time stays comparable
+    progress.begin("model_load")
+    with profiler.stage("model_load"):
+        embeddings = TimedEmbeddings(get_embedding_model(), batch_size=INGEST_PROGRESS_BATCH, on_batch=on_batch)
+
+    # Only chunks not already stored are embedded; the total is set by the first batch
+    progress.begin("embed")
+
+    registry = get_collection_registry()
+    index_start = time.perf_counter()
+    # Resolved under the write lock so a rebuild cannot swap the collection out mid-write
+    with registry.write_lock(collection):
+        vector_store = get_or_create_vector_store(
+            text_chunks=text_chunks,
+            update_mode=update_mode,
+            collection_name=registry.resolve(collection),
+            persist_directory=registry.persist_directory,
+            embedding_model=embeddings,
+            index_config=index_config
+        )
+        index_s = time.perf_counter() - index_start
+        registry.record_ingest(collection)
+        for chunk in text_chunks:
+            # A chunk kept for several sources counts as produced by each of them
+            for source in shared_sources(chunk.metadata) or [chunk.metadata.get("source", "unknown")]:
+                ids_by_source[source].append(chunk.metadata["doc_id"])
+        store_stats = get_store_stats(registry.persist_directory)
+        store_stats.update_sources(collection, vector_store._collection, ids_by_source)
+        store_stats.record_chunk_ids(collection, ids_by_source)
+
+    profiler.add("embed", embeddings.seconds)
+    profiler.add("write", max(0.0, index_s - embeddings.seconds))
+    progress.update(embeddings.texts)
+
+    if dedup_stats is not None:
+        # Estimated at this ingest's own embedding rate
+        per_chunk_s = embeddings.seconds / embeddings.texts if embeddings.texts else 0.0
+        dedup_stats["embed_s_saved"] = round(dedup_stats["duplicates_removed"] * per_chunk_s, 3)
+        dedup_stats["dedupe_s"] = round(profiler.stages.get("dedupe", 0.0), 3)
+
+    return {
+        "chunks_created": chunks_created,
+        "dedup": dedup_stats,
+        "chunks_embedded": embeddings.texts,
+        "embed_s": embeddings.seconds,
+        "total_documents_in_store": vector_store._collection.count()
+    }
+
+
+def _build_profile(profiler: StageProfiler, memory: RSSSampler, documents: List[Document], indexed: dict) -> dict:
+    total_s = profiler.total_s
+    source_bytes = _source_bytes(documents)
+    return {
+        **profiler.to_dict(),
+        "total_s": round(total_s, 3),
+        "source_bytes": source_bytes,
+        "chunks_embedded": indexed["chunks_embedded"],
+        "mb_per_s": _per_second(source_bytes / 1e6, total_s),
+        "pages_per_s": _per_second(len(documents), total_s),
+        "chunks_per_s": _per_second(indexed["chunks_created"], total_s),
+        "embed_chunks_per_s": _per_second(indexed["chunks_embedded"], indexed["embed_s"]),
+        "rss_start_mb": round(memory.start_mb, 1),
+        "rss_peak_mb": round(memory.peak_mb, 1),
+        "rss_end_mb": round(memory.end_mb, 1)
+    }
@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Awaitable, List, Literal, Optional, TypeVar
+from urllib.parse import urlparse
+from uuid import uuid4
+
+import httpx
+
+from mcp_server.server.tools.rag.ingestion.pdf_cache import PDFCache
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import (
+    URL_FETCH_CONCURRENCY,
+    URL_FETCH_TIMEOUT_S,
+    URL_FETCH_CHUNK_BYTES,
+    URL_FETCH_USER_AGENT
+)
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+FetchStatus = Literal["downloaded", "not_modified", "failed"]
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status: FetchStatus
+    path: Optional[str] = None
+    bytes: int = 0
+    elapsed_ms: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def run_sync(coro: Awaitable[T]) -> T:
+    """Run a coroutine from synchronous code, even when called on an event loop thread."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # A loop is already running here (e.g. a sync tool called by the server): use a fresh one elsewhere
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+class UrlFetcher:
+    """
+    Concurrent PDF downloader sharing one pooled HTTP client.
+
+    Bodies are streamed to a temporary file and moved into the cache once
+    complete, so memory use does not grow with the PDF size and a failed
+    download never leaves a truncated cache entry. Cached files are
+    revalidated with If-None-Match / If-Modified-Since: an unchanged PDF
+    costs a single 304 response. Once a batch is fetched the cache is
+    trimmed to its size cap, sparing the files of that batch.
+    """
+
+    def __init__(
+        self,
+        cache: PDFCache,
+        concurrency: int = URL_FETCH_CONCURRENCY,
+        timeout_s: float = URL_FETCH_TIMEOUT_S,
+        verify_ssl: bool = True,
+        revalidate: bool = True
+    ):
+        """
+        Args:
+            cache: Cache the PDFs are downloaded into
+            concurrency: Maximum number of downloads in flight
+            timeout_s: Connect/read timeout per request
+            verify_ssl: Whether to verify SSL certificates
+            revalidate: Send conditional requests for cached files; when False
+                a cached file is used as is, without contacting the server
+        """
+        self.cache = cache
+        self.concurrency = max(1, concurrency)
+        self.timeout_s = timeout_s
+        self.verify_ssl = verify_ssl
+        self.revalidate = revalidate
+
+    def fetch_many(self, urls: List[str]) -> List[FetchResult]:
+        """Synchronous wrapper around `afetch_many`."""
+        return run_sync(self.afetch_many(urls))
+
+    async def afetch_many(self, urls: List[str]) -> List[FetchResult]:
+        """
+        Fetch every URL into the cache, at most `concurrency` at a time.
+
+        Args:
+            urls: HTTP/HTTPS URLs; duplicates are fetched once
+
+        Returns:
+            One FetchResult per distinct URL, in input order. Failures are
+            reported in the result rather than raised.
+        """
+        unique = list(dict.fromkeys(urls))
+        semaphore = asyncio.Semaphore(self.concurrency)
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+
+        async with httpx.AsyncClient(
+            timeout=self.timeout_s,
+            limits=limits,
+            verify=self.verify_ssl,
+            follow_redirects=True,
+            headers={"User-Agent": URL_FETCH_USER_AGENT}
+        ) as client:
+
+            async def bounded(url: str) -> FetchResult:
+                async with semaphore:
+                    return await self._fetch(client, url)
+
+            results = await asyncio.gather(*(bounded(url) for url in unique))
+
+        self.cache.evict(protect=[r.url for r in results if r.status != "failed"])
+
+        fetched = sum(1 for r in results if r.status == "downloaded")
+        unchanged = sum(1 for r in results if r.status == "not_modified")
+        logger.info(f"Fetched {len(unique)} URLs: {fetched} downloaded, {unchanged} not modified, "
+                    f"{len(unique) - fetched - unchanged} failed")
+        return list(results)
+
+    async def _fetch(self, client: httpx.AsyncClient, url: str) -> FetchResult:
+        start = time.perf_counter()
+        path = self.cache.path_for(url)
+
+        def elapsed() -> float:
+            return round((time.perf_counter() - start) * 1000, 2)
+
+        if urlparse(url).scheme not in ("http", "https"):
+            return FetchResult(url, "failed", error=f"Invalid URL scheme (must be http/https): {url}")
+
+        headers = {}
+        cached = self.cache.lookup(url)
+        if cached is not None:
+            if not self.revalidate:
+                self.cache.touch(url)
+                return FetchResult(url, "not_modified", str(path), 0, elapsed())
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+
+        # Unique per call: coroutines on one loop share a pid and a thread
+        tmp_path = path.with_name(f".{path.name}.{uuid4().hex}.part")
+        try:
+            async with client.stream("GET", url, headers=headers) as response:
+                if response.status_code == 304 and cached is not None:
+                    logger.info(f"Not modified: {url}")
+                    self.cache.touch(url)
+                    return FetchResult(url, "not_modified", str(path), 0, elapsed())
+                response.raise_for_status()
+
+                content_type = response.headers.get("content-type", "").lower()
+                if "pdf" not in content_type and not url.lower().endswith(".pdf"):
+                    logger.warning(f"URL may not be a PDF. Content-Type: {content_type}")
+
+                size = 0
+                digest = hashlib.sha256()
+                with open(tmp_path, "wb") as f:
+                    async for block in response.aiter_bytes(URL_FETCH_CHUNK_BYTES):
+                        f.write(block)
+                        digest.update(block)
+                        size += len(block)
+
+                os.replace(tmp_path, path)
+                self.cache.record(
+                    url,
+                    size=size,
+                    etag=response.headers.get("etag"),
+                    last_modified=response.headers.get("last-modified"),
+                    content_hash=digest.hexdigest()
+                )
+
+            logger.info(f"Downloaded {size} bytes from {url}")
+            return FetchResult(url, "downloaded", str(path), size, elapsed())
+
+        except Exception as e:
+            logger.warning(f"Failed to fetch {url}: {e}")
+            return FetchResult(url, "failed", error=str(e), elapsed_ms=elapsed())
+
+        finally:
+            tmp_path.unlink(missing_ok=True)
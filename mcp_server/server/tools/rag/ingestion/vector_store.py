@@ -1,20 +1,29 @@
 import hashlib
-from typing import List, Optional
-from langchain_community.vectorstores import Chroma
+from typing import TYPE_CHECKING, List, Optional
 from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from mcp_server.server.tools.rag.ingestion.embeddings import get_embedding_model
+from mcp_server.server.tools.rag.ingestion.index_config import IndexConfig
 from mcp_server.utils.logger import get_logger
 from mcp_server.utils.custom_exception import CustomException
 from mcp_server.config.constants import VECTOR_DB_PATH, CHROMA_COLLECTION_NAME
 from pathlib import Path
 
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import Chroma
+
 logger = get_logger(__name__)
 
 def generate_document_id(doc: Document) -> str:
     """
     Generate a unique ID based on stable document attributes.
     Uses source file, page number, and chunk index for consistency.
+    Chunks kept for several sources by deduplication are keyed on their
+    content instead, so re-ingesting one source never overwrites them.
     """
+    if doc.metadata.get('shared_sources'):
+        return hashlib.sha256(f"shared|{doc.page_content}".encode()).hexdigest()
+
     source = doc.metadata.get('source', '')
     page = doc.metadata.get('page', 0)
     chunk_index = doc.metadata.get('chunk_index', 0)
@@ -24,7 +33,12 @@ def generate_document_id(doc: Document) -> str:
     return hashlib.sha256(stable_id.encode()).hexdigest()
 
 
-def get_existing_doc_ids(vector_store: Chroma) -> set:
+def get_chunk_id(doc: Document) -> str:
+    """Return the stored chunk ID, falling back to recomputing it."""
+    return doc.metadata.get('doc_id') or generate_document_id(doc)
+
+
+def get_existing_doc_ids(vector_store: "Chroma") -> set:
     """
     Retrieve all existing document IDs from the vector store.
     """
@@ -44,7 +58,11 @@ def get_existing_doc_ids(vector_store: Chroma) -> set:
 
 def get_or_create_vector_store(
     text_chunks: Optional[List[Document]] = None,
-    update_mode: str = "skip"  # "skip" or "upsert"
+    update_mode: str = "skip",  # "skip" or "upsert"
+    collection_name: str = CHROMA_COLLECTION_NAME,
+    persist_directory: str = VECTOR_DB_PATH,
+    embedding_model: Optional[Embeddings] = None,
+    index_config: Optional[IndexConfig] = None
 ):
     """
     Loads an existing ChromaDB vector store or creates a new one.
@@ -57,20 +75,32 @@ def get_or_create_vector_store(
         update_mode: How to handle existing documents.
             - "skip": Skip documents that already exist (default).
             - "upsert": Add new documents and update existing ones.
+        collection_name: Name of the Chroma collection to use.
+        persist_directory: Directory holding the Chroma database.
+        embedding_model: Embedding function to use instead of the shared model,
+            e.g. a wrapper that times embedding during ingestion.
+        index_config: HNSW parameters used if the collection is created here;
+            an existing collection keeps its own. Defaults to IndexConfig().
     
     Returns:
         A Chroma vector store instance.
     """
+    # langchain_community is slow to import; only tools that open a store pay for it
+    from langchain_community.vectorstores import Chroma
+
     try:
-        embedding_model = get_embedding_model()
+        embedding_model = embedding_model or get_embedding_model()
+        # Only applied by Chroma when the collection does not exist yet
+        collection_metadata = (index_config or IndexConfig()).to_metadata()
 
         # Case 1: Load existing store without adding documents
         if text_chunks is None:
-            logger.info(f"Loading existing Chroma vector store from '{VECTOR_DB_PATH}'...")
+            logger.info(f"Loading existing Chroma vector store from '{persist_directory}'...")
             db = Chroma(
-                persist_directory=VECTOR_DB_PATH,
+                persist_directory=persist_directory,
                 embedding_function=embedding_model,
-                collection_name=CHROMA_COLLECTION_NAME
+                collection_name=collection_name,
+                collection_metadata=collection_metadata
             )
             logger.info("Chroma vector store loaded successfully.")
             return db
@@ -87,9 +117,10 @@ def get_or_create_vector_store(
 
         try:
             db = Chroma(
-                persist_directory=VECTOR_DB_PATH,
+                persist_directory=persist_directory,
                 embedding_function=embedding_model,
-                collection_name=CHROMA_COLLECTION_NAME
+                collection_name=collection_name,
+                collection_metadata=collection_metadata
             )
             existing_ids = get_existing_doc_ids(db)
             logger.info(f"Loaded existing vector store with {len(existing_ids)} documents")
@@ -99,8 +130,9 @@ def get_or_create_vector_store(
             db = Chroma.from_documents(
                 documents=text_chunks,
                 embedding=embedding_model,
-                collection_name=CHROMA_COLLECTION_NAME,
-                persist_directory=VECTOR_DB_PATH,
+                collection_name=collection_name,
+                persist_directory=persist_directory,
+                collection_metadata=collection_metadata,
                 ids=doc_ids
             )
             logger.info(f"Created new vector store with {len(text_chunks)} documents")
@@ -156,7 +188,7 @@ def get_or_create_vector_store(
     except Exception as e:
         if "Could not find a Chroma collection" in str(e) or "does not exist" in str(e):
             raise CustomException(
-                f"Vector store not found at '{VECTOR_DB_PATH}'. Provide text_chunks to create it.", 
+                f"Vector store not found at '{persist_directory}'. Provide text_chunks to create it.", 
                 e
             ) from e
         
@@ -0,0 +1,299 @@
+import json
+import time
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from mcp_server.server.tools.rag.collection_registry import (
+    get_collection_registry,
+    persistent_client,
+    validate_collection_name
+)
+from mcp_server.server.tools.rag.reindex import rebuild_index
+from mcp_server.server.tools.rag.ingestion.dedup import shared_sources
+from mcp_server.server.tools.rag.store_stats import get_store_stats
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import MAINTENANCE_SCAN_BATCH, DELETE_SOURCES_PER_BATCH
+
+logger = get_logger(__name__)
+
+
+def _scan(chroma_collection, include: List[str], where: Optional[dict] = None) -> Iterator[dict]:
+    """Pages of a collection's records, optionally only those matching `where`, MAINTENANCE_SCAN_BATCH at a time."""
+    for offset in range(0, chroma_collection.count(), MAINTENANCE_SCAN_BATCH):
+        page = chroma_collection.get(where=where, limit=MAINTENANCE_SCAN_BATCH, offset=offset, include=include)
+        if not page["ids"]:
+            break
+        yield page
+
+
+def _payload_bytes(page: dict, dimension: int) -> int:
+    """Stored size of a page of records: text, metadata and float32 embeddings."""
+    return sum(
+        len((text or "").encode("utf-8")) + len(json.dumps(meta or {})) + dimension * 4
+        for text, meta in zip(page["documents"], page["metadatas"])
+    )
+
+
+def _dimension(chroma_collection) -> int:
+    sample = chroma_collection.peek(limit=1)
+    return len(sample["embeddings"][0]) if len(sample["ids"]) else 0
+
+
+def _matching_sources(chroma_collection, source: Optional[str], pattern: Optional[str]) -> List[str]:
+    """Distinct stored source paths equal to `source` or matching the glob `pattern`, by full path or file name."""
+    stored = set()
+    for page in _scan(chroma_collection, include=["metadatas"]):
+        stored.update((meta or {}).get("source", "") for meta in page["metadatas"])
+
+    def matches(value: str) -> bool:
+        name = Path(value).name
+        if source and source in (value, name):
+            return True
+        return bool(pattern) and (fnmatch(value, pattern) or fnmatch(name, pattern))
+
+    return sorted(value for value in stored if value and matches(value))
+
+
+def _rehome_shared(
+    chroma_collection,
+    page: dict,
+    leaving: Set[str],
+    latest: Dict[str, set],
+    dry_run: bool
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Move chunks that deduplication kept for several sources to one that stays.
+
+    A chunk of the page moves to the first of its "shared_sources" that is
+    not in `leaving` and whose latest ingest still produced it; other
+    chunks are left alone.
+
+    Returns:
+        IDs of the chunks moved, and the sources they moved to
+    """
+    ids, metadatas = [], []
+    for chunk_id, meta in zip(page["ids"], page["metadatas"]):
+        staying = [s for s in shared_sources(meta) if s not in leaving and chunk_id in latest.get(s, ())]
+        if not staying:
+            continue
+        names = {Path(s).name for s in staying}
+        places = [p for p in meta.get("duplicate_sources", "").split("; ") if p.rsplit(":", 1)[0] in names]
+        ids.append(chunk_id)
+        metadatas.append({
+            **meta,
+            "source": staying[0],
+            "shared_sources": json.dumps(staying),
+            "duplicate_sources": "; ".join(places)
+        })
+    if ids and not dry_run:
+        chroma_collection.update(ids=ids, metadatas=metadatas)
+    return set(ids), {meta["source"] for meta in metadatas}
+
+
+def _delete_where(
+    chroma_collection,
+    where: dict,
+    dimension: int,
+    dry_run: bool,
+    leaving: Optional[Set[str]] = None,
+    latest: Optional[Dict[str, set]] = None
+) -> dict:
+    """
+    Delete the chunks matching `where`, returning how many there were, their stored size and sources.
+
+    With `leaving`, the sources being removed, chunks that deduplication kept
+    for other sources as well are moved to one of those instead of deleted.
+    Matches are read and deleted MAINTENANCE_SCAN_BATCH at a time.
+    """
+    # Collect the matching IDs before changing anything, so deletes do not shift the pages being read
+    ids = [chunk_id for page in _scan(chroma_collection, include=[], where=where) for chunk_id in page["ids"]]
+
+    counts = {"chunks": 0, "bytes": 0, "moved": 0, "sources": set()}
+    for batch_start in range(0, len(ids), MAINTENANCE_SCAN_BATCH):
+        page = chroma_collection.get(
+            ids=ids[batch_start:batch_start + MAINTENANCE_SCAN_BATCH], include=["documents", "metadatas"]
+        )
+        moved, moved_to = set(), set()
+        if leaving:
+            moved, moved_to = _rehome_shared(chroma_collection, page, leaving, latest or {}, dry_run)
+
+        keep = [i for i, chunk_id in enumerate(page["ids"]) if chunk_id not in moved]
+        deleted = {key: [page[key][i] for i in keep] for key in ("ids", "documents", "metadatas")}
+        if deleted["ids"] and not dry_run:
+            chroma_collection.delete(ids=deleted["ids"])
+
+        counts["chunks"] += len(deleted["ids"])
+        counts["bytes"] += _payload_bytes(deleted, dimension)
+        counts["moved"] += len(moved)
+        counts["sources"] |= {(meta or {}).get("source", "unknown") for meta in page["metadatas"]} | moved_to
+    return counts
+
+
+def delete_chunks(
+    collection: str,
+    source: Optional[str] = None,
+    pattern: Optional[str] = None,
+    where: Optional[dict] = None,
+    dry_run: bool = False,
+    compact: bool = False
+) -> dict:
+    """
+    Delete chunks by source, source glob or metadata filter.
+
+    Sources are matched against the stored source path or its file name.
+    Deletion runs as one metadata-filtered delete per batch of
+    DELETE_SOURCES_PER_BATCH sources. When both sources and `where` are
+    given, only chunks matching both are deleted. A chunk that deduplication
+    kept for other sources too is moved to one of them rather than deleted
+    when its source is removed.
+
+    Args:
+        collection: Collection to delete from
+        source: Exact source path or file name
+        pattern: Glob matched against source paths and file names, e.g. "*2023*.pdf"
+        where: Chroma metadata filter, e.g. {"section": "Annexes"}
+        dry_run: Report what would be deleted without deleting it
+        compact: Rebuild the index afterwards so the space of deleted vectors is freed
+
+    Returns:
+        Dictionary with the matched sources, deleted chunk count and the space reclaimed
+    """
+    validate_collection_name(collection)
+    if not (source or pattern or where):
+        raise ValueError("Give a source, a pattern or a metadata filter to select the chunks to delete")
+
+    start = time.perf_counter()
+    registry = get_collection_registry()
+    store_stats = get_store_stats(registry.persist_directory)
+    with registry.write_lock(collection):
+        chroma_collection = persistent_client(registry.persist_directory).get_collection(
+            registry.resolve(collection)
+        )
+        dimension = _dimension(chroma_collection)
+
+        filters: List[dict] = []
+        sources: List[str] = []
+        latest: Dict[str, set] = {}
+        if source or pattern:
+            sources = _matching_sources(chroma_collection, source, pattern)
+            latest = store_stats.chunk_ids(collection)
+            for batch_start in range(0, len(sources), DELETE_SOURCES_PER_BATCH):
+                batch = sources[batch_start:batch_start + DELETE_SOURCES_PER_BATCH]
+                source_filter = {"source": {"$in": batch}}
+                filters.append({"$and": [source_filter, where]} if where else source_filter)
+        elif where:
+            filters.append(where)
+
+        deleted = {"chunks": 0, "bytes": 0, "moved": 0}
+        affected = set()
+        for chunk_filter in filters:
+            counts = _delete_where(chroma_collection, chunk_filter, dimension, dry_run, set(sources), latest)
+            deleted["chunks"] += counts["chunks"]
+            deleted["bytes"] += counts["bytes"]
+            deleted["moved"] += counts["moved"]
+            affected |= counts["sources"]
+
+        result = {
+            "collection": collection,
+            "dry_run": dry_run,
+            "sources_matched": sources,
+            "chunks_deleted": deleted["chunks"],
+            "shared_chunks_moved": deleted["moved"],
+            "payload_mb_reclaimed": round(deleted["bytes"] / 1e6, 3),
+            "documents_remaining": chroma_collection.count()
+        }
+
+        if not dry_run and (deleted["chunks"] or deleted["moved"]):
+            registry.invalidate(collection)
+            store_stats.update_sources(collection, chroma_collection, affected)
+            if sources and not where:
+                store_stats.forget_sources(collection, sources)
+            if compact and deleted["chunks"]:
+                result["compaction"] = rebuild_index(collection)
+
+    result["elapsed_s"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Deleted {deleted['chunks']} chunks from '{collection}' (dry_run={dry_run})")
+    return result
+
+
+def collect_garbage(collection: str, dry_run: bool = False, compact: bool = True) -> dict:
+    """
+    Delete chunks that the latest ingest of their source did not produce.
+
+    A source re-chunked into fewer chunks, or re-ingested after its pages
+    changed, leaves its old chunks behind; they are found by comparing the
+    stored chunk IDs of each source with the IDs its latest ingest produced.
+    Sources ingested before those IDs were recorded are left alone and
+    reported as untracked. A chunk that deduplication kept for other sources
+    too is moved to one whose latest ingest still produced it instead of
+    being deleted.
+
+    Args:
+        collection: Collection to clean up
+        dry_run: Report orphaned chunks without deleting them
+        compact: Rebuild the index afterwards so the space of deleted vectors is freed
+
+    Returns:
+        Dictionary with the orphaned chunk count per source, untracked
+        sources and the space reclaimed
+    """
+    validate_collection_name(collection)
+    start = time.perf_counter()
+    registry = get_collection_registry()
+    store_stats = get_store_stats(registry.persist_directory)
+    with registry.write_lock(collection):
+        chroma_collection = persistent_client(registry.persist_directory).get_collection(
+            registry.resolve(collection)
+        )
+        dimension = _dimension(chroma_collection)
+        latest = store_stats.chunk_ids(collection)
+
+        stale = {"ids": [], "metadatas": []}
+        untracked = set()
+        for page in _scan(chroma_collection, include=["metadatas"]):
+            for chunk_id, meta in zip(page["ids"], page["metadatas"]):
+                source = (meta or {}).get("source", "unknown")
+                if source not in latest:
+                    untracked.add(source)
+                elif chunk_id not in latest[source]:
+                    stale["ids"].append(chunk_id)
+                    stale["metadatas"].append(meta)
+
+        # Stale for their own source, but possibly still produced by another source they were kept for
+        moved, moved_to = _rehome_shared(chroma_collection, stale, set(), latest, dry_run)
+        orphans: List[str] = []
+        orphans_by_source: Dict[str, int] = {}
+        for chunk_id, meta in zip(stale["ids"], stale["metadatas"]):
+            if chunk_id not in moved:
+                source = (meta or {}).get("source", "unknown")
+                orphans.append(chunk_id)
+                orphans_by_source[source] = orphans_by_source.get(source, 0) + 1
+
+        payload_bytes = 0
+        for batch_start in range(0, len(orphans), MAINTENANCE_SCAN_BATCH):
+            batch = orphans[batch_start:batch_start + MAINTENANCE_SCAN_BATCH]
+            payload_bytes += _payload_bytes(chroma_collection.get(ids=batch, include=["documents", "metadatas"]), dimension)
+            if not dry_run:
+                chroma_collection.delete(ids=batch)
+
+        result = {
+            "collection": collection,
+            "dry_run": dry_run,
+            "chunks_deleted": len(orphans),
+            "shared_chunks_moved": len(moved),
+            "orphans_by_source": {Path(source).name: count for source, count in sorted(orphans_by_source.items())},
+            "untracked_sources": sorted(Path(source).name for source in untracked),
+            "payload_mb_reclaimed": round(payload_bytes / 1e6, 3),
+            "documents_remaining": chroma_collection.count()
+        }
+
+        if not dry_run and (orphans or moved):
+            registry.invalidate(collection)
+            store_stats.update_sources(collection, chroma_collection, set(orphans_by_source) | moved_to)
+            if compact and orphans:
+                result["compaction"] = rebuild_index(collection)
+
+    result["elapsed_s"] = round(time.perf_counter() - start, 3)
+    logger.info(f"Garbage collection of '{collection}' found {len(orphans)} orphaned chunks (dry_run={dry_run})")
+    return result
@@ -0,0 +1,94 @@
+import time
+from typing import Iterable, List, Sequence, Tuple
+
+from fastmcp.server.middleware import Middleware, MiddlewareContext
+
+from mcp_server.server.tools.rag.collection_registry import get_collection_registry
+from mcp_server.server.tools.rag.ingestion.jobs import get_job_manager
+from mcp_server.server.tools.rag.ingestion.layout_chunking import get_token_count_cache_info
+from mcp_server.server.tools.rag.retrieval.reranker import get_rerank_cache_info
+from mcp_server.utils.metrics import get_metrics_registry
+
+metrics = get_metrics_registry()
+
+TOOL_CALLS = metrics.counter(
+    "mcp_tool_calls_total", "MCP tool calls by tool and outcome", ["tool", "status"]
+)
+TOOL_LATENCY = metrics.histogram(
+    "mcp_tool_duration_seconds", "MCP tool call latency", ["tool"]
+)
+RETRIEVAL_LATENCY = metrics.histogram(
+    "rag_retrieval_duration_seconds",
+    "retrieve_documents latency by collection, search mode and result cache outcome",
+    ["collection", "search_mode", "cache"]
+)
+
+
+class ToolMetricsMiddleware(Middleware):
+    """Counts every MCP tool call and records its latency."""
+
+    async def on_call_tool(self, context: MiddlewareContext, call_next):
+        tool = context.message.name
+        start = time.perf_counter()
+        status = "error"
+        try:
+            result = await call_next(context)
+            # Tools report failures in their result rather than raising
+            structured = getattr(result, "structured_content", None) or {}
+            status = "ok" if structured.get("success", True) else "failed"
+            return result
+        finally:
+            TOOL_CALLS.inc(tool=tool, status=status)
+            TOOL_LATENCY.observe(time.perf_counter() - start, tool=tool)
+
+
+def _cache_samples() -> List[Tuple[Sequence[str], dict]]:
+    caches = [(("rerank_scores",), get_rerank_cache_info()), (("token_counts",), get_token_count_cache_info())]
+    for name, info in get_collection_registry().info()["collections"].items():
+        if info["result_cache"] is not None:
+            caches.append(((f"results:{name}",), info["result_cache"]))
+    return caches
+
+
+def _collection_sizes() -> Iterable[Tuple[Sequence[str], float]]:
+    # Only resident collections, so a scrape never opens a collection
+    registry = get_collection_registry()
+    for name in registry.info()["resident"]:
+        handle = registry.peek(name)
+        if handle is None:
+            continue
+        try:
+            yield (name,), handle.vector_store._collection.count()
+        except Exception:
+            continue
+
+
+# Scrape-time samples
+metrics.callback(
+    "rag_cache_hits_total", "Cache hits by cache",
+    lambda: [(labels, info["hits"]) for labels, info in _cache_samples()], ["cache"], kind="counter"
+)
+metrics.callback(
+    "rag_cache_misses_total", "Cache misses by cache",
+    lambda: [(labels, info["misses"]) for labels, info in _cache_samples()], ["cache"], kind="counter"
+)
+metrics.callback(
+    "rag_cache_hit_ratio", "Cache hit ratio since start by cache",
+    lambda: [(labels, info["hit_ratio"]) for labels, info in _cache_samples()], ["cache"]
+)
+metrics.callback(
+    "rag_cache_entries", "Entries held by each cache",
+    lambda: [(labels, info["size"]) for labels, info in _cache_samples()], ["cache"]
+)
+metrics.callback(
+    "rag_vector_store_documents", "Chunks stored in each resident collection",
+    _collection_sizes, ["collection"]
+)
+metrics.callback(
+    "rag_resident_collections", "Collections currently open",
+    lambda: [((), len(get_collection_registry().info()["resident"]))]
+)
+metrics.callback(
+    "rag_ingest_jobs", "Background ingestion jobs by status",
+    lambda: [((status,), count) for status, count in get_job_manager().counts().items()], ["status"]
+)
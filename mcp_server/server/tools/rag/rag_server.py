@@ -1,28 +1,68 @@
-import chromadb
+import copy
+import time
 
 from fastmcp import FastMCP
+from fastmcp.server.dependencies import get_http_headers
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
 from typing import List, Optional, Literal
 from pathlib import Path
-from mcp_server.server.tools.rag.ingestion.pdf_loader import PDFLoader
-from mcp_server.server.tools.rag.ingestion.chunking import chunk_documents
-from mcp_server.server.tools.rag.ingestion.vector_store import get_or_create_vector_store
+from mcp_server.server.tools.rag.ingestion.pipeline import run_ingest, run_url_ingest
+from mcp_server.server.tools.rag.ingestion.jobs import get_job_manager
+from mcp_server.server.tools.rag.retrieval.reranker import rerank_documents
+from mcp_server.server.tools.rag.retrieval.response_shaping import shape_results
+from mcp_server.server.tools.rag.retrieval.search_modes import mmr_search, expand_context
+from mcp_server.server.tools.rag.ingestion.pdf_cache import get_pdf_cache
+from mcp_server.server.tools.rag.ingestion.page_cache import get_page_cache
+from mcp_server.server.tools.rag.collection_registry import (
+    get_collection_registry,
+    persistent_client,
+    validate_collection_name
+)
+from mcp_server.server.tools.rag.store_stats import get_store_stats as get_store_stats_record
+from mcp_server.server.tools.rag.snapshots import write_snapshot, restore_snapshot, restore_if_missing
+from mcp_server.server.tools.rag.reindex import reindex_collection
+from mcp_server.server.tools.rag.maintenance import delete_chunks, collect_garbage
+from mcp_server.server.tools.rag.metrics import RETRIEVAL_LATENCY, ToolMetricsMiddleware
+from mcp_server.server.tools.rag.warmup import readiness, start_warmup, mark_ready
+from mcp_server.utils.metrics import get_metrics_registry
 from mcp_server.utils.logger import get_logger
-from mcp_server.config.constants import VECTOR_DB_PATH, CHROMA_COLLECTION_NAME, CHUNK_SIZE, CHUNK_OVERLAP, TOP_K
+from mcp_server.utils.tracing import configure_tracing, extract_context, set_attributes, span
+from mcp_server.config.constants import CHROMA_COLLECTION_NAME, TOP_K, RERANK_CANDIDATE_MULTIPLIER, MMR_FETCH_MULTIPLIER, URL_FETCH_CONCURRENCY, RAG_WARMUP, RAG_SNAPSHOT_PATH, CACHE_PATH, DEDUP_ENABLED, BOILERPLATE_STRIP
 
 logger = get_logger(__name__)
 
 mcp = FastMCP(
     "RAG MCP",
     stateless_http=True)
+mcp.add_middleware(ToolMetricsMiddleware())
+
+
+@mcp.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+async def metrics_endpoint(request: Request) -> Response:
+    """Prometheus scrape endpoint."""
+    registry = get_metrics_registry()
+    return Response(registry.render(), media_type=registry.CONTENT_TYPE)
+
+
+@mcp.custom_route("/ready", methods=["GET"], include_in_schema=False)
+async def ready_endpoint(request: Request) -> JSONResponse:
+    """Readiness probe: 200 once the startup warmup has finished or given up (degraded), 503 before."""
+    return JSONResponse(readiness.to_dict(), status_code=200 if readiness.ready else 503)
+
 
 @mcp.tool()
 def ingest_documents(
     source: str,
     source_type: Literal["auto", "file", "directory", "url"] = "auto",
-    chunk_size: int = CHUNK_SIZE,
-    chunk_overlap: int = CHUNK_OVERLAP,
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    chunking_strategy: Literal["recursive", "structure"] = "recursive",
     update_mode: Literal["skip", "upsert"] = "skip",
-    enable_cache: bool = True
+    enable_cache: bool = True,
+    collection: str = CHROMA_COLLECTION_NAME,
+    deduplicate: bool = DEDUP_ENABLED,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
 ) -> dict:
     """
     Ingest PDF documents into the vector store from various sources.
@@ -30,58 +70,159 @@ def ingest_documents(
     Args:
         source: Path to file/directory or URL to PDF document(s)
         source_type: Type of source - "auto" (default), "file", "directory", or "url"
-        chunk_size: Size of text chunks for splitting (default: 1000)
-        chunk_overlap: Overlap between chunks (default: 200)
+        chunk_size: Size of text chunks for splitting (default: 1000 characters, or 300 tokens for "structure")
+        chunk_overlap: Overlap between chunks (default: 200 characters, or 40 tokens for "structure")
+        chunking_strategy: "recursive" (default) character splitter, or "structure" to follow
+            headings and sentence boundaries with token-based lengths
         update_mode: How to handle existing documents - "skip" (default) or "upsert"
         enable_cache: Enable caching for URL downloads (default: True)
+        collection: Name of the collection to ingest into (default: "mcp_collection")
+        deduplicate: Store one chunk per group of near-identical chunks, e.g. the same
+            regulation copied into several PDFs (default: False, or DEDUP_ENABLED)
+        strip_boilerplate: Remove running headers, footers and page numbers repeated
+            across the pages of each PDF before chunking (default: True)
     
     Returns:
-        Dictionary with ingestion statistics including number of documents processed
+        Dictionary with ingestion statistics including number of documents processed,
+        a "boilerplate" report of the header/footer characters stripped, a "dedup" report
+        of the duplicates removed and the embedding time saved, and a "profile" with
+        per-stage timings, throughput and peak memory
     """
     try:
-        logger.info(f"Starting document ingestion from: {source}")
-        
-        pdf_loader = PDFLoader(enable_cache=enable_cache)
-        documents = pdf_loader.load(source=source, source_type=source_type)
-        
-        if not documents:
-            return {
-                "success": False,
-                "error": "No documents were loaded",
-                "documents_loaded": 0
-            }
-        
-        logger.info(f"Loaded {len(documents)} pages from PDF(s)")
-        
-        text_chunks = chunk_documents(
-            documents=documents,
+        return run_ingest(
+            source=source,
+            source_type=source_type,
             chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
+            chunk_overlap=chunk_overlap,
+            chunking_strategy=chunking_strategy,
+            update_mode=update_mode,
+            enable_cache=enable_cache,
+            collection=collection,
+            deduplicate=deduplicate,
+            strip_boilerplate=strip_boilerplate
         )
         
-        logger.info(f"Created {len(text_chunks)} text chunks")
-        
-        vector_store = get_or_create_vector_store(
-            text_chunks=text_chunks,
-            update_mode=update_mode
+    except Exception as e:
+        logger.exception(f"Failed to ingest documents from {source}")
+        return {
+            "success": False,
+            "error": str(e),
+            "source": source
+        }
+
+
+@mcp.tool()
+def ingest_urls(
+    urls: List[str],
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    chunking_strategy: Literal["recursive", "structure"] = "recursive",
+    update_mode: Literal["skip", "upsert"] = "skip",
+    concurrency: int = URL_FETCH_CONCURRENCY,
+    collection: str = CHROMA_COLLECTION_NAME,
+    deduplicate: bool = DEDUP_ENABLED,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
+) -> dict:
+    """
+    Ingest several PDF URLs, downloading them concurrently.
+
+    Downloads are cached; cached PDFs are revalidated with ETag/Last-Modified,
+    and with update_mode="skip" unchanged PDFs already in the collection are
+    not parsed again.
+
+    Args:
+        urls: HTTP/HTTPS URLs of PDF documents
+        chunk_size: Size of text chunks for splitting (default: 1000 characters, or 300 tokens for "structure")
+        chunk_overlap: Overlap between chunks (default: 200 characters, or 40 tokens for "structure")
+        chunking_strategy: "recursive" (default) or "structure"
+        update_mode: How to handle existing documents - "skip" (default) or "upsert"
+        concurrency: Maximum number of downloads in flight (default: 8)
+        collection: Name of the collection to ingest into (default: "mcp_collection")
+        deduplicate: Store one chunk per group of near-identical chunks (default: False, or DEDUP_ENABLED)
+        strip_boilerplate: Remove running headers, footers and page numbers before chunking (default: True)
+
+    Returns:
+        Dictionary with ingestion statistics and a per-URL fetch report
+        (downloaded, not_modified or failed)
+    """
+    try:
+        return run_url_ingest(
+            urls=urls,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            chunking_strategy=chunking_strategy,
+            update_mode=update_mode,
+            concurrency=concurrency,
+            collection=collection,
+            deduplicate=deduplicate,
+            strip_boilerplate=strip_boilerplate
         )
-        
-        collection = vector_store._collection
-        total_docs = collection.count()
-        
+
+    except Exception as e:
+        logger.exception(f"Failed to ingest {len(urls)} URLs")
+        return {
+            "success": False,
+            "error": str(e),
+            "urls": urls
+        }
+
+
+@mcp.tool()
+def start_ingestion(
+    source: str,
+    source_type: Literal["auto", "file", "directory", "url"] = "auto",
+    chunk_size: Optional[int] = None,
+    chunk_overlap: Optional[int] = None,
+    chunking_strategy: Literal["recursive", "structure"] = "recursive",
+    update_mode: Literal["skip", "upsert"] = "skip",
+    enable_cache: bool = True,
+    collection: str = CHROMA_COLLECTION_NAME,
+    rebuild: bool = False,
+    deduplicate: bool = DEDUP_ENABLED,
+    strip_boilerplate: bool = BOILERPLATE_STRIP
+) -> dict:
+    """
+    Start ingesting PDF documents in the background and return immediately.
+
+    Takes the same arguments as ingest_documents. Poll get_ingestion_status
+    with the returned job ID for progress and the final result.
+
+    Args:
+        rebuild: Replace the collection's contents with `source` instead of
+            adding to it. The new contents are built in a separate collection
+            while retrieval keeps serving the current one, then swapped in
+            atomically; update_mode is ignored
+
+    Returns:
+        Dictionary with the job ID and its initial status
+    """
+    try:
+        validate_collection_name(collection)
+        params = dict(
+            source=source,
+            source_type=source_type,
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            chunking_strategy=chunking_strategy,
+            enable_cache=enable_cache,
+            collection=collection,
+            deduplicate=deduplicate,
+            strip_boilerplate=strip_boilerplate
+        )
+        if rebuild:
+            job = get_job_manager().submit(kind="rebuild", **params)
+        else:
+            job = get_job_manager().submit(update_mode=update_mode, **params)
         return {
             "success": True,
-            "source": source,
-            "source_type": source_type,
-            "pages_loaded": len(documents),
-            "chunks_created": len(text_chunks),
-            "total_documents_in_store": total_docs,
-            "update_mode": update_mode,
-            "message": f"Successfully ingested {len(documents)} pages into {len(text_chunks)} chunks"
+            "job_id": job.job_id,
+            "kind": job.kind,
+            "status": job.status,
+            "message": f"{'Rebuild of' if rebuild else 'Ingestion of'} {source} queued as job {job.job_id}"
         }
-        
+
     except Exception as e:
-        logger.exception(f"Failed to ingest documents from {source}")
+        logger.exception(f"Failed to start ingestion of {source}")
         return {
             "success": False,
             "error": str(e),
@@ -89,10 +230,83 @@ def ingest_documents(
         }
 
 
+@mcp.tool()
+def get_ingestion_status(job_id: Optional[str] = None) -> dict:
+    """
+    Report the progress of a background ingestion job, or list all jobs.
+
+    Args:
+        job_id: Job to report on; omit to list every known job without results
+
+    Returns:
+        Dictionary with the job status (queued, running, succeeded, failed or
+        cancelled), the current stage, per-stage done/total counts with
+        throughput, and the ingest result once finished
+    """
+    try:
+        manager = get_job_manager()
+        if job_id is None:
+            return {
+                "success": True,
+                "jobs": [job.to_dict(include_result=False) for job in manager.list()],
+                "counts": manager.counts()
+            }
+        return {"success": True, **manager.get(job_id).to_dict()}
+
+    except KeyError as e:
+        return {"success": False, "error": str(e.args[0]), "job_id": job_id}
+
+    except Exception as e:
+        logger.exception(f"Failed to get status of ingestion job {job_id}")
+        return {"success": False, "error": str(e), "job_id": job_id}
+
+
+@mcp.tool()
+def cancel_ingestion(job_id: str) -> dict:
+    """
+    Cancel a background ingestion job.
+
+    A queued job is cancelled immediately. A running job stops at its next
+    checkpoint (between files or embedding batches); nothing is written to
+    the collection unless it had already reached the write stage.
+
+    Args:
+        job_id: Job to cancel
+
+    Returns:
+        Dictionary with the job status after the request
+    """
+    try:
+        job = get_job_manager().cancel(job_id)
+        return {
+            "success": True,
+            "job_id": job_id,
+            "status": job.status,
+            "cancel_requested": job.progress.cancelled,
+            "message": f"Job already {job.status}" if job.finished and job.status != "cancelled"
+                       else "Cancellation requested"
+        }
+
+    except KeyError as e:
+        return {"success": False, "error": str(e.args[0]), "job_id": job_id}
+
+    except Exception as e:
+        logger.exception(f"Failed to cancel ingestion job {job_id}")
+        return {"success": False, "error": str(e), "job_id": job_id}
+
+
 @mcp.tool()
 def retrieve_documents(
     query: str,
-    top_k: int = TOP_K
+    top_k: int = TOP_K,
+    search_mode: Literal["similarity", "mmr", "expand"] = "similarity",
+    rerank: bool = False,
+    rerank_candidates: Optional[int] = None,
+    merge_adjacent: bool = False,
+    snippet_chars: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None,
+    collection: str = CHROMA_COLLECTION_NAME
 ) -> dict:
     """
     Retrieve relevant documents from the vector store based on a query.
@@ -100,112 +314,229 @@ def retrieve_documents(
     Args:
         query: Search query text
         top_k: Number of top results to return (default: 5)
+        search_mode: "similarity" (default), "mmr" to diversify near-duplicate hits, or
+            "expand" to also return the neighbouring chunks of each hit, merged into it
+        rerank: Rescore over-fetched candidates with a cross-encoder (default: False)
+        rerank_candidates: Number of candidates to rerank (default: 4 x top_k)
+        merge_adjacent: Merge consecutive chunks of the same page into one result (default: False)
+        snippet_chars: Return only a query-centred window of this many characters per result
+        max_chars: Maximum total characters of content returned across all results
+        max_tokens: Maximum total (estimated) tokens of content returned across all results
+        collection: Name of the collection to search (default: "mcp_collection")
     
     Returns:
         Dictionary containing relevant documents with their content, metadata, and scores
     """
-    try:
-        if not query or not query.strip():
-            return {
-                "success": False,
-                "error": "Query cannot be empty"
-            }
+    with span(
+        "retrieve_documents",
+        context=extract_context(get_http_headers()),
+        collection=collection,
+        top_k=top_k,
+        search_mode=search_mode,
+        rerank=rerank
+    ) as root:
+        try:
+            if not query or not query.strip():
+                return {
+                    "success": False,
+                    "error": "Query cannot be empty"
+                }
+
+            for name, value in (
+                ("top_k", top_k),
+                ("rerank_candidates", rerank_candidates),
+                ("snippet_chars", snippet_chars),
+                ("max_chars", max_chars),
+                ("max_tokens", max_tokens)
+            ):
+                if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value <= 0):
+                    return {
+                        "success": False,
+                        "error": f"{name} must be a positive integer, got {value!r}"
+                    }
         
-        logger.info(f"Retrieving documents for query: {query}")
+            logger.info(f"Retrieving documents from '{collection}' for query: {query}")
+            start = time.perf_counter()
         
-        # Load vector store
-        vector_store = get_or_create_vector_store()
+            registry = get_collection_registry()
+            with span("retrieve.open_collection"):
+                handle = registry.get(collection, must_exist=True)
+            vector_store = handle.vector_store
         
-        results = vector_store.similarity_search_with_score(
-            query=query,
-            k=top_k
-        )
+            cache_key = (
+                query, top_k, search_mode, rerank, rerank_candidates,
+                merge_adjacent, snippet_chars, max_chars, max_tokens
+            )
+            cached = handle.result_cache.get(cache_key)
+            set_attributes(root, cache_hit=cached is not None)
+            if cached is not None:
+                registry.record_query(collection, (time.perf_counter() - start) * 1000, cache_hit=True)
+                RETRIEVAL_LATENCY.observe(time.perf_counter() - start, collection=collection, search_mode=search_mode, cache="hit")
+                return {**copy.deepcopy(cached), "cached": True}
         
-        # Format results
-        retrieved_docs = []
-        for i, (doc, score) in enumerate(results, 1):
-            retrieved_docs.append({
-                "rank": i,
-                "content": doc.page_content,
-                "score": float(score),
-                "metadata": {
-                    "source": doc.metadata.get("source", "unknown"),
-                    "page": doc.metadata.get("page", "unknown"),
-                    "chunk_index": doc.metadata.get("chunk_index", "unknown")
-                }
-            })
+            fetch_k = top_k
+            if rerank:
+                fetch_k = max(rerank_candidates or top_k * RERANK_CANDIDATE_MULTIPLIER, top_k)
         
-        return {
-            "success": True,
-            "query": query,
-            "total_results": len(retrieved_docs),
-            "top_k": top_k,
-            "documents": retrieved_docs
-        }
+            with span("retrieve.embed_query"):
+                query_embedding = vector_store._embedding_function.embed_query(query)
+            
+            with span("retrieve.vector_search", fetch_k=fetch_k) as search_span:
+                if search_mode == "mmr":
+                    results = mmr_search(
+                        vector_store,
+                        query=query,
+                        k=fetch_k,
+                        fetch_k=fetch_k * MMR_FETCH_MULTIPLIER,
+                        query_embedding=query_embedding
+                    )
+                else:
+                    results = vector_store.similarity_search_by_vector_with_relevance_scores(
+                        embedding=query_embedding,
+                        k=fetch_k
+                    )
+                set_attributes(search_span, results=len(results))
         
-    except Exception as e:
-        logger.exception(f"Failed to retrieve documents for query: {query}")
-        return {
-            "success": False,
-            "error": str(e),
-            "query": query
-        }
+            rerank_stats = None
+            if rerank and results:
+                with span("retrieve.rerank", candidates=len(results)) as rerank_span:
+                    ranked, rerank_stats = rerank_documents(query, results, top_k, collection=collection)
+                    set_attributes(rerank_span, **rerank_stats)
+            else:
+                ranked = [(doc, score, None) for doc, score in results]
+        
+            # Each hit is followed by its neighbouring chunks, which share its score
+            neighbours = [[] for _ in ranked]
+            if search_mode == "expand" and ranked:
+                with span("retrieve.expand_context"):
+                    neighbours = expand_context(vector_store, [doc for doc, _, _ in ranked])
+                merge_adjacent = True
+        
+            # Format results
+            with span("retrieve.format"):
+                retrieved_docs = []
+                for (doc, score, rerank_score), context in zip(ranked, neighbours):
+                    for chunk in [doc] + context:
+                        retrieved_doc = {
+                            "rank": len(retrieved_docs) + 1,
+                            "content": chunk.page_content,
+                            "score": float(score),
+                            "metadata": {
+                                "source": chunk.metadata.get("source", "unknown"),
+                                "page": chunk.metadata.get("page", "unknown"),
+                                "chunk_index": chunk.metadata.get("chunk_index", "unknown")
+                            }
+                        }
+                        if chunk.metadata.get("duplicate_sources"):
+                            retrieved_doc["metadata"]["duplicate_sources"] = chunk.metadata["duplicate_sources"]
+                        if chunk is not doc:
+                            retrieved_doc["metadata"]["expanded_from"] = doc.metadata.get("chunk_index", "unknown")
+                        if rerank_score is not None:
+                            retrieved_doc["rerank_score"] = rerank_score
+                        retrieved_docs.append(retrieved_doc)
+        
+                shaping_stats = None
+                if merge_adjacent or snippet_chars or max_chars is not None or max_tokens is not None:
+                    retrieved_docs, shaping_stats = shape_results(
+                        retrieved_docs,
+                        query=query,
+                        merge_adjacent=merge_adjacent,
+                        snippet_chars=snippet_chars,
+                        max_chars=max_chars,
+                        max_tokens=max_tokens
+                    )
+        
+            response = {
+                "success": True,
+                "query": query,
+                "total_results": len(retrieved_docs),
+                "top_k": top_k,
+                "collection": collection,
+                "search_mode": search_mode,
+                "documents": retrieved_docs
+            }
+            if rerank_stats is not None:
+                response["rerank"] = rerank_stats
+            if shaping_stats is not None:
+                response["shaping"] = shaping_stats
+        
+            handle.result_cache.put(cache_key, copy.deepcopy(response))
+            registry.record_query(collection, (time.perf_counter() - start) * 1000, cache_hit=False)
+            RETRIEVAL_LATENCY.observe(time.perf_counter() - start, collection=collection, search_mode=search_mode, cache="miss")
+        
+            return response
+        
+        except Exception as e:
+            logger.exception(f"Failed to retrieve documents for query: {query}")
+            set_attributes(root, error=str(e))
+            return {
+                "success": False,
+                "error": str(e),
+                "query": query
+            }
 
 
 @mcp.tool()
 def get_vector_store_info(
-    query: Optional[str] = None
+    query: Optional[str] = None,
+    collection: str = CHROMA_COLLECTION_NAME
 ) -> dict:
     """
     Get detailed information about the vector store including statistics and configuration.
 
+    Statistics are read from the persisted store and its stats record, so
+    this never loads the embedding model.
+
     The 'query' parameter is optional and ignored. It exists so that
     LLMs can safely call this tool even if they pass query="...".
+    
+    Args:
+        collection: Name of the collection to describe (default: "mcp_collection")
     """
     try:
-        logger.info("Retrieving vector store information")
+        logger.info(f"Retrieving vector store information for collection '{collection}'")
         
-        db_path = Path(VECTOR_DB_PATH)
-        exists = db_path.exists()
+        registry = get_collection_registry()
+        store_stats = get_store_stats_record(registry.persist_directory)
+        exists = (Path(registry.persist_directory) / "chroma.sqlite3").exists()
         
         info = {
             "exists": exists,
-            "collection_name": CHROMA_COLLECTION_NAME,
-            "storage_path": VECTOR_DB_PATH,
+            "collection_name": collection,
+            "storage_path": registry.persist_directory,
         }
         
         if exists:
             try:
-                # Load vector store to get stats
-                vector_store = get_or_create_vector_store()
-                collection = vector_store._collection
-                
-                doc_count = collection.count()
-                
+                validate_collection_name(collection)
+                stats = store_stats.collection_stats(collection, physical=registry.resolve(collection))
                 info.update({
-                    "document_count": doc_count,
+                    "document_count": stats["document_count"],
+                    "source_count": stats["source_count"],
+                    "index_size_mb": stats["index_size_mb"],
+                    "last_ingest_at": stats["last_ingest_at"],
                     "status": "active"
                 })
-                
-                if doc_count > 0:
-                    sample_docs = collection.get(limit=1, include=["metadatas"])
-                    if sample_docs:
-                        metadatas = sample_docs.get("metadatas")
-                        if metadatas and len(metadatas) > 0:
-                            info["sample_metadata"] = metadatas[0]
+                if stats["sample_metadata"] is not None:
+                    info["sample_metadata"] = stats["sample_metadata"]
                 
             except Exception as e:
                 info.update({
                     "status": "error",
                     "error": str(e)
                 })
+            
+            info["collections"] = registry.list_collections()
+            info["store_size_mb"] = store_stats.store_size_mb()
+            info["registry"] = registry.info()
         else:
             info["status"] = "not_initialized"
         
-        # Get cache information
-        pdf_loader = PDFLoader()
-        cache_info = pdf_loader.get_cache_info()
-        info["cache"] = cache_info
+        info["cache"] = {
+            "enabled": True,
+            **get_pdf_cache(CACHE_PATH).stats(),
+            "page_cache": get_page_cache().stats()
+        }
         
         return {
             "success": True,
@@ -220,10 +551,52 @@ def get_vector_store_info(
         }
 
 
+@mcp.tool()
+def get_store_stats(
+    collection: str = CHROMA_COLLECTION_NAME,
+    refresh: bool = False
+) -> dict:
+    """
+    Get chunk counts per source, index size on disk and recent ingests for a collection.
+
+    Served from the persisted store without loading the embedding model.
+
+    Args:
+        collection: Name of the collection (default: "mcp_collection")
+        refresh: Recount chunks per source from the collection instead of the stats record
+
+    Returns:
+        Dictionary with the collection statistics
+    """
+    try:
+        validate_collection_name(collection)
+        registry = get_collection_registry()
+        store_stats = get_store_stats_record(registry.persist_directory)
+
+        if collection not in registry.list_collections():
+            return {
+                "success": False,
+                "error": f"Collection '{collection}' does not exist. Ingest documents into it first."
+            }
+
+        return {
+            "success": True,
+            "collection": collection,
+            **store_stats.collection_stats(collection, refresh=refresh, physical=registry.resolve(collection))
+        }
+
+    except Exception as e:
+        logger.exception("Failed to retrieve store statistics")
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
 
 @mcp.tool()
 def clear_vector_store(
-    confirm: bool = False
+    confirm: bool = False,
+    collection: str = CHROMA_COLLECTION_NAME
 ) -> dict:
     """
     Clear the vector store by removing the collection via ChromaDB API.
@@ -232,6 +605,7 @@ def clear_vector_store(
     
     Args:
         confirm: Must be set to True to confirm deletion (safety measure)
+        collection: Name of the collection to delete (default: "mcp_collection")
     
     Returns:
         Dictionary with deletion status and details
@@ -244,33 +618,43 @@ def clear_vector_store(
                 "warning": "This operation will permanently delete all documents in the vector store."
             }
         
-        logger.warning("Clearning vector store - this operation is irreversible")
+        validate_collection_name(collection)
+        logger.warning(f"Clearing collection '{collection}' - this operation is irreversible")
         
-        db_path = Path(VECTOR_DB_PATH)
+        registry = get_collection_registry()
+        db_path = Path(registry.persist_directory)
         deleted_items = []
         
         if db_path.exists():
             try:
-                # Use ChromaDB API to delete the collection 
-                client = chromadb.PersistentClient(path=str(db_path))
+                # Use ChromaDB API to count the live collection before deleting it
+                client = persistent_client(str(db_path))
                 
-                try:
-                    collection = client.get_collection(CHROMA_COLLECTION_NAME)
-                    doc_count = collection.count()
-                    deleted_items.append(f"vector_store ({doc_count} documents)")
-                except Exception:
-                    doc_count = 0
-                    deleted_items.append("vector_store")
+                with registry.write_lock(collection):
+                    try:
+                        doc_count = client.get_collection(registry.resolve(collection)).count()
+                        deleted_items.append(f"vector_store ({doc_count} documents)")
+                    except Exception:
+                        doc_count = 0
+                        deleted_items.append("vector_store")
+                    
+                    # The base collection and every rebuild generation, so no older copy can resolve later
+                    physical_deleted = registry.delete_collection(collection)
+                    if not physical_deleted:
+                        raise ValueError(f"Collection '{collection}' does not exist")
                 
-                client.delete_collection(CHROMA_COLLECTION_NAME)
-                logger.info(f"Deleted collection '{CHROMA_COLLECTION_NAME}'")     
+                store_stats = get_store_stats_record(registry.persist_directory)
+                for physical in {collection, *physical_deleted}:
+                    store_stats.forget(physical)
+                logger.info(f"Deleted collection '{collection}' ({', '.join(physical_deleted)})")
                 # Clean up client reference
                 del client
                 
                 return {
                     "success": True,
                     "deleted": deleted_items,
-                    "message": f"Successfully deleted vector store with {doc_count} documents"
+                    "physical_collections_deleted": physical_deleted,
+                    "message": f"Successfully deleted collection '{collection}' with {doc_count} documents"
                 }
                 
             except Exception as e:
@@ -295,5 +679,237 @@ def clear_vector_store(
         }
 
 
+@mcp.tool()
+def export_snapshot(
+    collection: str = CHROMA_COLLECTION_NAME,
+    path: Optional[str] = None,
+    precision: Literal["float32", "float16"] = "float32"
+) -> dict:
+    """
+    Export a collection's chunks and embeddings to a compressed snapshot file.
+
+    A snapshot lets another server load the collection with import_snapshot
+    instead of re-ingesting and re-embedding the corpus.
+
+    Args:
+        collection: Collection to export (default: "mcp_collection")
+        path: Output file; defaults to a timestamped file in the snapshot directory
+        precision: "float16" roughly halves the file at a negligible accuracy cost
+
+    Returns:
+        Dictionary with the snapshot path, size, chunk count and export time
+    """
+    try:
+        if collection not in get_collection_registry().list_collections():
+            return {
+                "success": False,
+                "error": f"Collection '{collection}' does not exist. Ingest documents into it first."
+            }
+        return {"success": True, **write_snapshot(collection=collection, path=path, precision=precision)}
+
+    except Exception as e:
+        logger.exception(f"Failed to export snapshot of '{collection}'")
+        return {
+            "success": False,
+            "error": str(e),
+            "collection": collection
+        }
+
+
+@mcp.tool()
+def import_snapshot(
+    path: str,
+    collection: Optional[str] = None
+) -> dict:
+    """
+    Load a snapshot written by export_snapshot without re-embedding anything.
+
+    An existing collection is replaced atomically: retrieval keeps serving it
+    until the snapshot is fully loaded.
+
+    Args:
+        path: Snapshot file to load
+        collection: Collection to load into; defaults to the one the snapshot was exported from
+
+    Returns:
+        Dictionary with the restored chunk count and load time
+    """
+    try:
+        if not Path(path).is_file():
+            return {
+                "success": False,
+                "error": f"Snapshot file does not exist: {path}"
+            }
+        return {"success": True, **restore_snapshot(path, collection=collection)}
+
+    except Exception as e:
+        logger.exception(f"Failed to import snapshot {path}")
+        return {
+            "success": False,
+            "error": str(e),
+            "path": path
+        }
+
+
+@mcp.tool()
+def configure_index(
+    collection: str = CHROMA_COLLECTION_NAME,
+    space: Optional[Literal["l2", "cosine", "ip"]] = None,
+    m: Optional[int] = None,
+    construction_ef: Optional[int] = None,
+    search_ef: Optional[int] = None
+) -> dict:
+    """
+    Change the HNSW index parameters of a collection.
+
+    The index is rebuilt from the stored vectors, without re-embedding, and
+    swapped in once ready, so retrieval is not interrupted. Use the
+    hnsw_sweep benchmark to choose values.
+
+    Args:
+        collection: Collection to reindex (default: "mcp_collection")
+        space: Distance function
+        m: Graph links per node; more improves recall at the cost of memory and build time
+        construction_ef: Candidate list size while building; more improves graph quality
+        search_ef: Candidate list size while querying; more improves recall at the cost of latency
+
+    Returns:
+        Dictionary with the previous and new index parameters
+    """
+    try:
+        if collection not in get_collection_registry().list_collections():
+            return {
+                "success": False,
+                "error": f"Collection '{collection}' does not exist. Ingest documents into it first."
+            }
+        return {
+            "success": True,
+            **reindex_collection(collection, space=space, m=m, construction_ef=construction_ef, search_ef=search_ef)
+        }
+
+    except Exception as e:
+        logger.exception(f"Failed to reconfigure the index of '{collection}'")
+        return {
+            "success": False,
+            "error": str(e),
+            "collection": collection
+        }
+
+
+@mcp.tool()
+def remove_documents(
+    collection: str = CHROMA_COLLECTION_NAME,
+    source: Optional[str] = None,
+    pattern: Optional[str] = None,
+    where: Optional[dict] = None,
+    dry_run: bool = False,
+    compact: bool = False
+) -> dict:
+    """
+    Remove chunks from a collection by source, source glob or metadata filter.
+
+    Use this when a document is withdrawn, instead of clearing the whole store.
+
+    Args:
+        collection: Collection to remove from (default: "mcp_collection")
+        source: Source path or file name, e.g. "syllabus_2023.pdf"
+        pattern: Glob on source paths and file names, e.g. "*_2023*.pdf"
+        where: Chroma metadata filter, e.g. {"section": "Annexes"}; combined with source/pattern if both are given
+        dry_run: Only report what would be removed
+        compact: Rebuild the index afterwards to free the space of removed vectors
+
+    Returns:
+        Dictionary with the matched sources, removed chunk count and space reclaimed
+    """
+    try:
+        if collection not in get_collection_registry().list_collections():
+            return {
+                "success": False,
+                "error": f"Collection '{collection}' does not exist."
+            }
+        return {
+            "success": True,
+            **delete_chunks(collection, source=source, pattern=pattern, where=where, dry_run=dry_run, compact=compact)
+        }
+
+    except Exception as e:
+        logger.exception(f"Failed to remove documents from '{collection}'")
+        return {
+            "success": False,
+            "error": str(e),
+            "collection": collection
+        }
+
+
+@mcp.tool()
+def compact_collection(
+    collection: str = CHROMA_COLLECTION_NAME,
+    dry_run: bool = False,
+    rebuild_index: bool = True
+) -> dict:
+    """
+    Delete orphaned chunks and compact the index of a collection.
+
+    A chunk is orphaned when the latest ingest of its source no longer
+    produced it, e.g. after a document was re-chunked into fewer chunks.
+
+    Args:
+        collection: Collection to clean up (default: "mcp_collection")
+        dry_run: Only report orphaned chunks
+        rebuild_index: Rebuild the index after deleting so the space of removed vectors is freed
+
+    Returns:
+        Dictionary with orphaned chunks per source, untracked sources and space reclaimed
+    """
+    try:
+        if collection not in get_collection_registry().list_collections():
+            return {
+                "success": False,
+                "error": f"Collection '{collection}' does not exist."
+            }
+        return {"success": True, **collect_garbage(collection, dry_run=dry_run, compact=rebuild_index)}
+
+    except Exception as e:
+        logger.exception(f"Failed to compact '{collection}'")
+        return {
+            "success": False,
+            "error": str(e),
+            "collection": collection
+        }
+
+
+@mcp.tool()
+def list_collections() -> dict:
+    """
+    List every collection in the vector store with its registry statistics.
+    
+    Returns:
+        Dictionary with collection names and per-collection query/cache statistics
+    """
+    try:
+        registry = get_collection_registry()
+        return {
+            "success": True,
+            "collections": registry.list_collections(),
+            "registry": registry.info()
+        }
+        
+    except Exception as e:
+        logger.exception("Failed to list collections")
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
 if __name__ == "__main__":
+    configure_tracing("rag-server")
+    # Replaced collections whose delayed deletion a previous run did not get to
+    get_collection_registry().sweep_pending_deletions()
+    if RAG_WARMUP:
+        start_warmup()
+    else:
+        if RAG_SNAPSHOT_PATH:
+            restore_if_missing(RAG_SNAPSHOT_PATH)
+        mark_ready()
     mcp.run(transport="streamable-http", host="0.0.0.0", port=3000)
\ No newline at end of file
@@ -0,0 +1,128 @@
+import time
+from typing import Optional
+
+from mcp_server.server.tools.rag.collection_registry import (
+    get_collection_registry,
+    persistent_client,
+    validate_collection_name
+)
+from mcp_server.server.tools.rag.store_stats import get_store_stats
+from mcp_server.server.tools.rag.ingestion.index_config import IndexConfig
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import SNAPSHOT_BATCH_SIZE, REBUILD_GC_GRACE_S
+
+logger = get_logger(__name__)
+
+
+def copy_records(source, target, batch_size: int = SNAPSHOT_BATCH_SIZE) -> int:
+    """Copy every record of one Chroma collection into another, embeddings included."""
+    copied = 0
+    for offset in range(0, source.count(), batch_size):
+        page = source.get(limit=batch_size, offset=offset, include=["documents", "metadatas", "embeddings"])
+        if not page["ids"]:
+            break
+        target.add(
+            ids=page["ids"],
+            documents=page["documents"],
+            metadatas=page["metadatas"],
+            embeddings=page["embeddings"]
+        )
+        copied += len(page["ids"])
+    return copied
+
+
+def reindex_collection(
+    collection: str,
+    space: Optional[str] = None,
+    m: Optional[int] = None,
+    construction_ef: Optional[int] = None,
+    search_ef: Optional[int] = None
+) -> dict:
+    """
+    Rebuild a collection's HNSW index with new parameters, without re-embedding.
+
+    The stored vectors are copied into a new physical collection created with
+    the new parameters, which is then swapped in like a rebuild, so queries
+    are served from the old index until the new one is ready. Parameters left
+    as None keep their current value. Ingests into the collection wait for
+    the copy to finish and are written to the new index.
+
+    Returns:
+        Dictionary with the previous and new index parameters and the copy time
+    """
+    validate_collection_name(collection)
+    start = time.perf_counter()
+
+    registry = get_collection_registry()
+    client = persistent_client(registry.persist_directory)
+    source = client.get_collection(registry.resolve(collection))
+
+    current = IndexConfig.from_collection(source)
+    wanted = current.with_changes(space=space, m=m, construction_ef=construction_ef, search_ef=search_ef)
+    if wanted == current:
+        return {
+            "collection": collection,
+            "changed": False,
+            "index_config": current.to_dict(),
+            "message": "Index already uses these parameters"
+        }
+
+    result = rebuild_index(collection, wanted)
+    elapsed_s = time.perf_counter() - start
+    return {
+        "collection": collection,
+        "changed": True,
+        "previous_index_config": current.to_dict(),
+        **result,
+        "elapsed_s": round(elapsed_s, 3),
+        "message": f"Rebuilt the index of '{collection}' ({result['chunks_copied']} chunks) in {elapsed_s:.2f}s"
+    }
+
+
+def rebuild_index(collection: str, config: Optional[IndexConfig] = None) -> dict:
+    """
+    Copy a collection's records into a freshly built index and swap it in.
+
+    Besides applying new parameters, this compacts the index: HNSW only marks
+    deleted vectors, so a collection that lost many chunks keeps their space
+    until its index is rebuilt. The replaced collection is deleted after
+    REBUILD_GC_GRACE_S. The collection's write lock is held throughout.
+
+    Args:
+        collection: Collection to rebuild
+        config: Parameters of the new index; defaults to the current ones
+
+    Returns:
+        Dictionary with the new index parameters, the copied chunk count and
+        the index size before and after
+    """
+    registry = get_collection_registry()
+    with registry.write_lock(collection):
+        store_stats = get_store_stats(registry.persist_directory)
+        client = persistent_client(registry.persist_directory)
+        source = client.get_collection(registry.resolve(collection))
+        config = config or IndexConfig.from_collection(source)
+        size_before = store_stats.index_size_mb(source.name)
+
+        physical = registry.generation_name(collection)
+        target = client.create_collection(physical, metadata={**(source.metadata or {}), **config.to_metadata()})
+        logger.info(f"Rebuilding the index of '{collection}' into '{physical}' with {config}")
+
+        try:
+            copied = copy_records(source, target)
+        except BaseException:
+            registry.delete_physical(physical)
+            raise
+
+        previous = registry.swap(collection, physical)
+        if previous is not None:
+            registry.delete_later(previous, REBUILD_GC_GRACE_S)
+
+        logger.info(f"Copied {copied} chunks of '{collection}' into a new index")
+        return {
+            "index_config": IndexConfig.from_collection(target).to_dict(),
+            "chunks_copied": copied,
+            "physical_collection": physical,
+            "index_mb_before": size_before,
+            "index_mb_after": store_stats.index_size_mb(physical)
+        }
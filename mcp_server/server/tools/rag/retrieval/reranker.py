@@ -0,0 +1,153 @@
+import hashlib
+import threading
+import time
+from typing import List, Optional, Tuple
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion.vector_store import get_chunk_id
+from mcp_server.utils.logger import get_logger
+from mcp_server.utils.custom_exception import CustomException
+from mcp_server.utils.lru_cache import LRUCache
+from mcp_server.config.constants import (
+    RERANK_MODEL,
+    RERANK_BATCH_SIZE,
+    RERANK_MAX_LENGTH,
+    RERANK_TIME_BUDGET_MS,
+    RERANK_CACHE_SIZE
+)
+
+logger = get_logger(__name__)
+
+_reranker_model = None
+_reranker_model_lock = threading.Lock()
+
+# Cross-encoder scores keyed by (query, collection, chunk_id, content digest)
+_score_cache = LRUCache(RERANK_CACHE_SIZE)
+
+
+def get_reranker_model():
+
+    global _reranker_model
+
+    if _reranker_model:
+        return _reranker_model
+
+    with _reranker_model_lock:
+        if _reranker_model:
+            return _reranker_model
+        return _load_reranker_model()
+
+
+def _load_reranker_model():
+
+    global _reranker_model
+
+    try:
+        from sentence_transformers import CrossEncoder
+
+        logger.info("Initializing reranker model for the first time...")
+        _reranker_model = CrossEncoder(
+            RERANK_MODEL,
+            max_length=RERANK_MAX_LENGTH,
+            device="cpu"
+        )
+        logger.info("Reranker model loaded successfully.")
+        return _reranker_model
+
+    except Exception as e:
+        error_message = CustomException("Error occurred while loading reranker model", e)
+        logger.error(str(error_message))
+        raise error_message
+
+
+def rerank_documents(
+    query: str,
+    candidates: List[Tuple[Document, float]],
+    top_k: int,
+    batch_size: int = RERANK_BATCH_SIZE,
+    time_budget_ms: Optional[float] = RERANK_TIME_BUDGET_MS,
+    collection: str = ""
+) -> Tuple[List[Tuple[Document, float, Optional[float]]], dict]:
+    """
+    Rescore bi-encoder candidates with a cross-encoder and keep the best `top_k`.
+
+    Candidates are scored in batches, in their original order, until the time
+    budget is spent. Candidates left unscored keep their bi-encoder order and
+    are ranked after every scored candidate.
+
+    Args:
+        query: Search query text
+        candidates: (document, distance) pairs from the vector store, best first
+        top_k: Number of results to keep
+        batch_size: Number of (query, chunk) pairs per cross-encoder call
+        time_budget_ms: Latency budget for scoring, None for no limit
+        collection: Collection the candidates come from, part of the cache key
+
+    Returns:
+        Tuple of the reranked (document, distance, rerank_score) triples and
+        a dictionary of reranking statistics
+    """
+    start = time.perf_counter()
+
+    # Chunk IDs are positional, so a re-chunked source reuses them for new text
+    cache_keys = [
+        (query, collection, get_chunk_id(doc), hashlib.sha1(doc.page_content.encode("utf-8")).hexdigest())
+        for doc, _ in candidates
+    ]
+    scores: List[Optional[float]] = [None] * len(candidates)
+
+    pending = []
+    for i, key in enumerate(cache_keys):
+        cached = _score_cache.get(key)
+        if cached is None:
+            pending.append(i)
+        else:
+            scores[i] = cached
+    cache_hits = len(candidates) - len(pending)
+
+    budget_exhausted = False
+    if pending:
+        model = get_reranker_model()
+
+        for batch_start in range(0, len(pending), batch_size):
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if time_budget_ms is not None and batch_start > 0 and elapsed_ms >= time_budget_ms:
+                budget_exhausted = True
+                logger.warning(
+                    f"Rerank budget of {time_budget_ms}ms exhausted after "
+                    f"{batch_start}/{len(pending)} uncached candidates"
+                )
+                break
+
+            batch = pending[batch_start:batch_start + batch_size]
+            pairs = [(query, candidates[i][0].page_content) for i in batch]
+            batch_scores = model.predict(pairs, batch_size=len(pairs), show_progress_bar=False)
+
+            for i, score in zip(batch, batch_scores):
+                scores[i] = float(score)
+                _score_cache.put(cache_keys[i], float(score))
+
+    scored = [i for i, score in enumerate(scores) if score is not None]
+    unscored = [i for i, score in enumerate(scores) if score is None]
+    scored.sort(key=lambda i: scores[i], reverse=True)
+
+    reranked = [
+        (candidates[i][0], candidates[i][1], scores[i])
+        for i in scored + unscored
+    ][:top_k]
+
+    stats = {
+        "candidates": len(candidates),
+        "cache_hits": cache_hits,
+        "scored": len(scored) - cache_hits,
+        "unscored": len(unscored),
+        "budget_exhausted": budget_exhausted,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 2)
+    }
+    logger.info(f"Reranked {len(candidates)} candidates: {stats}")
+    return reranked, stats
+
+
+def get_rerank_cache_info() -> dict:
+    """Return statistics about the cross-encoder score cache."""
+    return _score_cache.stats()
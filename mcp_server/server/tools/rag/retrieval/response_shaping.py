@@ -0,0 +1,236 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import CHUNK_OVERLAP, CHARS_PER_TOKEN, MIN_TRUNCATED_CHARS
+
+logger = get_logger(__name__)
+
+_TERM_RE = re.compile(r"\w{3,}")
+ELLIPSIS = "…"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for prompt budgets."""
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def _overlap_length(left: str, right: str, max_overlap: int) -> int:
+    """Length of the longest suffix of `left` that is also a prefix of `right`."""
+    for k in range(min(len(left), len(right), max_overlap), 0, -1):
+        if left.endswith(right[:k]):
+            return k
+    return 0
+
+
+def _merge_key(doc: Dict) -> Tuple[str, object]:
+    metadata = doc["metadata"]
+    return str(metadata.get("source")), metadata.get("page")
+
+
+def merge_adjacent_chunks(documents: List[Dict], max_overlap: int = CHUNK_OVERLAP * 2) -> Tuple[List[Dict], int]:
+    """
+    Merge results that are consecutive chunks of the same source page.
+
+    Overlapping text shared by two consecutive chunks is kept only once.
+    A merged result takes the best rank and score of its parts.
+
+    Args:
+        documents: Formatted retrieval results, best first
+        max_overlap: Longest overlap (in characters) searched for between chunks
+
+    Returns:
+        Tuple of the merged results, best first, and the number of merges done
+    """
+    groups: Dict[Tuple[str, object], List[Dict]] = {}
+    for doc in documents:
+        if isinstance(doc["metadata"].get("chunk_index"), int):
+            groups.setdefault(_merge_key(doc), []).append(doc)
+
+    replacement: Dict[int, Dict] = {}
+    merges = 0
+
+    for group in groups.values():
+        group.sort(key=lambda d: d["metadata"]["chunk_index"])
+
+        runs = [[group[0]]]
+        for doc in group[1:]:
+            if doc["metadata"]["chunk_index"] == runs[-1][-1]["metadata"]["chunk_index"] + 1:
+                runs[-1].append(doc)
+            else:
+                runs.append([doc])
+
+        for run in runs:
+            if len(run) == 1:
+                continue
+            merged = run[0]
+            for doc in run[1:]:
+                merged = _merge_pair(merged, doc, max_overlap)
+                merges += 1
+            for doc in run:
+                replacement[id(doc)] = merged
+
+    result, seen = [], set()
+    for doc in documents:
+        target = replacement.get(id(doc), doc)
+        if id(target) not in seen:
+            seen.add(id(target))
+            result.append(target)
+
+    result.sort(key=lambda d: d["rank"])
+    return result, merges
+
+
+def _merge_pair(left: Dict, right: Dict, max_overlap: int) -> Dict:
+    overlap = _overlap_length(left["content"], right["content"], max_overlap)
+    separator = "" if overlap else " "
+
+    indices = left["metadata"].get("chunk_indices", [left["metadata"]["chunk_index"]])
+    merged = {
+        **left,
+        "rank": min(left["rank"], right["rank"]),
+        "content": left["content"] + separator + right["content"][overlap:],
+        "score": min(left["score"], right["score"]),
+        "metadata": {**left["metadata"], "chunk_indices": indices + [right["metadata"]["chunk_index"]]}
+    }
+    # A run that contains an actual hit is not itself an expansion
+    if "expanded_from" not in right["metadata"]:
+        merged["metadata"].pop("expanded_from", None)
+    if "rerank_score" in left or "rerank_score" in right:
+        merged["rerank_score"] = max(
+            left.get("rerank_score", float("-inf")),
+            right.get("rerank_score", float("-inf"))
+        )
+    return merged
+
+
+def extract_snippet(content: str, query: str, window_chars: int) -> str:
+    """
+    Return the `window_chars` window of `content` holding the most distinct query terms.
+
+    Args:
+        content: Full chunk text
+        query: Search query text
+        window_chars: Size of the snippet window in characters
+
+    Returns:
+        The snippet, with an ellipsis on each side where text was cut
+    """
+    if len(content) <= window_chars:
+        return content
+
+    terms = {t.lower() for t in _TERM_RE.findall(query)}
+    hits = [
+        (match.start(), match.group().lower())
+        for match in _TERM_RE.finditer(content)
+        if match.group().lower() in terms
+    ]
+
+    best_start, best_score = 0, 0
+    for i, (position, _) in enumerate(hits):
+        start = max(0, position - window_chars // 4)
+        window_terms = {term for pos, term in hits[i:] if pos < start + window_chars}
+        if len(window_terms) > best_score:
+            best_start, best_score = start, len(window_terms)
+
+    start = min(best_start, len(content) - window_chars)
+    end = start + window_chars
+
+    # Snap to word boundaries so words are never cut in half
+    if start > 0:
+        space = content.find(" ", start)
+        start = space + 1 if 0 <= space < end else start
+    if end < len(content):
+        space = content.rfind(" ", start, end)
+        end = space if space > start else end
+
+    snippet = content[start:end].strip()
+    prefix = ELLIPSIS if start > 0 else ""
+    suffix = ELLIPSIS if end < len(content) else ""
+    return f"{prefix}{snippet}{suffix}"
+
+
+def apply_budget(
+    documents: List[Dict],
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None
+) -> Tuple[List[Dict], int, bool]:
+    """
+    Keep results, best first, until the character or token budget is spent.
+
+    The first result that does not fit is truncated if enough budget is left,
+    otherwise it and every result after it are dropped.
+
+    Returns:
+        Tuple of the kept results, the number dropped, and whether one was truncated
+    """
+    limits = []
+    if max_chars is not None:
+        limits.append(max_chars)
+    if max_tokens is not None:
+        limits.append(max_tokens * CHARS_PER_TOKEN)
+    if not limits:
+        return documents, 0, False
+
+    remaining = min(limits)
+    kept, truncated = [], False
+
+    for doc in documents:
+        length = len(doc["content"])
+        if length <= remaining:
+            kept.append(doc)
+            remaining -= length
+            continue
+
+        if remaining >= MIN_TRUNCATED_CHARS:
+            cut = doc["content"].rfind(" ", 0, remaining - len(ELLIPSIS))
+            cut = cut if cut > 0 else remaining - len(ELLIPSIS)
+            kept.append({**doc, "content": doc["content"][:cut] + ELLIPSIS})
+            truncated = True
+        break
+
+    return kept, len(documents) - len(kept), truncated
+
+
+def shape_results(
+    documents: List[Dict],
+    query: str,
+    merge_adjacent: bool = False,
+    snippet_chars: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    max_tokens: Optional[int] = None
+) -> Tuple[List[Dict], dict]:
+    """
+    Apply chunk merging, snippet extraction and the size budget, in that order.
+
+    Returns:
+        Tuple of the shaped results, re-ranked from 1, and shaping statistics
+    """
+    original_chars = sum(len(doc["content"]) for doc in documents)
+    merges = 0
+
+    if merge_adjacent:
+        documents, merges = merge_adjacent_chunks(documents)
+
+    if snippet_chars:
+        documents = [
+            {**doc, "content": extract_snippet(doc["content"], query, snippet_chars)}
+            for doc in documents
+        ]
+
+    documents, dropped, truncated = apply_budget(documents, max_chars, max_tokens)
+
+    for rank, doc in enumerate(documents, 1):
+        doc["rank"] = rank
+
+    returned_chars = sum(len(doc["content"]) for doc in documents)
+    stats = {
+        "original_chars": original_chars,
+        "returned_chars": returned_chars,
+        "estimated_tokens": sum(estimate_tokens(doc["content"]) for doc in documents),
+        "merged_chunks": merges,
+        "dropped_results": dropped,
+        "truncated": truncated
+    }
+    logger.info(f"Shaped retrieval payload: {stats}")
+    return documents, stats
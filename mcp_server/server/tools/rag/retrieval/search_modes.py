@@ -0,0 +1,169 @@
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+import numpy as np
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion.vector_store import generate_document_id, get_chunk_id
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import MMR_LAMBDA, CONTEXT_EXPANSION_WINDOW
+
+if TYPE_CHECKING:
+    from langchain_community.vectorstores import Chroma
+
+logger = get_logger(__name__)
+
+
+def maximal_marginal_relevance(
+    query_embedding: np.ndarray,
+    embeddings: np.ndarray,
+    k: int,
+    lambda_mult: float = MMR_LAMBDA
+) -> List[int]:
+    """
+    Select `k` row indices of `embeddings` balancing query relevance and diversity.
+
+    Args:
+        query_embedding: Query vector, shape (dim,)
+        embeddings: Candidate vectors, shape (n, dim)
+        k: Number of indices to select
+        lambda_mult: 1.0 ranks by relevance only, 0.0 by diversity only
+
+    Returns:
+        Selected row indices, in selection order
+    """
+    if len(embeddings) == 0 or k <= 0:
+        return []
+
+    query = query_embedding / (np.linalg.norm(query_embedding) or 1.0)
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    candidates = embeddings / np.where(norms == 0, 1.0, norms)
+
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    selected = [int(np.argmax(relevance))]
+    # Highest similarity of each candidate to anything already selected
+    redundancy = pairwise[selected[0]].copy()
+
+    while len(selected) < min(k, len(candidates)):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        redundancy = np.maximum(redundancy, pairwise[best])
+
+    return selected
+
+
+def mmr_search(
+    vector_store: "Chroma",
+    query: str,
+    k: int,
+    fetch_k: int,
+    lambda_mult: float = MMR_LAMBDA,
+    query_embedding: Optional[List[float]] = None
+) -> List[Tuple[Document, float]]:
+    """
+    Fetch `fetch_k` nearest chunks with their stored embeddings and keep `k` diverse ones.
+
+    `query_embedding` may be passed when the caller has already embedded `query`.
+
+    Returns:
+        (document, distance) pairs in MMR selection order
+    """
+    if query_embedding is None:
+        query_embedding = vector_store._embedding_function.embed_query(query)
+
+    results = vector_store._collection.query(
+        query_embeddings=[query_embedding],
+        n_results=fetch_k,
+        include=["documents", "metadatas", "distances", "embeddings"]
+    )
+
+    ids = results["ids"][0]
+    if not ids:
+        return []
+
+    embeddings = np.asarray(results["embeddings"][0], dtype=np.float32)
+    selected = maximal_marginal_relevance(
+        np.asarray(query_embedding, dtype=np.float32),
+        embeddings,
+        k=k,
+        lambda_mult=lambda_mult
+    )
+
+    logger.info(f"MMR selected {len(selected)} of {len(ids)} candidates (lambda={lambda_mult})")
+    return [
+        (
+            Document(
+                page_content=results["documents"][0][i],
+                metadata=results["metadatas"][0][i] or {}
+            ),
+            float(results["distances"][0][i])
+        )
+        for i in selected
+    ]
+
+
+def expand_context(
+    vector_store: "Chroma",
+    hits: List[Document],
+    window: int = CONTEXT_EXPANSION_WINDOW
+) -> List[List[Document]]:
+    """
+    Fetch the chunks around each hit (chunk_index +/- window) in a single batch.
+
+    Neighbour IDs are derived the same way ingestion derives them, trying the
+    hit's own page and the pages on either side, since a neighbouring chunk
+    can start a new page. IDs that do not exist are simply not returned.
+
+    Args:
+        vector_store: Chroma vector store
+        hits: Retrieved documents to expand
+        window: Number of neighbouring chunks to fetch on each side
+
+    Returns:
+        For each hit, its neighbours sorted by chunk_index, excluding any
+        chunk that is itself a hit
+    """
+    hit_ids = {get_chunk_id(doc) for doc in hits}
+    wanted: dict = {}
+
+    for position, doc in enumerate(hits):
+        page = doc.metadata.get("page")
+        chunk_index = doc.metadata.get("chunk_index")
+        if not isinstance(page, int) or not isinstance(chunk_index, int):
+            continue
+
+        for offset in range(-window, window + 1):
+            if offset == 0 or chunk_index + offset < 0:
+                continue
+            for neighbour_page in (page - 1, page, page + 1):
+                neighbour_id = generate_document_id(Document(
+                    page_content="",
+                    metadata={
+                        "source": doc.metadata.get("source", ""),
+                        "page": neighbour_page,
+                        "chunk_index": chunk_index + offset
+                    }
+                ))
+                if neighbour_id not in hit_ids:
+                    wanted.setdefault(neighbour_id, position)
+
+    neighbours: List[List[Document]] = [[] for _ in hits]
+    if not wanted:
+        return neighbours
+
+    fetched = vector_store._collection.get(
+        ids=list(wanted),
+        include=["documents", "metadatas"]
+    )
+
+    for doc_id, text, metadata in zip(fetched["ids"], fetched["documents"], fetched["metadatas"]):
+        neighbours[wanted[doc_id]].append(Document(page_content=text, metadata=metadata or {}))
+
+    for group in neighbours:
+        group.sort(key=lambda d: d.metadata.get("chunk_index", 0))
+
+    logger.info(f"Context expansion fetched {len(fetched['ids'])} neighbouring chunks for {len(hits)} hits")
+    return neighbours
@@ -0,0 +1,235 @@
+import io
+import json
+import os
+import time
+import zipfile
+from importlib import metadata
+from pathlib import Path
+from typing import Literal, Optional
+
+import numpy as np
+
+from mcp_server.server.tools.rag.collection_registry import (
+    get_collection_registry,
+    persistent_client,
+    validate_collection_name
+)
+from mcp_server.server.tools.rag.store_stats import get_store_stats
+from mcp_server.server.tools.rag.ingestion.index_config import IndexConfig
+from mcp_server.server.tools.rag.ingestion.dedup import shared_sources
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import (
+    CHROMA_COLLECTION_NAME,
+    EMBED_MODEL,
+    SNAPSHOT_PATH,
+    SNAPSHOT_FORMAT_VERSION,
+    SNAPSHOT_BATCH_SIZE,
+    REBUILD_GC_GRACE_S
+)
+
+logger = get_logger(__name__)
+
+Precision = Literal["float32", "float16"]
+
+_MANIFEST = "manifest.json"
+_RECORDS = "records.jsonl"
+_EMBEDDINGS = "embeddings.npy"
+
+
+def _chromadb_version() -> str:
+    try:
+        return metadata.version("chromadb")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def write_snapshot(
+    collection: str = CHROMA_COLLECTION_NAME,
+    path: Optional[str] = None,
+    precision: Precision = "float32"
+) -> dict:
+    """
+    Write a collection's IDs, texts, metadata and embeddings to a snapshot file.
+
+    A snapshot is a deflate-compressed zip holding a JSON manifest (format
+    version, embedding model, dimension, count, collection metadata), the
+    records as JSON lines and the embeddings as one .npy matrix in record
+    order. The collection metadata recorded in the manifest includes the HNSW
+    parameters, so a restored collection is indexed the same way. Reading
+    goes through a bare Chroma client, so the embedding model is not loaded.
+
+    Args:
+        collection: Collection to export
+        path: Output file; defaults to SNAPSHOT_PATH/<collection>-<timestamp>.zip
+        precision: Stored embedding precision; float16 halves the embedding
+            size at a cosine error around 1e-4
+
+    Returns:
+        Dictionary describing the written snapshot
+    """
+    validate_collection_name(collection)
+    if precision not in ("float32", "float16"):
+        raise ValueError(f"Invalid precision '{precision}'. Supported values are 'float32' and 'float16'.")
+
+    start = time.perf_counter()
+    registry = get_collection_registry()
+    client = persistent_client(registry.persist_directory)
+    source = client.get_collection(registry.resolve(collection))
+    count = source.count()
+
+    records, blocks = [], []
+    for offset in range(0, count, SNAPSHOT_BATCH_SIZE):
+        page = source.get(
+            limit=SNAPSHOT_BATCH_SIZE,
+            offset=offset,
+            include=["documents", "metadatas", "embeddings"]
+        )
+        records.extend(
+            {"id": doc_id, "document": text, "metadata": meta}
+            for doc_id, text, meta in zip(page["ids"], page["documents"], page["metadatas"])
+        )
+        blocks.append(np.asarray(page["embeddings"], dtype=np.float32))
+
+    embeddings = np.concatenate(blocks) if blocks else np.zeros((0, 0), dtype=np.float32)
+    manifest = {
+        "format_version": SNAPSHOT_FORMAT_VERSION,
+        "collection": collection,
+        "embed_model": EMBED_MODEL,
+        "count": len(records),
+        "dimension": int(embeddings.shape[1]) if len(records) else 0,
+        "precision": precision,
+        # Index parameters as built, including a search_ef changed since creation
+        "collection_metadata": {**(source.metadata or {}), **IndexConfig.from_collection(source).to_metadata()},
+        "chromadb_version": _chromadb_version(),
+        "created_at": time.time()
+    }
+
+    path = Path(path) if path else Path(SNAPSHOT_PATH) / f"{collection}-{time.strftime('%Y%m%d-%H%M%S')}.zip"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".part")
+
+    with zipfile.ZipFile(tmp_path, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr(_MANIFEST, json.dumps(manifest, indent=2))
+        archive.writestr(_RECORDS, "\n".join(json.dumps(r, ensure_ascii=False) for r in records))
+        buffer = io.BytesIO()
+        np.save(buffer, embeddings.astype(precision))
+        archive.writestr(_EMBEDDINGS, buffer.getvalue())
+    os.replace(tmp_path, path)
+
+    elapsed_s = time.perf_counter() - start
+    logger.info(f"Exported {len(records)} chunks of '{collection}' to {path} in {elapsed_s:.2f}s")
+    return {
+        "path": str(path),
+        "size_mb": round(path.stat().st_size / 1e6, 3),
+        "elapsed_s": round(elapsed_s, 3),
+        **{k: manifest[k] for k in ("collection", "count", "dimension", "precision", "embed_model")}
+    }
+
+
+def read_manifest(path: str) -> dict:
+    """The manifest of a snapshot file, validated against this server's format and embedding model."""
+    with zipfile.ZipFile(path) as archive:
+        manifest = json.loads(archive.read(_MANIFEST))
+
+    if manifest.get("format_version") != SNAPSHOT_FORMAT_VERSION:
+        raise ValueError(
+            f"Snapshot format version {manifest.get('format_version')} is not supported "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+    if manifest.get("embed_model") != EMBED_MODEL:
+        # Query embeddings would not be comparable with the stored ones
+        raise ValueError(
+            f"Snapshot was built with embedding model '{manifest.get('embed_model')}' "
+            f"but this server uses '{EMBED_MODEL}'"
+        )
+    return manifest
+
+
+def restore_snapshot(path: str, collection: Optional[str] = None) -> dict:
+    """
+    Bulk-load a snapshot into a collection without re-embedding anything.
+
+    The snapshot is loaded into a new physical collection and swapped in the
+    same way as a rebuild, so restoring over a live collection does not
+    interrupt retrieval. The replaced collection is deleted after
+    REBUILD_GC_GRACE_S, and ingests into the collection wait for the restore.
+
+    Args:
+        path: Snapshot file written by write_snapshot
+        collection: Collection to restore into; defaults to the exported one
+
+    Returns:
+        Dictionary describing the restored collection
+    """
+    start = time.perf_counter()
+    manifest = read_manifest(path)
+    collection = validate_collection_name(collection or manifest["collection"])
+
+    registry = get_collection_registry()
+    store_stats = get_store_stats(registry.persist_directory)
+    client = persistent_client(registry.persist_directory)
+    with registry.write_lock(collection):
+        physical = registry.generation_name(collection)
+        target = client.create_collection(physical, metadata=manifest["collection_metadata"])
+
+        try:
+            with zipfile.ZipFile(path) as archive:
+                with archive.open(_EMBEDDINGS) as f:
+                    embeddings = np.load(f).astype(np.float32)
+                records = [json.loads(line) for line in archive.read(_RECORDS).decode("utf-8").splitlines() if line]
+
+            if len(records) != len(embeddings) or len(records) != manifest["count"]:
+                raise ValueError(
+                    f"Snapshot is inconsistent: {len(records)} records, {len(embeddings)} embeddings, "
+                    f"manifest count {manifest['count']}"
+                )
+
+            batch_size = client.get_max_batch_size()
+            for batch_start in range(0, len(records), batch_size):
+                batch = records[batch_start:batch_start + batch_size]
+                target.add(
+                    ids=[r["id"] for r in batch],
+                    documents=[r["document"] for r in batch],
+                    metadatas=[r["metadata"] for r in batch],
+                    embeddings=embeddings[batch_start:batch_start + batch_size]
+                )
+        except BaseException:
+            registry.delete_physical(physical)
+            raise
+
+        load_s = time.perf_counter() - start
+        existing = {c if isinstance(c, str) else c.name for c in client.list_collections()}
+        previous = registry.swap(collection, physical)
+        if previous is not None and previous in existing:
+            registry.delete_later(previous, REBUILD_GC_GRACE_S)
+
+        sources = store_stats.recount_sources(collection, target)
+        ids_by_source: dict = {}
+        for record in records:
+            for source in shared_sources(record["metadata"]) or [(record["metadata"] or {}).get("source", "unknown")]:
+                ids_by_source.setdefault(source, []).append(record["id"])
+        store_stats.record_chunk_ids(collection, ids_by_source, replace=True)
+
+    elapsed_s = time.perf_counter() - start
+    result = {
+        "collection": collection,
+        "physical_collection": physical,
+        "replaced_collection": previous if previous in existing else None,
+        "chunks_created": len(records),
+        "total_documents_in_store": target.count(),
+        "update_mode": "snapshot",
+        "source_count": len(sources),
+        "load_s": round(load_s, 3),
+        "elapsed_s": round(elapsed_s, 3)
+    }
+    store_stats.record_ingest(collection, f"snapshot:{Path(path).name}", result, elapsed_s)
+    logger.info(f"Restored {len(records)} chunks from {path} into '{collection}' in {elapsed_s:.2f}s")
+    return result
+
+
+def restore_if_missing(path: str, collection: str = CHROMA_COLLECTION_NAME) -> Optional[dict]:
+    """Restore `path` into `collection` unless the collection already exists, e.g. at replica startup."""
+    if collection in get_collection_registry().list_collections():
+        logger.info(f"Collection '{collection}' already exists; not restoring snapshot {path}")
+        return None
+    return restore_snapshot(path, collection=collection)
@@ -0,0 +1,304 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from mcp_server.server.tools.rag.ingestion.index_config import IndexConfig
+from mcp_server.utils.logger import get_logger
+from mcp_server.config.constants import VECTOR_DB_PATH, STORE_STATS_FILE, STORE_STATS_HISTORY
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_chunks (
+    collection TEXT NOT NULL,
+    source     TEXT NOT NULL,
+    chunks     INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (collection, source)
+);
+CREATE TABLE IF NOT EXISTS ingests (
+    id              INTEGER PRIMARY KEY AUTOINCREMENT,
+    collection      TEXT NOT NULL,
+    source          TEXT,
+    finished_at     REAL NOT NULL,
+    pages           INTEGER,
+    chunks_created  INTEGER,
+    documents_after INTEGER,
+    duration_s      REAL,
+    update_mode     TEXT,
+    strategy        TEXT
+);
+CREATE INDEX IF NOT EXISTS ingests_collection ON ingests (collection, finished_at);
+CREATE TABLE IF NOT EXISTS latest_chunk_ids (
+    collection  TEXT NOT NULL,
+    source      TEXT NOT NULL,
+    ids         TEXT NOT NULL,
+    ingested_at REAL NOT NULL,
+    PRIMARY KEY (collection, source)
+);
+"""
+
+# Version 1 keys source_chunks by the full source path instead of the file name
+_SCHEMA_VERSION = 1
+
+
+def _dir_size(path: Path) -> int:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) if path.is_dir() else 0
+
+
+def _display_names(counts: Dict[str, int]) -> Dict[str, int]:
+    """Key per-source counts by file name, keeping the full path where two sources share a name."""
+    names = Counter(Path(source).name for source in counts)
+    return {
+        Path(source).name if names[Path(source).name] == 1 else source: chunks
+        for source, chunks in counts.items()
+    }
+
+
+class StoreStats:
+    """
+    Vector store statistics that never load the embedding model.
+
+    Counts come from a bare Chroma persistent client, so opening a
+    collection does not need an embedding function. Per-source chunk counts
+    and the ingest history live in a small SQLite record next to the Chroma
+    database, maintained at ingest time, so reading them does not scan the
+    collection. Collections ingested before the record existed are counted
+    once from their metadata and stored. The record also keeps the chunk IDs
+    produced by the latest ingest of each source, which garbage collection
+    uses to find orphaned chunks.
+    """
+
+    def __init__(self, persist_directory: str = VECTOR_DB_PATH):
+        self.persist_directory = Path(persist_directory)
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.persist_directory.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(
+                self.persist_directory / STORE_STATS_FILE,
+                timeout=30,
+                check_same_thread=False,
+                isolation_level=None
+            )
+            self._conn.executescript(_SCHEMA)
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                # Counts keyed by file name cannot be mapped back to paths; they are recounted on next read
+                self._conn.execute("DELETE FROM source_chunks")
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        return self._conn
+
+    def _client(self):
+        import chromadb
+
+        # Chroma shares one system per path, so this is cheap after the first call
+        return chromadb.PersistentClient(path=str(self.persist_directory))
+
+    def collection_stats(self, collection: str, refresh: bool = False, physical: Optional[str] = None) -> dict:
+        """
+        Statistics for one collection.
+
+        Args:
+            collection: Collection name
+            refresh: Recount per-source chunks from the collection metadata
+            physical: Chroma collection serving `collection`, if aliased
+
+        Returns:
+            Document count, per-source chunk counts keyed by file name (or by
+            path where two sources share a name), index size on disk and
+            HNSW parameters, a sample metadata record and the recent ingest history
+        """
+        chroma_collection = self._client().get_collection(physical or collection)
+        count = chroma_collection.count()
+
+        with self._lock:
+            sources = self._source_counts(collection)
+        if refresh or (count and not sources):
+            sources = self.recount_sources(collection, chroma_collection)
+
+        sample = chroma_collection.get(limit=1, include=["metadatas"]).get("metadatas") if count else None
+        history = self.ingest_history(collection)
+
+        return {
+            "document_count": count,
+            "source_count": len(sources),
+            "sources": _display_names(sources),
+            "index_size_mb": round(self._index_bytes(str(chroma_collection.id)) / 1e6, 3),
+            "index_config": IndexConfig.from_collection(chroma_collection).to_dict(),
+            "sample_metadata": sample[0] if sample else None,
+            "last_ingest_at": history[0]["finished_at"] if history else None,
+            "ingests": history
+        }
+
+    def store_size_mb(self) -> float:
+        return round(_dir_size(self.persist_directory) / 1e6, 3)
+
+    def recount_sources(self, collection: str, chroma_collection=None) -> Dict[str, int]:
+        """Count chunks per source path from the collection metadata and store the result."""
+        chroma_collection = chroma_collection or self._client().get_collection(collection)
+        metadatas = chroma_collection.get(include=["metadatas"])["metadatas"] or []
+        counts = Counter(str((m or {}).get("source", "unknown")) for m in metadatas)
+
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            db.execute("DELETE FROM source_chunks WHERE collection = ?", (collection,))
+            db.executemany(
+                "INSERT INTO source_chunks VALUES (?, ?, ?, ?)",
+                [(collection, source, chunks, time.time()) for source, chunks in counts.items()]
+            )
+            db.execute("COMMIT")
+        return dict(sorted(counts.items()))
+
+    def update_sources(self, collection: str, chroma_collection, sources: Iterable[str]) -> None:
+        """
+        Refresh the chunk counts of `sources` after an ingest.
+
+        Only the ingested sources are counted, with one metadata-filtered
+        lookup each, so the cost grows with the ingest rather than the store.
+        """
+        rows = []
+        for source in set(sources):
+            chunks = len(chroma_collection.get(where={"source": source}, include=[])["ids"])
+            rows.append((collection, source, chunks, time.time()))
+
+        with self._lock:
+            db = self._db()
+            db.executemany(
+                """
+                INSERT INTO source_chunks VALUES (?, ?, ?, ?)
+                ON CONFLICT (collection, source) DO UPDATE SET
+                    chunks = excluded.chunks, updated_at = excluded.updated_at
+                """,
+                rows
+            )
+            db.execute("DELETE FROM source_chunks WHERE collection = ? AND chunks = 0", (collection,))
+
+    def record_chunk_ids(self, collection: str, ids_by_source: Dict[str, List[str]], replace: bool = False) -> None:
+        """
+        Remember the chunk IDs the latest ingest produced for each of its sources.
+
+        With `replace`, sources not in `ids_by_source` are forgotten, e.g.
+        when the whole collection was just loaded from a snapshot.
+        """
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            if replace:
+                db.execute("DELETE FROM latest_chunk_ids WHERE collection = ?", (collection,))
+            db.executemany(
+                """
+                INSERT INTO latest_chunk_ids VALUES (?, ?, ?, ?)
+                ON CONFLICT (collection, source) DO UPDATE SET
+                    ids = excluded.ids, ingested_at = excluded.ingested_at
+                """,
+                [(collection, source, json.dumps(sorted(ids)), time.time()) for source, ids in ids_by_source.items()]
+            )
+            db.execute("COMMIT")
+
+    def chunk_ids(self, collection: str) -> Dict[str, set]:
+        """Chunk IDs produced by the latest ingest of each source, keyed by the source as stored in metadata."""
+        with self._lock:
+            rows = self._db().execute(
+                "SELECT source, ids FROM latest_chunk_ids WHERE collection = ?", (collection,)
+            ).fetchall()
+        return {source: set(json.loads(ids)) for source, ids in rows}
+
+    def forget_sources(self, collection: str, sources: Iterable[str]) -> None:
+        """Drop the latest-ingest record of sources that were removed from `collection`."""
+        with self._lock:
+            self._db().executemany(
+                "DELETE FROM latest_chunk_ids WHERE collection = ? AND source = ?",
+                [(collection, source) for source in set(sources)]
+            )
+
+    def record_ingest(self, collection: str, source: Optional[str], result: dict, duration_s: float) -> None:
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO ingests (collection, source, finished_at, pages, chunks_created, documents_after, "
+                "duration_s, update_mode, strategy) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    collection,
+                    source,
+                    time.time(),
+                    result.get("pages_loaded"),
+                    result.get("chunks_created"),
+                    result.get("total_documents_in_store"),
+                    round(duration_s, 3),
+                    result.get("update_mode"),
+                    result.get("chunking_strategy")
+                )
+            )
+
+    def ingest_history(self, collection: str, limit: int = STORE_STATS_HISTORY) -> List[dict]:
+        with self._lock:
+            cursor = self._db().execute(
+                "SELECT source, finished_at, pages, chunks_created, documents_after, duration_s, update_mode, strategy "
+                "FROM ingests WHERE collection = ? ORDER BY finished_at DESC LIMIT ?",
+                (collection, limit)
+            )
+            columns = [c[0] for c in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def promote(self, shadow: str, collection: str) -> None:
+        """Make the chunk counts and IDs of a rebuilt `shadow` collection those of `collection`, and merge their history."""
+        with self._lock:
+            db = self._db()
+            db.execute("BEGIN")
+            db.execute("DELETE FROM source_chunks WHERE collection = ?", (collection,))
+            db.execute("UPDATE source_chunks SET collection = ? WHERE collection = ?", (collection, shadow))
+            db.execute("UPDATE ingests SET collection = ? WHERE collection = ?", (collection, shadow))
+            db.execute("DELETE FROM latest_chunk_ids WHERE collection = ?", (collection,))
+            db.execute("UPDATE latest_chunk_ids SET collection = ? WHERE collection = ?", (collection, shadow))
+            db.execute("COMMIT")
+
+    def forget(self, collection: str) -> None:
+        """Drop the record of a deleted collection."""
+        with self._lock:
+            db = self._db()
+            db.execute("DELETE FROM source_chunks WHERE collection = ?", (collection,))
+            db.execute("DELETE FROM ingests WHERE collection = ?", (collection,))
+            db.execute("DELETE FROM latest_chunk_ids WHERE collection = ?", (collection,))
+
+    def index_size_mb(self, physical: str) -> float:
+        """On-disk size of a physical collection's HNSW index."""
+        return round(self._index_bytes(str(self._client().get_collection(physical).id)) / 1e6, 3)
+
+    def _source_counts(self, collection: str) -> Dict[str, int]:
+        rows = self._db().execute(
+            "SELECT source, chunks FROM source_chunks WHERE collection = ? AND chunks > 0 ORDER BY source",
+            (collection,)
+        ).fetchall()
+        return dict(rows)
+
+    def _index_bytes(self, collection_id: str) -> int:
+        """On-disk size of the collection's vector segment (the HNSW index files)."""
+        try:
+            uri = f"file:{self.persist_directory / 'chroma.sqlite3'}?mode=ro"
+            with sqlite3.connect(uri, uri=True) as chroma_db:
+                segments = chroma_db.execute(
+                    "SELECT id FROM segments WHERE collection = ? AND scope = 'VECTOR'", (collection_id,)
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Could not read Chroma segments: {e}")
+            return 0
+        return sum(_dir_size(self.persist_directory / segment_id) for (segment_id,) in segments)
+
+
+_stats: Dict[str, StoreStats] = {}
+_stats_lock = threading.Lock()
+
+
+def get_store_stats(persist_directory: str = VECTOR_DB_PATH) -> StoreStats:
+    """Shared StoreStats for `persist_directory`."""
+    key = str(Path(persist_directory).resolve())
+    with _stats_lock:
+        if key not in _stats:
+            _stats[key] = StoreStats(persist_directory)
+        return _stats[key]
@@ -0,0 +1,153 @@
+import threading
+import time
+from typing import Optional
+
+from mcp_server.server.tools.rag.collection_registry import get_collection_registry
+from mcp_server.server.tools.rag.ingestion.embeddings import get_embedding_model
+from mcp_server.utils.logger import get_logger
+from mcp_server.utils.profiling import StageProfiler
+from mcp_server.config.constants import (
+    CHROMA_COLLECTION_NAME,
+    RAG_WARMUP_RERANK,
+    RAG_SNAPSHOT_PATH,
+    WARMUP_QUERY,
+    WARMUP_MAX_ATTEMPTS,
+    WARMUP_RETRY_BASE_S,
+    WARMUP_RETRY_MAX_S
+)
+
+logger = get_logger(__name__)
+
+
+class Readiness:
+    """
+    Warmup state reported by the /ready endpoint.
+
+    "degraded" means every warmup attempt failed: the server still serves,
+    loading models and collections on the first request that needs them.
+    """
+
+    def __init__(self):
+        self.status = "starting"
+        self.profile: dict = {}
+        self.error: Optional[str] = None
+        self.attempts = 0
+        self._created = time.perf_counter()
+        self.ready_after_s: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.status in ("ready", "degraded")
+
+    def to_dict(self) -> dict:
+        return {
+            "status": self.status,
+            "ready_after_s": self.ready_after_s,
+            "warmup": self.profile,
+            "attempts": self.attempts,
+            "error": self.error
+        }
+
+
+readiness = Readiness()
+
+
+def run_warmup(
+    collection: str = CHROMA_COLLECTION_NAME,
+    rerank: bool = RAG_WARMUP_RERANK,
+    query: str = WARMUP_QUERY,
+    snapshot: str = RAG_SNAPSHOT_PATH
+) -> dict:
+    """
+    Load everything the first retrieval would otherwise pay for.
+
+    Loads the embedding model, restores `snapshot` into `collection` if the
+    collection does not exist yet, opens it and runs one query against it so
+    the HNSW index is loaded. The query bypasses retrieve_documents, so it
+    neither fills the result cache nor counts in the collection statistics.
+
+    Args:
+        collection: Collection to open and query
+        rerank: Also load the cross-encoder and score one pair
+        query: Warmup query text
+        snapshot: Snapshot file to restore from, empty for none
+
+    Returns:
+        Seconds spent in each warmup stage
+    """
+    profiler = StageProfiler()
+
+    with profiler.stage("embedding_model"):
+        embeddings = get_embedding_model()
+
+    with profiler.stage("embed_query"):
+        query_embedding = embeddings.embed_query(query)
+
+    if snapshot:
+        from mcp_server.server.tools.rag.snapshots import restore_if_missing
+
+        with profiler.stage("restore_snapshot"):
+            restore_if_missing(snapshot, collection=collection)
+
+    registry = get_collection_registry()
+    if collection in registry.list_collections():
+        with profiler.stage("open_collection"):
+            vector_store = registry.get(collection).vector_store
+        with profiler.stage("vector_search"):
+            vector_store.similarity_search_by_vector(query_embedding, k=1)
+    else:
+        logger.info(f"Collection '{collection}' does not exist yet; skipping collection warmup")
+
+    if rerank:
+        from mcp_server.server.tools.rag.retrieval.reranker import get_reranker_model
+
+        with profiler.stage("reranker"):
+            get_reranker_model().predict([(query, query)], show_progress_bar=False)
+
+    return {**profiler.to_dict(), "total_s": round(profiler.total_s, 3)}
+
+
+def start_warmup(
+    collection: str = CHROMA_COLLECTION_NAME,
+    rerank: bool = RAG_WARMUP_RERANK,
+    max_attempts: int = WARMUP_MAX_ATTEMPTS,
+    retry_base_s: float = WARMUP_RETRY_BASE_S
+) -> threading.Thread:
+    """
+    Run the warmup in a background thread, updating `readiness` as it goes.
+
+    A failed warmup, e.g. a network hiccup while the embedding model is first
+    downloaded, is retried with exponential backoff. Once `max_attempts` have
+    failed the server reports ready but degraded rather than never ready.
+    """
+
+    def target():
+        readiness.status = "warming"
+        for attempt in range(1, max(1, max_attempts) + 1):
+            readiness.attempts = attempt
+            try:
+                readiness.profile = run_warmup(collection=collection, rerank=rerank)
+                readiness.status = "ready"
+                readiness.error = None
+                logger.info(f"Warmup complete: {readiness.profile}")
+                break
+            except Exception as e:
+                readiness.error = str(e)
+                logger.exception(f"Warmup attempt {attempt}/{max_attempts} failed")
+                if attempt >= max_attempts:
+                    readiness.status = "degraded"
+                    logger.warning("Giving up on warmup; serving without it")
+                    break
+                readiness.status = "retrying"
+                time.sleep(min(WARMUP_RETRY_MAX_S, retry_base_s * 2 ** (attempt - 1)))
+        readiness.ready_after_s = round(time.perf_counter() - readiness._created, 3)
+
+    thread = threading.Thread(target=target, name="rag-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def mark_ready() -> None:
+    """Report ready without warming up, e.g. when RAG_WARMUP is disabled."""
+    readiness.status = "ready"
+    readiness.ready_after_s = round(time.perf_counter() - readiness._created, 3)
@@ -0,0 +1,125 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+def current_rss_mb() -> float:
+    """Current resident set size of this process in MB, or the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    # ru_maxrss is in bytes on macOS and KB elsewhere
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1e6 if sys.platform == "darwin" else peak / 1e3
+
+
+class RSSSampler:
+    """
+    Background thread sampling RSS, to report the peak over a block of work
+    rather than the whole life of the process.
+    """
+
+    def __init__(self, interval_s: float = 0.05):
+        self.interval_s = interval_s
+        self.start_mb = 0.0
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval_s):
+            self.peak_mb = max(self.peak_mb, current_rss_mb())
+
+    def __enter__(self) -> "RSSSampler":
+        self.start_mb = self.peak_mb = current_rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.end_mb = current_rss_mb()
+        self.peak_mb = max(self.peak_mb, self.end_mb)
+
+
+class StageProfiler:
+    """Wall-clock time per named stage; repeated stages accumulate."""
+
+    def __init__(self):
+        self.stages: Dict[str, float] = {}
+        self.order: List[str] = []
+        self._start = time.perf_counter()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, seconds: float) -> None:
+        if name not in self.stages:
+            self.stages[name] = 0.0
+            self.order.append(name)
+        self.stages[name] += seconds
+
+    @property
+    def total_s(self) -> float:
+        return time.perf_counter() - self._start
+
+    def to_dict(self) -> Dict[str, float]:
+        return {f"{name}_s": round(self.stages[name], 3) for name in self.order}
+
+
+class TimedEmbeddings(Embeddings):
+    """
+    Embeddings wrapper that accumulates the time spent in embed_documents.
+
+    With `batch_size` set, texts are embedded in batches of that size and
+    `on_batch(done, total)` is called after each one; it may raise to stop
+    the embedding part way through.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        batch_size: Optional[int] = None,
+        on_batch: Optional[Callable[[int, int], None]] = None
+    ):
+        self.embeddings = embeddings
+        self.batch_size = batch_size
+        self.on_batch = on_batch
+        self.seconds = 0.0
+        self.texts = 0
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        step = self.batch_size or max(1, len(texts))
+        vectors: List[List[float]] = []
+
+        for offset in range(0, len(texts), step):
+            batch = texts[offset:offset + step]
+            start = time.perf_counter()
+            try:
+                vectors.extend(self.embeddings.embed_documents(batch))
+            finally:
+                self.seconds += time.perf_counter() - start
+                self.texts += len(batch)
+            if self.on_batch:
+                self.on_batch(len(vectors), len(texts))
+
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embeddings.embed_query(text)
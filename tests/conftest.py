@@ -0,0 +1,14 @@
+import pytest
+from langchain_core.embeddings import DeterministicFakeEmbedding
+
+from mcp_server.server.tools.rag import collection_registry
+from mcp_server.server.tools.rag.ingestion import embeddings
+
+
+@pytest.fixture
+def registry(tmp_path, monkeypatch):
+    """A collection registry over a scratch persist directory, embedding with a fake model."""
+    monkeypatch.setattr(embeddings, "_embedding_model", DeterministicFakeEmbedding(size=16))
+    fresh = collection_registry.CollectionRegistry(persist_directory=str(tmp_path / "chroma"))
+    monkeypatch.setattr(collection_registry, "_registry", fresh)
+    return fresh
@@ -0,0 +1,44 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from agent import agent_client
+from agent.agent_client import Agent_Client
+
+
+class FakeMCPClient:
+    created = 0
+
+    def __init__(self, servers):
+        FakeMCPClient.created += 1
+
+    async def get_tools(self):
+        await asyncio.sleep(0.01)
+        return []
+
+
+class FakeGraph:
+    async def ainvoke(self, state, config):
+        return {"messages": [*state["messages"], AIMessage(content="ok")]}
+
+
+def test_concurrent_asks_initialize_once(monkeypatch):
+    FakeMCPClient.created = 0
+    graphs = []
+
+    def build_graph(*args, **kwargs):
+        graphs.append(FakeGraph())
+        return graphs[-1]
+
+    monkeypatch.setattr(agent_client, "MultiServerMCPClient", FakeMCPClient)
+    monkeypatch.setattr(agent_client, "build_graph", build_graph)
+    client = Agent_Client(mcp_url="http://rag.invalid/mcp")
+
+    async def run():
+        return await asyncio.gather(*(
+            client.ask([HumanMessage(content=f"q{i}")], thread_id=f"t{i}", raise_errors=True) for i in range(5)
+        ))
+
+    assert asyncio.run(run()) == ["ok"] * 5
+    assert FakeMCPClient.created == 1
+    assert len(graphs) == 1 and client.agent is graphs[0]
@@ -0,0 +1,60 @@
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion.boilerplate import boilerplate_mask, strip_boilerplate
+
+# Body lines differ by letters, since digits are masked before lines are compared
+NAMES = ["Alpha", "Bravo", "Charlie", "Delta", "Echo", "Foxtrot"]
+
+
+def _page(number, body):
+    return ["ACME Corp - Annual Report 2023", "", *body, f"Page {number} of 5", "Confidential"]
+
+
+def test_running_headers_and_footers_are_flagged():
+    pages = [_page(n, [f"{NAMES[n]} paragraph", "More text"]) for n in range(1, 6)]
+
+    mask = boilerplate_mask(pages, edge_lines=2, min_page_share=0.5, min_pages=3)
+
+    for lines, page_mask in zip(pages, mask):
+        flagged = [line for line, drop in zip(lines, page_mask) if drop]
+        assert flagged == [lines[0], lines[-2], lines[-1]]
+
+
+def test_repeated_body_lines_are_kept():
+    # "More text" is on every page, but never within two lines of an edge
+    pages = [[f"{name} title", f"{name} intro", "More text", f"{name} details", f"{name} end"] for name in NAMES]
+
+    mask = boilerplate_mask(pages, edge_lines=2, min_page_share=0.5, min_pages=3)
+
+    assert not any(any(page_mask) for page_mask in mask)
+
+
+def test_short_documents_are_left_alone():
+    pages = [_page(n, ["Body"]) for n in range(1, 3)]
+
+    mask = boilerplate_mask(pages, edge_lines=2, min_page_share=0.5, min_pages=3)
+
+    assert mask == [[False] * len(lines) for lines in pages]
+
+
+def test_lines_on_too_few_pages_are_kept():
+    pages = [[f"{name} header", "Body", f"{name} footer"] for name in NAMES]
+    pages[0][0] = pages[1][0] = "Chapter one"
+
+    mask = boilerplate_mask(pages, edge_lines=1, min_page_share=0.5, min_pages=3)
+
+    assert not any(any(page_mask) for page_mask in mask)
+
+
+def test_strip_judges_each_source_on_its_own_pages():
+    documents = [
+        Document(page_content="\n".join(_page(n, [f"{NAMES[n]} body"])), metadata={"source": "a.pdf", "page": n})
+        for n in range(1, 6)
+    ] + [Document(page_content="ACME Corp - Annual Report 2023\nOne-page memo", metadata={"source": "b.pdf"})]
+
+    documents, stats = strip_boilerplate(documents)
+
+    assert documents[0].page_content.split("\n") == ["", "Bravo body"]
+    assert documents[-1].page_content == "ACME Corp - Annual Report 2023\nOne-page memo"
+    assert stats["sources"] == 2 and stats["sources_stripped"] == 1
+    assert stats["lines_removed"] == 15
@@ -0,0 +1,139 @@
+import threading
+import time
+
+import chromadb
+import pytest
+
+from mcp_server.server.tools.rag import collection_registry
+from mcp_server.server.tools.rag.collection_registry import CollectionRegistry, validate_collection_name
+
+
+def _create(registry, physical, count=2):
+    client = chromadb.PersistentClient(path=registry.persist_directory)
+    client.create_collection(physical).add(
+        ids=[f"{physical}-{i}" for i in range(count)],
+        documents=[f"chunk {i} of {physical}" for i in range(count)],
+        embeddings=[[float(i + 1)] * 16 for i in range(count)]
+    )
+
+
+def _physical(registry):
+    return registry._physical_collections()
+
+
+def test_swap_points_the_name_at_the_new_collection(registry):
+    _create(registry, "docs")
+    generation = registry.generation_name("docs")
+    _create(registry, generation, count=3)
+
+    assert registry.swap("docs", generation) == "docs"
+
+    assert registry.resolve("docs") == generation
+    assert registry.list_collections() == ["docs"]
+    assert registry.get("docs").vector_store._collection.count() == 3
+    # A new registry reads the alias back from disk
+    assert CollectionRegistry(persist_directory=registry.persist_directory).resolve("docs") == generation
+
+
+def test_delete_collection_removes_every_generation(registry):
+    _create(registry, "docs")
+    generation = registry.generation_name("docs")
+    _create(registry, generation)
+    previous = registry.swap("docs", generation)
+    registry.delete_later(previous, 3600)
+
+    deleted = registry.delete_collection("docs")
+
+    assert sorted(deleted) == sorted(["docs", generation])
+    assert _physical(registry) == set()
+    assert registry.resolve("docs") == "docs"
+    assert registry.list_collections() == []
+    assert CollectionRegistry(persist_directory=registry.persist_directory)._load_aliases() == {}
+
+
+def test_pending_deletion_survives_a_restart(registry, monkeypatch):
+    _create(registry, "docs")
+    generation = registry.generation_name("docs")
+    _create(registry, generation)
+    registry.delete_later(registry.swap("docs", generation), 3600)
+
+    restarted = CollectionRegistry(persist_directory=registry.persist_directory)
+    assert restarted.sweep_pending_deletions() == []
+    assert "docs" in _physical(restarted)
+
+    now = time.time()
+    monkeypatch.setattr(collection_registry.time, "time", lambda: now + 7200)
+    assert restarted.sweep_pending_deletions() == ["docs"]
+    assert _physical(restarted) == {generation}
+    assert restarted.resolve("docs") == generation
+
+
+def test_collect_generations_keeps_live_and_recent_ones(registry):
+    now_ms = int(time.time() * 1000)
+    old = f"docs--gen{collection_registry._base36(now_ms - 3_600_000)}"
+    live = f"docs--gen{collection_registry._base36(now_ms - 1_800_000)}"
+    recent = f"docs--gen{collection_registry._base36(now_ms)}"
+    for physical in (old, live, recent):
+        _create(registry, physical)
+    registry.swap("docs", live)
+
+    assert registry.collect_generations("docs", grace_s=60) == [old]
+    assert _physical(registry) == {live, recent}
+
+
+def test_generation_names_of_the_longest_name_are_valid(registry):
+    longest = "a" * collection_registry._MAX_LOGICAL_NAME_LEN
+
+    generation = registry.generation_name(validate_collection_name(longest))
+
+    assert len(generation) <= 63
+    assert collection_registry._GENERATION_RE.match(generation).group("name") == longest
+    with pytest.raises(ValueError):
+        validate_collection_name(longest + "a")
+
+
+def test_clear_leaves_nothing_to_fall_back_to(registry):
+    from mcp_server.server.tools.rag import rag_server
+
+    _create(registry, "docs")
+    generation = registry.generation_name("docs")
+    _create(registry, generation)
+    registry.delete_later(registry.swap("docs", generation), 3600)
+
+    result = rag_server.clear_vector_store.fn(confirm=True, collection="docs")
+
+    assert result["success"], result
+    assert _physical(registry) == set()
+    assert "docs" not in registry.list_collections()
+
+
+def test_a_slow_open_does_not_block_other_collections(registry, monkeypatch):
+    _create(registry, "fast")
+    _create(registry, "slow")
+    registry.get("fast")
+    opening, release = threading.Event(), threading.Event()
+    open_collection = registry._open
+    opens = []
+
+    def slow_open(name, physical):
+        opens.append(name)
+        if name == "slow":
+            opening.set()
+            release.wait(timeout=10)
+        return open_collection(name, physical)
+
+    monkeypatch.setattr(registry, "_open", slow_open)
+    waiters = [threading.Thread(target=registry.get, args=("slow",)) for _ in range(3)]
+    for waiter in waiters:
+        waiter.start()
+    assert opening.wait(timeout=10)
+
+    started = time.monotonic()
+    assert registry.get("fast").name == "fast"
+    assert time.monotonic() - started < 1
+
+    release.set()
+    for waiter in waiters:
+        waiter.join(timeout=10)
+    assert opens == ["slow"]
+    assert registry.stats_for("slow").opens == 1
@@ -0,0 +1,47 @@
+import json
+
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion.dedup import deduplicate_chunks, group_near_duplicates
+
+PASSAGE = (
+    "Article 12 of the regulation requires every operator to keep a register of incidents, "
+    "to report each one to the authority within thirty days and to retain the register for five years"
+)
+
+
+def test_near_duplicates_are_grouped():
+    texts = [PASSAGE, "Budget figures for the second quarter of the year", PASSAGE.replace("five", "5")]
+
+    groups, _ = group_near_duplicates(texts, threshold=0.7)
+
+    assert groups == [[0, 2]]
+
+
+def test_distinct_texts_are_not_grouped():
+    texts = [PASSAGE, "Budget figures for the second quarter of the year", "Minutes of the board meeting in May"]
+
+    assert group_near_duplicates(texts)[0] == []
+
+
+def test_texts_without_words_are_never_grouped():
+    texts = ["", "  \n ", "---", "...", PASSAGE]
+
+    assert group_near_duplicates(texts)[0] == []
+    assert group_near_duplicates(["", "--"]) == ([], 0)
+
+
+def test_kept_chunk_lists_every_source_it_stands_for():
+    chunks = [
+        Document(page_content=PASSAGE, metadata={"source": "/data/a.pdf", "page": 1}),
+        Document(page_content=PASSAGE + " exactly", metadata={"source": "/data/b.pdf", "page": 4}),
+        Document(page_content="Budget figures for the second quarter", metadata={"source": "/data/b.pdf", "page": 5})
+    ]
+
+    kept, stats = deduplicate_chunks(chunks)
+
+    assert [chunk.metadata["page"] for chunk in kept] == [4, 5]
+    assert stats["duplicates_removed"] == 1
+    assert kept[0].metadata["duplicate_sources"] == "a.pdf:1; b.pdf:4"
+    assert json.loads(kept[0].metadata["shared_sources"]) == ["/data/a.pdf", "/data/b.pdf"]
+    assert "shared_sources" not in kept[1].metadata
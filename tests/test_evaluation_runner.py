@@ -0,0 +1,29 @@
+import asyncio
+from types import SimpleNamespace
+
+from agent.evaluation.runner import EvaluationRunner
+
+
+class Timeout(Exception):
+    status_code = 503
+
+
+def test_prediction_retry_uses_a_fresh_thread():
+    threads = []
+
+    async def predict_fn(question, thread_id):
+        threads.append(thread_id)
+        if len(threads) == 1:
+            raise Timeout("upstream hiccup")
+        return f"answer to {question}"
+
+    evaluator = SimpleNamespace(judge=None, predict_fn=predict_fn)
+    runner = EvaluationRunner(evaluator, max_retries=2)
+    runner.agent_limiter.base_delay_s = 0.0
+
+    answer = asyncio.run(runner._predict(3, "q"))
+
+    assert answer == "answer to q"
+    assert len(threads) == 2
+    assert threads[0] != threads[1]
+    assert all(thread.startswith(f"eval-{runner._run_id}-3-") for thread in threads)
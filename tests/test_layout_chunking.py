@@ -0,0 +1,46 @@
+import pytest
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion import layout_chunking
+
+
+@pytest.fixture
+def word_tokens(monkeypatch):
+    """One token per word, so no tokenizer download is needed."""
+    monkeypatch.setattr(layout_chunking, "count_tokens", lambda texts: [len(t.split()) for t in texts])
+
+
+def _chunk(monkeypatch, blocks, chunk_size, chunk_overlap=0):
+    monkeypatch.setattr(layout_chunking, "_load_all_blocks", lambda documents, workers, strip: [blocks])
+    page = Document(page_content="", metadata={"source": "a.pdf", "page": 0})
+    return layout_chunking.chunk_by_structure([page], chunk_size=chunk_size, chunk_overlap=chunk_overlap, workers=1)
+
+
+def _sentences(count, words=5, word="word"):
+    return " ".join(" ".join([word.capitalize()] + [word] * (words - 2)) + " end." for _ in range(count))
+
+
+def test_block_that_fits_is_not_split_across_chunks(monkeypatch, word_tokens):
+    table = "Module. Credits. Hours.\nMaths. Six. Forty.\nPhysics. Four. Thirty."
+    chunks = _chunk(monkeypatch, [(_sentences(5), 10.0, False), (table, 10.0, False)], chunk_size=30)
+
+    holding = [c for c in chunks if "Maths" in c.page_content or "Physics" in c.page_content]
+    assert len(holding) == 1
+    assert "Module." in holding[0].page_content and "Physics." in holding[0].page_content
+
+
+def test_chunks_stay_within_budget_including_the_section_heading(monkeypatch, word_tokens):
+    heading = ("Chapter three general regulations", 16.0, True)
+    chunks = _chunk(monkeypatch, [heading, (_sentences(20), 10.0, False)], chunk_size=20, chunk_overlap=5)
+
+    assert len(chunks) > 2
+    assert all(len(c.page_content.split()) <= 20 for c in chunks)
+    assert all(c.page_content.startswith("Chapter three") for c in chunks)
+    assert all(c.metadata["section"] == "Chapter three general regulations" for c in chunks)
+
+
+def test_long_sentence_is_cut_to_fit(monkeypatch, word_tokens):
+    chunks = _chunk(monkeypatch, [(" ".join(["word"] * 95) + ".", 10.0, False)], chunk_size=20)
+
+    assert all(len(c.page_content.split()) <= 20 for c in chunks)
+    assert sum(len(c.page_content.split()) for c in chunks) == 95
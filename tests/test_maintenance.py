@@ -0,0 +1,129 @@
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag import maintenance
+from mcp_server.server.tools.rag.ingestion import pipeline
+from mcp_server.server.tools.rag.store_stats import get_store_stats
+from mcp_server.utils.profiling import StageProfiler
+
+PASSAGE = (
+    "Article 12 of the regulation requires every operator to keep a register of incidents, "
+    "to report each one to the authority within thirty days and to retain the register for five years"
+)
+
+
+def _ingest(documents, deduplicate=False, update_mode="skip"):
+    return pipeline._chunk_and_index(
+        StageProfiler(), pipeline.IngestProgress(), documents, 1000, 0, "recursive", update_mode, "docs",
+        deduplicate=deduplicate, strip_boilerplate=False
+    )
+
+
+def _page(source, page, text):
+    return Document(page_content=text, metadata={"source": source, "page": page})
+
+
+def _stored(registry):
+    return registry.get("docs").vector_store._collection.get(include=["documents", "metadatas"])
+
+
+def _shared_ingest():
+    # b.pdf's copy is longer, so it is the one kept for both sources
+    _ingest([
+        _page("/data/a.pdf", 1, PASSAGE),
+        _page("/data/b.pdf", 4, PASSAGE + " exactly"),
+        _page("/data/b.pdf", 5, "Budget figures for the second quarter of the year")
+    ], deduplicate=True)
+
+
+def test_removing_a_source_moves_the_chunk_it_shares(registry):
+    _shared_ingest()
+
+    result = maintenance.delete_chunks("docs", source="b.pdf")
+
+    assert result["chunks_deleted"] == 1
+    assert result["shared_chunks_moved"] == 1
+    stored = _stored(registry)
+    assert [meta["source"] for meta in stored["metadatas"]] == ["/data/a.pdf"]
+    assert stored["documents"][0].startswith("Article 12")
+
+    # With its other source gone too, the chunk is deleted
+    result = maintenance.delete_chunks("docs", source="a.pdf")
+    assert result["chunks_deleted"] == 1 and result["shared_chunks_moved"] == 0
+    assert _stored(registry)["ids"] == []
+
+
+def test_reingesting_a_source_keeps_the_chunk_it_shares(registry):
+    _shared_ingest()
+
+    # b.pdf no longer contains the passage
+    _ingest([_page("/data/b.pdf", 5, "Budget figures for the second quarter of the year")], update_mode="upsert")
+    result = maintenance.collect_garbage("docs", compact=False)
+
+    assert result["shared_chunks_moved"] == 1
+    stored = _stored(registry)
+    shared = [meta for text, meta in zip(stored["documents"], stored["metadatas"]) if text.startswith("Article 12")]
+    assert [meta["source"] for meta in shared] == ["/data/a.pdf"]
+    assert get_store_stats(registry.persist_directory).chunk_ids("docs").keys() == {"/data/a.pdf", "/data/b.pdf"}
+
+
+def _two_page_ingest():
+    _ingest([
+        _page("/data/a.pdf", 1, "First page of report a"),
+        _page("/data/a.pdf", 2, "Second page of report a"),
+        _page("/data/b.pdf", 1, "Only page of report b")
+    ])
+
+
+def test_garbage_collection_deletes_chunks_the_latest_ingest_did_not_produce(registry):
+    _two_page_ingest()
+    # a.pdf lost its second page
+    _ingest([_page("/data/a.pdf", 1, "First page of report a")])
+
+    preview = maintenance.collect_garbage("docs", dry_run=True)
+    assert preview["chunks_deleted"] == 1
+    assert len(_stored(registry)["ids"]) == 3
+
+    result = maintenance.collect_garbage("docs")
+
+    assert result["chunks_deleted"] == 1
+    assert result["orphans_by_source"] == {"a.pdf": 1}
+    assert result["documents_remaining"] == 2
+    assert "compaction" in result
+    assert sorted(_stored(registry)["documents"]) == ["First page of report a", "Only page of report b"]
+
+
+def test_garbage_collection_leaves_untracked_sources_alone(registry):
+    _two_page_ingest()
+    registry.get("docs").vector_store._collection.add(
+        ids=["legacy"], documents=["Ingested before chunk IDs were recorded"],
+        metadatas=[{"source": "/data/legacy.pdf"}], embeddings=[[0.5] * 16]
+    )
+
+    result = maintenance.collect_garbage("docs", compact=False)
+
+    assert result["chunks_deleted"] == 0
+    assert result["untracked_sources"] == ["legacy.pdf"]
+    assert len(_stored(registry)["ids"]) == 4
+
+
+def test_delete_by_pattern_forgets_the_source(registry):
+    _two_page_ingest()
+
+    result = maintenance.delete_chunks("docs", pattern="a.*")
+
+    assert result["sources_matched"] == ["/data/a.pdf"]
+    assert result["chunks_deleted"] == 2
+    assert "/data/a.pdf" not in get_store_stats(registry.persist_directory).chunk_ids("docs")
+
+
+def test_delete_pages_through_the_matching_chunks(registry, monkeypatch):
+    _two_page_ingest()
+    monkeypatch.setattr(maintenance, "MAINTENANCE_SCAN_BATCH", 1)
+
+    preview = maintenance.delete_chunks("docs", where={"page": {"$gte": 1}}, dry_run=True)
+    assert preview["chunks_deleted"] == 3 and len(_stored(registry)["ids"]) == 3
+
+    result = maintenance.delete_chunks("docs", where={"page": {"$gte": 1}})
+
+    assert result["chunks_deleted"] == 3
+    assert result["documents_remaining"] == 0
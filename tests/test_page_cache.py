@@ -0,0 +1,52 @@
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion.page_cache import PageCache, file_sha256
+
+
+def _pages(path):
+    return [
+        Document(
+            page_content=f"Text of page {n} – with ünïcode",
+            metadata={"source": path, "file_path": path, "total_pages": 2, "producer": "test", "page": n}
+        )
+        for n in range(2)
+    ]
+
+
+def test_pages_round_trip_under_a_new_path(tmp_path):
+    cache = PageCache(str(tmp_path), parser_version="v1")
+    cache.put("abc", _pages("/old/report.pdf"))
+
+    pages = cache.get("/new/copy.pdf", "abc")
+
+    assert [page.page_content for page in pages] == [page.page_content for page in _pages("/x")]
+    assert [page.metadata for page in pages] == [page.metadata for page in _pages("/new/copy.pdf")]
+    assert cache.stats()["hits"] == 1
+
+
+def test_other_parser_versions_and_hashes_miss(tmp_path):
+    PageCache(str(tmp_path), parser_version="v1").put("abc", _pages("/a.pdf"))
+    cache = PageCache(str(tmp_path), parser_version="v2")
+
+    assert cache.get("/a.pdf", "abc") is None
+    assert cache.get("/a.pdf", "other") is None
+    assert cache.stats()["misses"] == 2
+
+
+def test_unreadable_entries_are_discarded(tmp_path):
+    cache = PageCache(str(tmp_path), parser_version="v1")
+    cache.put("abc", _pages("/a.pdf"))
+    entry = next(tmp_path.glob("abc.*"))
+    entry.write_bytes(b"not gzip")
+
+    assert cache.get("/a.pdf", "abc") is None
+    assert not entry.exists()
+    assert cache.clear() == 0
+
+
+def test_file_sha256_hashes_contents(tmp_path):
+    first, second = tmp_path / "a.pdf", tmp_path / "b.pdf"
+    first.write_bytes(b"%PDF-1.4 same")
+    second.write_bytes(b"%PDF-1.4 same")
+
+    assert file_sha256(str(first)) == file_sha256(str(second))
@@ -0,0 +1,74 @@
+import itertools
+
+import pytest
+
+from mcp_server.server.tools.rag.ingestion import pdf_cache
+from mcp_server.server.tools.rag.ingestion.pdf_cache import PDFCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Strictly increasing timestamps, so access order never depends on clock resolution
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(pdf_cache.time, "time", lambda: float(next(ticks)))
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = PDFCache(str(tmp_path / "pdfs"), max_bytes=250)
+    yield cache
+    cache.close()
+
+
+def _put(cache, url, size=100):
+    cache.path_for(url).write_bytes(b"%" * size)
+    cache.record(url, size)
+
+
+def test_least_recently_used_files_are_evicted(cache):
+    for name in ("a", "b", "c"):
+        _put(cache, f"https://example.org/{name}.pdf")
+    cache.touch("https://example.org/a.pdf")
+
+    assert cache.evict() == 1
+
+    assert cache.lookup("https://example.org/b.pdf") is None
+    assert not cache.path_for("https://example.org/b.pdf").exists()
+    assert cache.lookup("https://example.org/a.pdf") is not None
+    assert cache.stats()["files"] == 2
+    assert cache.stats()["usage_ratio"] == 0.8
+
+
+def test_protected_files_survive_eviction(cache):
+    for name in ("a", "b", "c"):
+        _put(cache, f"https://example.org/{name}.pdf")
+
+    assert cache.evict(protect=["https://example.org/a.pdf"]) == 1
+
+    assert cache.lookup("https://example.org/a.pdf") is not None
+    assert cache.lookup("https://example.org/b.pdf") is None
+
+
+def test_nothing_is_evicted_under_the_cap(cache):
+    _put(cache, "https://example.org/a.pdf")
+    _put(cache, "https://example.org/b.pdf")
+
+    assert cache.evict() == 0
+    assert cache.stats()["files"] == 2
+
+
+def test_untracked_files_are_adopted_and_missing_files_dropped(tmp_path, clock):
+    directory = tmp_path / "pdfs"
+    directory.mkdir()
+    (directory / "legacy.pdf").write_bytes(b"%" * 40)
+
+    cache = PDFCache(str(directory), max_bytes=250)
+    try:
+        assert [entry.filename for entry in cache.entries()] == ["legacy.pdf"]
+
+        _put(cache, "https://example.org/a.pdf")
+        cache.path_for("https://example.org/a.pdf").unlink()
+        assert cache.lookup("https://example.org/a.pdf") is None
+        assert cache.stats()["files"] == 1
+    finally:
+        cache.close()
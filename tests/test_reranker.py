@@ -0,0 +1,52 @@
+import pytest
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.retrieval import reranker
+
+
+class CountingModel:
+    """Scores a pair by the length of its text and counts the pairs it scored."""
+
+    def __init__(self):
+        self.scored = []
+
+    def predict(self, pairs, batch_size=None, show_progress_bar=False):
+        self.scored.extend(pairs)
+        return [float(len(text)) for _, text in pairs]
+
+
+@pytest.fixture
+def model(monkeypatch):
+    model = CountingModel()
+    monkeypatch.setattr(reranker, "_reranker_model", model)
+    reranker._score_cache.clear()
+    yield model
+    reranker._score_cache.clear()
+
+
+def _candidate(text):
+    # Same source, page and chunk index: the same chunk ID whatever the text
+    return Document(page_content=text, metadata={"source": "a.pdf", "page": 0, "chunk_index": 0}), 0.5
+
+
+def test_repeated_query_is_served_from_cache(model):
+    reranker.rerank_documents("q", [_candidate("short")], top_k=1, collection="c1")
+    _, stats = reranker.rerank_documents("q", [_candidate("short")], top_k=1, collection="c1")
+
+    assert stats["cache_hits"] == 1
+    assert len(model.scored) == 1
+
+
+def test_rechunked_text_under_same_id_is_rescored(model):
+    reranker.rerank_documents("q", [_candidate("short")], top_k=1, collection="c1")
+    ranked, stats = reranker.rerank_documents("q", [_candidate("a much longer text")], top_k=1, collection="c1")
+
+    assert stats["cache_hits"] == 0
+    assert ranked[0][2] == float(len("a much longer text"))
+
+
+def test_cache_is_per_collection(model):
+    reranker.rerank_documents("q", [_candidate("short")], top_k=1, collection="c1")
+    _, stats = reranker.rerank_documents("q", [_candidate("short")], top_k=1, collection="c2")
+
+    assert stats["cache_hits"] == 0
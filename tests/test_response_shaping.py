@@ -0,0 +1,68 @@
+import pytest
+
+from mcp_server.server.tools.rag.retrieval.response_shaping import ELLIPSIS, shape_results
+
+
+def _result(rank, content, chunk_index, page=0, source="a.pdf", score=0.5):
+    return {
+        "rank": rank,
+        "content": content,
+        "score": score,
+        "metadata": {"source": source, "page": page, "chunk_index": chunk_index}
+    }
+
+
+def test_merge_adjacent_removes_overlap_and_keeps_best_rank():
+    results = [
+        _result(1, "beta gamma delta", 1, score=0.2),
+        _result(2, "other page", 0, page=3),
+        _result(3, "alpha beta gamma", 0, score=0.4)
+    ]
+
+    shaped, stats = shape_results(results, query="gamma", merge_adjacent=True)
+
+    assert [doc["content"] for doc in shaped] == ["alpha beta gamma delta", "other page"]
+    assert [doc["rank"] for doc in shaped] == [1, 2]
+    assert shaped[0]["score"] == 0.2
+    assert shaped[0]["metadata"]["chunk_indices"] == [0, 1]
+    assert stats["merged_chunks"] == 1
+
+
+def test_snippet_centres_on_query_terms():
+    content = " ".join(["filler"] * 50) + " retrieval augmented generation " + " ".join(["filler"] * 50)
+
+    shaped, _ = shape_results([_result(1, content, 0)], query="augmented generation", snippet_chars=60)
+
+    snippet = shaped[0]["content"]
+    assert "augmented generation" in snippet
+    assert snippet.startswith(ELLIPSIS) and snippet.endswith(ELLIPSIS)
+    assert len(snippet) <= 60 + 2 * len(ELLIPSIS)
+
+
+def test_budget_keeps_best_results_and_truncates_the_next():
+    results = [_result(i + 1, "word " * 100, i, page=i) for i in range(3)]
+
+    shaped, stats = shape_results(results, query="word", max_chars=800)
+
+    assert len(shaped) == 2
+    assert shaped[0]["content"] == results[0]["content"]
+    assert shaped[1]["content"].endswith(ELLIPSIS)
+    assert stats["returned_chars"] <= 800
+    assert stats["dropped_results"] == 1
+    assert stats["truncated"] is True
+
+
+@pytest.mark.parametrize("options", [
+    {"max_chars": -1},
+    {"max_tokens": 0},
+    {"snippet_chars": -5},
+    {"top_k": 0},
+    {"rerank_candidates": -2}
+])
+def test_retrieve_rejects_non_positive_sizes(options):
+    from mcp_server.server.tools.rag.rag_server import retrieve_documents
+
+    result = retrieve_documents.fn(query="anything", **options)
+
+    assert result["success"] is False
+    assert "positive integer" in result["error"]
@@ -0,0 +1,101 @@
+import json
+import zipfile
+
+import chromadb
+import numpy as np
+import pytest
+
+from mcp_server.server.tools.rag import snapshots
+
+
+def _create(registry, name):
+    collection = chromadb.PersistentClient(path=registry.persist_directory).create_collection(
+        name, metadata={"hnsw:space": "cosine", "hnsw:M": 24}
+    )
+    collection.add(
+        ids=[f"chunk-{i}" for i in range(5)],
+        documents=[f"Text of chunk {i}" for i in range(5)],
+        metadatas=[{"source": f"/data/{'ab'[i % 2]}.pdf", "page": i} for i in range(5)],
+        embeddings=np.random.default_rng(7).random((5, 16)).tolist()
+    )
+    return collection
+
+
+def _contents(registry, name):
+    physical = registry.resolve(name)
+    collection = chromadb.PersistentClient(path=registry.persist_directory).get_collection(physical)
+    page = collection.get(include=["documents", "metadatas", "embeddings"])
+    order = np.argsort(page["ids"])
+    return (
+        [page["ids"][i] for i in order],
+        [page["documents"][i] for i in order],
+        [page["metadatas"][i] for i in order],
+        np.asarray(page["embeddings"])[order],
+        collection.metadata
+    )
+
+
+def test_snapshot_round_trip(registry, tmp_path):
+    _create(registry, "docs")
+    path = tmp_path / "docs.zip"
+
+    written = snapshots.write_snapshot("docs", path=str(path))
+    restored = snapshots.restore_snapshot(str(path), collection="copy")
+
+    assert written["count"] == restored["chunks_created"] == 5
+    ids, documents, metadatas, embeddings, metadata = _contents(registry, "docs")
+    copy = _contents(registry, "copy")
+    assert copy[:3] == (ids, documents, metadatas)
+    np.testing.assert_allclose(copy[3], embeddings, rtol=1e-6)
+    assert copy[4]["hnsw:M"] == 24
+    assert restored["source_count"] == 2
+
+
+def test_float16_snapshot_stays_close(registry, tmp_path):
+    _create(registry, "docs")
+    path = tmp_path / "docs.zip"
+
+    snapshots.write_snapshot("docs", path=str(path), precision="float16")
+    snapshots.restore_snapshot(str(path), collection="copy")
+
+    np.testing.assert_allclose(_contents(registry, "copy")[3], _contents(registry, "docs")[3], atol=1e-3)
+
+
+def test_restoring_over_a_collection_swaps_it(registry, tmp_path):
+    _create(registry, "docs")
+    path = tmp_path / "docs.zip"
+    snapshots.write_snapshot("docs", path=str(path))
+
+    restored = snapshots.restore_snapshot(str(path))
+
+    assert restored["replaced_collection"] == "docs"
+    assert registry.resolve("docs") == restored["physical_collection"]
+    assert "docs" in registry._pending
+
+
+def test_inconsistent_snapshot_is_rejected_and_cleaned_up(registry, tmp_path):
+    _create(registry, "docs")
+    path = tmp_path / "docs.zip"
+    snapshots.write_snapshot("docs", path=str(path))
+
+    broken = tmp_path / "broken.zip"
+    with zipfile.ZipFile(path) as source, zipfile.ZipFile(broken, "w") as target:
+        for item in source.infolist():
+            data = source.read(item)
+            if item.filename == "manifest.json":
+                data = json.dumps({**json.loads(data), "count": 4}).encode()
+            target.writestr(item, data)
+
+    with pytest.raises(ValueError, match="inconsistent"):
+        snapshots.restore_snapshot(str(broken), collection="copy")
+    assert registry._physical_collections() == {"docs"}
+
+
+def test_snapshot_of_another_model_is_rejected(registry, tmp_path, monkeypatch):
+    _create(registry, "docs")
+    path = tmp_path / "docs.zip"
+    snapshots.write_snapshot("docs", path=str(path))
+
+    monkeypatch.setattr(snapshots, "EMBED_MODEL", "another-model")
+    with pytest.raises(ValueError, match="embedding model"):
+        snapshots.read_manifest(str(path))
@@ -0,0 +1,31 @@
+from langchain_core.documents import Document
+
+from mcp_server.server.tools.rag.ingestion import pipeline
+from mcp_server.server.tools.rag.store_stats import get_store_stats
+from mcp_server.utils.profiling import StageProfiler
+
+
+def _ingest(documents):
+    return pipeline._chunk_and_index(
+        StageProfiler(), pipeline.IngestProgress(), documents, 1000, 0, "recursive", "skip", "docs",
+        deduplicate=False, strip_boilerplate=False
+    )
+
+
+def _page(source, page, text):
+    return Document(page_content=text, metadata={"source": source, "page": page})
+
+
+def test_sources_sharing_a_file_name_are_counted_apart(registry):
+    _ingest([
+        _page("/data/a/report.pdf", 1, "Quarterly revenue grew in every region"),
+        _page("/data/a/report.pdf", 2, "Headcount stayed flat across the year"),
+        _page("/data/b/report.pdf", 1, "The audit found no material weaknesses"),
+        _page("/data/notes.pdf", 1, "Minutes of the annual general meeting")
+    ])
+    store_stats = get_store_stats(registry.persist_directory)
+    expected = {"/data/a/report.pdf": 2, "/data/b/report.pdf": 1, "notes.pdf": 1}
+
+    assert store_stats.collection_stats("docs", physical=registry.resolve("docs"))["sources"] == expected
+    stats = store_stats.collection_stats("docs", refresh=True, physical=registry.resolve("docs"))
+    assert stats["sources"] == expected and stats["source_count"] == 3
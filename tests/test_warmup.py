@@ -0,0 +1,58 @@
+import subprocess
+import sys
+
+import pytest
+
+from mcp_server.server.tools.rag import warmup
+
+
+@pytest.fixture
+def readiness(monkeypatch):
+    fresh = warmup.Readiness()
+    monkeypatch.setattr(warmup, "readiness", fresh)
+    return fresh
+
+
+def _flaky(monkeypatch, failures):
+    calls = []
+
+    def run_warmup(**kwargs):
+        calls.append(kwargs)
+        if len(calls) <= failures:
+            raise ConnectionError("model download interrupted")
+        return {"total_s": 0.1}
+
+    monkeypatch.setattr(warmup, "run_warmup", run_warmup)
+    return calls
+
+
+def test_transient_failure_is_retried(monkeypatch, readiness):
+    calls = _flaky(monkeypatch, failures=1)
+
+    warmup.start_warmup(max_attempts=3, retry_base_s=0.0).join(timeout=5)
+
+    assert len(calls) == 2
+    assert readiness.status == "ready" and readiness.ready
+    assert readiness.error is None
+    assert readiness.attempts == 2
+
+
+def test_persistent_failure_reports_degraded_but_ready(monkeypatch, readiness):
+    calls = _flaky(monkeypatch, failures=10)
+
+    warmup.start_warmup(max_attempts=3, retry_base_s=0.0).join(timeout=5)
+
+    assert len(calls) == 3
+    assert readiness.status == "degraded"
+    assert readiness.ready
+    assert "interrupted" in readiness.to_dict()["error"]
+
+
+def test_importing_the_server_defers_heavy_modules():
+    code = (
+        "import sys, mcp_server.server.tools.rag.rag_server; "
+        "print(sorted(m for m in ('chromadb', 'fitz', 'langchain_community', 'torch') if m in sys.modules))"
+    )
+    result = subprocess.run([sys.executable, "-W", "ignore", "-c", code], capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip().splitlines()[-1] == "[]"